@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     'easyaudit',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
     'rest_framework',
     'rest_framework.authtoken',
@@ -80,6 +81,7 @@ INSTALLED_APPS = [
     'notification',
     'evidence_signature',
     'evidence_auth',
+    'report',
     'theme',
     'app',
 ]
@@ -182,8 +184,13 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Opt-in: lists are paginated only when `cursor` or `page_size` is sent
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 100)),
 }
 
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 1000))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'SHP API',
     'DESCRIPTION': 'API for evidence/documents control quality management system',
@@ -219,6 +226,84 @@ EAV2_PRIMARY_KEY_FIELD = "django.db.models.BigAutoField"
 MEDIA_ROOT = os.environ.get('MEDIA_ROOT')
 # MEDIA_ROOT = "uploads/"
 
+# Report jobs worker (python manage.py run_report_jobs)
+REPORT_JOBS_CONCURRENCY = int(os.environ.get('REPORT_JOBS_CONCURRENCY', 2))
+REPORT_JOBS_RETENTION_DAYS = int(os.environ.get('REPORT_JOBS_RETENTION_DAYS', 7))
+REPORT_JOBS_TIMEOUT = int(os.environ.get('REPORT_JOBS_TIMEOUT', 600))
+REPORT_JOBS_HEARTBEAT = int(os.environ.get('REPORT_JOBS_HEARTBEAT', 60))
+REPORT_JOBS_MAX_ATTEMPTS = int(os.environ.get('REPORT_JOBS_MAX_ATTEMPTS', 3))
+
+# Catalog import jobs worker (python manage.py run_import_jobs)
+IMPORT_JOBS_RETENTION_DAYS = int(os.environ.get('IMPORT_JOBS_RETENTION_DAYS', 7))
+IMPORT_JOBS_TIMEOUT = int(os.environ.get('IMPORT_JOBS_TIMEOUT', 600))
+IMPORT_JOBS_HEARTBEAT = int(os.environ.get('IMPORT_JOBS_HEARTBEAT', 60))
+IMPORT_JOBS_MAX_ATTEMPTS = int(os.environ.get('IMPORT_JOBS_MAX_ATTEMPTS', 3))
+
+# Rendered evidence exports, keyed by the evidence and its related rows versions
+EXPORT_CACHE_DIR = os.environ.get('EXPORT_CACHE_DIR')
+if EXPORT_CACHE_DIR == None and MEDIA_ROOT != None:
+    EXPORT_CACHE_DIR = os.path.join(MEDIA_ROOT, 'cache', 'exports')
+EXPORT_CACHE_MAX_BYTES = int(os.environ.get('EXPORT_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# Let the front proxy send the downloaded files: "x-accel" (nginx) or "x-sendfile"
+FILE_DOWNLOAD_OFFLOAD = os.environ.get('FILE_DOWNLOAD_OFFLOAD')
+FILE_DOWNLOAD_ACCEL_PREFIX = os.environ.get('FILE_DOWNLOAD_ACCEL_PREFIX', '/protected/')
+
+# Resumable uploads
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024))
+UPLOAD_SESSIONS_RETENTION_HOURS = int(os.environ.get('UPLOAD_SESSIONS_RETENTION_HOURS', 24))
+
+# First page PNG previews of the uploaded PDFs and images. The PDFs are
+# rendered with pdftoppm (poppler), PREVIEW_WORKERS=0 only renders on request
+PREVIEW_CACHE_DIR = os.environ.get('PREVIEW_CACHE_DIR')
+if PREVIEW_CACHE_DIR == None and MEDIA_ROOT != None:
+    PREVIEW_CACHE_DIR = os.path.join(MEDIA_ROOT, 'cache', 'previews')
+PREVIEW_CACHE_MAX_BYTES = int(os.environ.get('PREVIEW_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+PREVIEW_SIZE = int(os.environ.get('PREVIEW_SIZE', 320))
+PREVIEW_WORKERS = int(os.environ.get('PREVIEW_WORKERS', 2))
+PREVIEW_TIMEOUT = int(os.environ.get('PREVIEW_TIMEOUT', 30))
+PREVIEW_PDFTOPPM = os.environ.get('PREVIEW_PDFTOPPM', 'pdftoppm')
+
+# Unreferenced uploaded file blobs are kept this long before they are collected
+FILE_BLOBS_GRACE_HOURS = int(os.environ.get('FILE_BLOBS_GRACE_HOURS', 1))
+
+# Where the uploaded files and the generated reports are kept: "filesystem"
+# (MEDIA_ROOT) or "s3", a bucket of AWS or of an S3 compatible server like
+# MinIO (S3_ENDPOINT_URL). S3 needs UPLOAD_CHUNK_SIZE of at least 5 MB.
+ATTACHMENTS_STORAGE = os.environ.get('ATTACHMENTS_STORAGE', 'filesystem')
+S3_BUCKET = os.environ.get('S3_BUCKET')
+S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')
+S3_REGION = os.environ.get('S3_REGION')
+S3_ACCESS_KEY_ID = os.environ.get('S3_ACCESS_KEY_ID')
+S3_SECRET_ACCESS_KEY = os.environ.get('S3_SECRET_ACCESS_KEY')
+S3_PRESIGNED_EXPIRES = int(os.environ.get('S3_PRESIGNED_EXPIRES', 300))
+S3_MULTIPART_THRESHOLD = int(os.environ.get('S3_MULTIPART_THRESHOLD', 8 * 1024 * 1024))
+S3_MULTIPART_CHUNK_SIZE = int(os.environ.get('S3_MULTIPART_CHUNK_SIZE', 8 * 1024 * 1024))
+
+# Use a shared backend (CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# and CACHE_LOCATION=<dir>) so the invalidations reach every worker process
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'shp-api'),
+    },
+    # Catalog lists, keyed by the catalog versions kept in the database so
+    # every process sees the writes of the others
+    'catalogs': {
+        'BACKEND': os.environ.get('CATALOG_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CATALOG_CACHE_LOCATION', 'shp-api-catalogs'),
+    },
+}
+CATALOG_CACHE_ALIAS = 'catalogs'
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 24 * 60 * 60))
+
+# Matches returned by the catalog autocomplete endpoints
+AUTOCOMPLETE_LIMIT = int(os.environ.get('AUTOCOMPLETE_LIMIT', 10))
+AUTOCOMPLETE_MAX_LIMIT = int(os.environ.get('AUTOCOMPLETE_MAX_LIMIT', 50))
+
+# Evidence analytics cached per visibility scope
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', 300))
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST')
 EMAIL_PORT = os.environ.get('EMAIL_PORT')
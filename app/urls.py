@@ -56,5 +56,6 @@ urlpatterns = [
     path('api/evidence-signature/', include('evidence_signature.urls')),
     path('api/evidence-auth/', include('evidence_auth.urls')),
     path('api/report/', include('report.urls')),
+    path('api/import-job/', include('core.urls')),
     path('api/theme/', include('theme.urls')),
 ]
\ No newline at end of file
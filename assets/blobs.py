@@ -0,0 +1,81 @@
+"""
+Reference counting of the content addressed uploaded files
+"""
+import os
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core import models
+from core.storage import blob_name, blob_sha256, is_local
+
+
+def get_storage():
+    return models.UploadedFile._meta.get_field('file').storage
+
+
+def collect():
+    """Delete the blobs no UploadedFile references
+
+    A blob is only collected when both its row and its file are older
+    than FILE_BLOBS_GRACE_HOURS, so an upload of the same content that
+    is still being saved keeps it. The row is locked and checked again
+    before the file is deleted. An upload reusing it meanwhile waits for
+    the lock in UploadedFile.save and then writes the file again.
+    """
+    storage = get_storage()
+    cutoff = timezone.now() - datetime.timedelta(hours=settings.FILE_BLOBS_GRACE_HOURS)
+    candidates = models.FileBlob.objects.filter(uploadedfile=None, created_at__lt=cutoff).values_list('id', flat=True)
+
+    count = 0
+    for id in list(candidates):
+        with transaction.atomic():
+            blob = models.FileBlob.objects.select_for_update(skip_locked=True).filter(id=id).first()
+            if blob == None or models.UploadedFile.objects.filter(blob=blob).exists():
+                continue
+
+            name = blob_name(blob.sha256)
+            if storage.exists(name) and storage.get_modified_time(name) >= cutoff:
+                continue
+
+            blob.delete()
+            storage.delete(name)
+        count = count + 1
+
+    return count
+
+
+def store_legacy():
+    """Move the files uploaded before the blob store into it"""
+    storage = get_storage()
+
+    count = 0
+    for upload in models.UploadedFile.objects.filter(blob=None).select_related('owner'):
+        if blob_sha256(upload.file.name) != None or not storage.exists(upload.file.name):
+            continue
+
+        if upload.filename == '':
+            upload.filename = os.path.basename(upload.file.name)
+
+        legacy = upload.file.name
+        if is_local(storage):
+            path = storage.path(legacy)
+            digest = hashlib.sha256()
+            with open(path, 'rb') as fh:
+                for block in iter(lambda: fh.read(64 * 1024), b''):
+                    digest.update(block)
+            upload.file.name = storage.store(path, digest.hexdigest())
+        else:
+            # Copied through a temporary file, the bucket can not move it
+            with storage.open(legacy) as fh:
+                upload.file.name = storage.save(legacy, fh)
+        upload.save()
+
+        if not is_local(storage):
+            storage.delete(legacy)
+        count = count + 1
+
+    return count
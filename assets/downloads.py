@@ -0,0 +1,158 @@
+"""
+Streamed file downloads with conditional and range requests
+"""
+import os
+import re
+import mimetypes
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_etag(stat):
+    return '"%x-%x"' % (stat.st_mtime_ns, stat.st_size)
+
+
+def parse_range(header, size):
+    """(start, end) of a single byte range, None for the whole file
+
+    Returns False when the range can not be satisfied. Several ranges
+    are answered with the whole file.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match == None:
+        return None
+
+    start, end = match.groups()
+    if start == '' and end == '':
+        return None
+
+    if start == '':
+        # Suffix range: the last `end` bytes
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = size - 1 if end == '' else min(int(end), size - 1)
+    if start >= size or start > end:
+        return False
+
+    return start, end
+
+
+def if_range_matches(request, etag, mtime):
+    """The If-Range validator still describes the file"""
+    value = request.META.get('HTTP_IF_RANGE')
+    if value == None:
+        return True
+
+    value = value.strip()
+    if value.startswith('"') or value.startswith('W/'):
+        return value == etag
+
+    date = parse_http_date_safe(value)
+    return date != None and int(mtime) <= date
+
+
+def read_range(fh, start, length, block_size):
+    with fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(block_size, length))
+            if not chunk:
+                break
+            length = length - len(chunk)
+            yield chunk
+
+
+def content_disposition(filename, as_attachment):
+    disposition = 'attachment' if as_attachment else 'inline'
+    try:
+        filename.encode('ascii')
+        return '{}; filename="{}"'.format(disposition, filename.replace('\\', '\\\\').replace('"', r'\"'))
+    except UnicodeEncodeError:
+        return "{}; filename*=utf-8''{}".format(disposition, quote(filename))
+
+
+def offload_response(path):
+    """Empty response telling the front proxy which file to send
+
+    With FILE_DOWNLOAD_OFFLOAD=x-accel the path is relative to MEDIA_ROOT
+    under FILE_DOWNLOAD_ACCEL_PREFIX (an nginx internal location), with
+    x-sendfile it is the absolute path. The proxy answers the ranges.
+    """
+    response = HttpResponse()
+    if settings.FILE_DOWNLOAD_OFFLOAD == 'x-accel':
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        response['X-Accel-Redirect'] = settings.FILE_DOWNLOAD_ACCEL_PREFIX.rstrip('/') + '/' + relative
+    else:
+        response['X-Sendfile'] = path
+
+    return response
+
+
+def file_response(request, path, filename=None, as_attachment=False):
+    """Response streaming the file at path, see open_file_response"""
+    return open_file_response(request, open(path, 'rb'), filename=filename, as_attachment=as_attachment)
+
+
+def open_file_response(request, fh, filename=None, as_attachment=False):
+    """Response streaming the open file without reading it into memory
+
+    Supports If-None-Match/If-Modified-Since (304), a single Range with
+    If-Range (206/416) and the proxy offload of FILE_DOWNLOAD_OFFLOAD. The
+    response owns the file, which stays readable if it is deleted meanwhile.
+    """
+    path = fh.name
+    stat = os.fstat(fh.fileno())
+    etag = file_etag(stat)
+    last_modified = http_date(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response == None:
+        if filename == None:
+            filename = os.path.basename(path)
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+        byte_range = None
+        header = request.META.get('HTTP_RANGE')
+        if header != None and settings.FILE_DOWNLOAD_OFFLOAD == None and if_range_matches(request, etag, stat.st_mtime):
+            byte_range = parse_range(header, stat.st_size)
+
+        if settings.FILE_DOWNLOAD_OFFLOAD != None:
+            fh.close()
+            response = offload_response(path)
+            response['Content-Type'] = content_type
+        elif byte_range == False:
+            fh.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+        elif byte_range != None:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                read_range(fh, start, length, FileResponse.block_size),
+                status=206,
+                content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(length)
+        else:
+            # The WSGI server file wrapper can send it with sendfile
+            response = FileResponse(fh, content_type=content_type)
+
+        response['Content-Disposition'] = content_disposition(filename, as_attachment)
+        response['Accept-Ranges'] = 'bytes'
+    else:
+        fh.close()
+
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    return response
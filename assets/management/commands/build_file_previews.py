@@ -0,0 +1,29 @@
+"""
+Django command to render the missing previews of the uploaded files
+"""
+from django.core.management.base import BaseCommand
+
+from core import models
+
+from assets import previews
+
+
+class Command(BaseCommand):
+    """Django command to render the previews of the uploaded files"""
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        if previews.get_cache() == None:
+            self.stdout.write('The previews are disabled, set PREVIEW_CACHE_DIR')
+            return
+
+        count = 0
+        for upload in models.UploadedFile.objects.exclude(file='').iterator():
+            if not previews.can_preview(upload):
+                continue
+            fh = previews.build(upload)
+            if fh != None:
+                fh.close()
+                count = count + 1
+
+        self.stdout.write(f'{count} uploaded files have a preview')
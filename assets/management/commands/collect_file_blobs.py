@@ -0,0 +1,26 @@
+"""
+Django command to delete the uploaded file blobs nothing references
+"""
+from django.core.management.base import BaseCommand
+
+from assets import blobs
+
+
+class Command(BaseCommand):
+    """Django command to garbage collect the uploaded file blobs"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='First move the files uploaded before the blob store into it',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        if options['legacy']:
+            stored = blobs.store_legacy()
+            self.stdout.write(f'Stored {stored} legacy uploaded files as blobs')
+
+        collected = blobs.collect()
+        self.stdout.write(f'Collected {collected} unreferenced blobs')
@@ -0,0 +1,15 @@
+"""
+Django command to delete the abandoned resumable uploads
+"""
+from django.core.management.base import BaseCommand
+
+from assets import uploads
+
+
+class Command(BaseCommand):
+    """Django command to purge the idle upload sessions and their partial files"""
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        purged = uploads.purge()
+        self.stdout.write(f'Purged {purged} upload sessions')
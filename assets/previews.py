@@ -0,0 +1,196 @@
+"""
+First page PNG previews of the uploaded PDFs and images
+
+The previews are rendered in the background after the upload commits and
+kept in a disk cache keyed by the stored file, so the uploads of the same
+content share them. A preview evicted or never rendered is queued again on
+the first request.
+"""
+import io
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+import mimetypes
+import subprocess
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from core import models
+from core.disk_cache import DiskCache
+from core.storage import is_local
+
+logger = logging.getLogger(__name__)
+
+PDF_TYPE = 'application/pdf'
+IMAGE_TYPES = ['image/png', 'image/jpeg', 'image/gif', 'image/bmp', 'image/tiff', 'image/webp']
+
+executor = None
+lock = threading.Lock()
+# Ids queued and keys that could not be rendered, per process
+pending = set()
+failed = set()
+
+
+def get_cache():
+    """Cache configured in the settings, None when the previews are disabled"""
+    if settings.PREVIEW_CACHE_DIR == None:
+        return None
+
+    return DiskCache(settings.PREVIEW_CACHE_DIR, settings.PREVIEW_CACHE_MAX_BYTES, extension='png')
+
+
+def content_type(upload):
+    return mimetypes.guess_type(upload.filename or upload.file.name)[0]
+
+
+def can_preview(upload):
+    type = content_type(upload)
+    return type == PDF_TYPE or type in IMAGE_TYPES
+
+
+def preview_key(upload):
+    """Key of the preview, the blob names already hold the content hash"""
+    content = f'{upload.file.name}:{settings.PREVIEW_SIZE}'
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+@contextlib.contextmanager
+def local_copy(file):
+    """Path of the file, downloaded to a temporary file when the storage is remote"""
+    if is_local(file.storage):
+        yield file.path
+        return
+
+    with tempfile.NamedTemporaryFile() as tmp:
+        with file.storage.open(file.name) as fh:
+            shutil.copyfileobj(fh, tmp)
+        tmp.flush()
+        yield tmp.name
+
+
+def render_image(path):
+    from PIL import Image, ImageOps
+
+    size = settings.PREVIEW_SIZE
+    with Image.open(path) as image:
+        # Lets the JPEG decoder skip the full resolution
+        image.draft('RGB', (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            image = image.convert('RGBA')
+
+        buf = io.BytesIO()
+        image.save(buf, 'PNG', optimize=True)
+        return buf.getvalue()
+
+
+def render_pdf(path):
+    """First page rendered by pdftoppm (poppler)"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'page')
+        subprocess.run(
+            [
+                settings.PREVIEW_PDFTOPPM, '-png', '-f', '1', '-l', '1', '-singlefile',
+                '-scale-to', str(settings.PREVIEW_SIZE), path, output
+            ],
+            check=True,
+            timeout=settings.PREVIEW_TIMEOUT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        with open(output + '.png', 'rb') as fh:
+            return fh.read()
+
+
+def open_preview(upload):
+    """Open file of the cached preview, None when it is not rendered"""
+    cache = get_cache()
+    if cache == None or not can_preview(upload):
+        return None
+
+    return cache.open(preview_key(upload))
+
+
+def build(upload):
+    """Open file of the cached preview, rendered if missing
+
+    The open file stays readable if the cache evicts it meanwhile. Returns
+    None when the previews are disabled, the file type has no preview or
+    it could not be rendered.
+    """
+    cache = get_cache()
+    if cache == None or not can_preview(upload):
+        return None
+
+    key = preview_key(upload)
+    fh = cache.open(key)
+    if fh != None:
+        return fh
+
+    try:
+        with local_copy(upload.file) as source:
+            if content_type(upload) == PDF_TYPE:
+                content = render_pdf(source)
+            else:
+                content = render_image(source)
+    except Exception:
+        logger.exception('Could not render the preview of the uploaded file %s', upload.id)
+        with lock:
+            failed.add(key)
+        return None
+
+    return cache.put(key, content)
+
+
+def has_failed(upload):
+    """The preview could not be rendered by this process"""
+    return preview_key(upload) in failed
+
+
+def get_executor():
+    global executor
+
+    with lock:
+        if executor == None:
+            executor = ThreadPoolExecutor(max_workers=settings.PREVIEW_WORKERS, thread_name_prefix='preview')
+
+    return executor
+
+
+def build_in_background(id):
+    try:
+        upload = models.UploadedFile.objects.filter(id=id).first()
+        if upload != None:
+            fh = build(upload)
+            if fh != None:
+                fh.close()
+    finally:
+        with lock:
+            pending.discard(id)
+        # The worker thread keeps its own connection otherwise
+        connections.close_all()
+
+
+def submit(id):
+    with lock:
+        if id in pending:
+            return
+        pending.add(id)
+
+    get_executor().submit(build_in_background, id)
+
+
+def schedule(upload):
+    """Render the preview in the background once the upload is committed"""
+    if settings.PREVIEW_WORKERS == 0 or get_cache() == None or not can_preview(upload):
+        return
+
+    id = upload.id
+    transaction.on_commit(lambda: submit(id))
@@ -1,12 +1,47 @@
+from django.urls import reverse
 from rest_framework import serializers
 from core import models
 
+from assets import previews
+
 class CreateFileUploadSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.UploadedFile
         fields = ('file', 'uploaded_on')
 
 class FileUploadSerializer(serializers.ModelSerializer):
+    preview = serializers.SerializerMethodField()
+
     class Meta:
         model = models.UploadedFile
-        fields = ('id','file', 'owner', 'uploaded_on',)
\ No newline at end of file
+        fields = ('id', 'file', 'filename', 'owner', 'uploaded_on', 'preview',)
+        read_only_fields = ('filename',)
+
+    def get_preview(self, obj):
+        """URL of the first page PNG, None for the files without one"""
+        if not obj.file or not previews.can_preview(obj):
+            return None
+
+        url = reverse('assets:preview-file', args=[obj.id])
+        request = self.context.get('request')
+        if request != None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+class CreateUploadSessionSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=128)
+    size = serializers.IntegerField(min_value=1)
+    checksum = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    next_chunk = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.UploadSession
+        fields = ('id', 'status', 'filename', 'size', 'chunk_size', 'received', 'next_chunk', 'checksum', 'file')
+        read_only_fields = fields
+
+    def get_next_chunk(self, obj):
+        return obj.received // obj.chunk_size
@@ -0,0 +1,95 @@
+"""
+Tests for the content addressed uploaded files
+"""
+import os
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.utils import timezone
+
+from core import models
+from core.storage import blob_name
+
+from assets import blobs
+
+CONTENT = b'%PDF-signed'
+
+
+class BlobStorageTests(TestCase):
+    """Test the uploads are stored once by content"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.storage = models.UploadedFile._meta.get_field('file').storage
+
+    def tearDown(self):
+        for blob in models.FileBlob.objects.all():
+            self.storage.delete(blob_name(blob.sha256))
+
+    def upload(self, name, content):
+        upload = models.UploadedFile(owner=self.user)
+        upload.file.save(name, ContentFile(content), save=False)
+        upload.filename = name
+        upload.save()
+        return upload
+
+    def test_same_content_stored_once(self):
+        """Test uploads with the same content share the blob"""
+        first = self.upload('a.pdf', CONTENT)
+        second = models.UploadedFile(owner=self.user, file=ContentFile(CONTENT, name='b.pdf'))
+        second.save()
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(first.blob, second.blob)
+        self.assertEqual(second.filename, 'b.pdf')
+        self.assertEqual(models.FileBlob.objects.count(), 1)
+        self.assertEqual(first.blob.size, len(CONTENT))
+
+        other = self.upload('c.pdf', b'other')
+        self.assertNotEqual(other.blob, first.blob)
+
+    def test_collect_unreferenced(self):
+        """Test only the blobs nothing references are deleted"""
+        kept = self.upload('a.pdf', CONTENT)
+        dropped = self.upload('b.pdf', b'dropped')
+        name = dropped.file.name
+        dropped.delete()
+
+        past = timezone.now() - datetime.timedelta(days=1)
+        models.FileBlob.objects.update(created_at=past)
+        os.utime(self.storage.path(name), (past.timestamp(), past.timestamp()))
+
+        self.assertEqual(blobs.collect(), 1)
+        self.assertFalse(self.storage.exists(name))
+        self.assertTrue(self.storage.exists(kept.file.name))
+        self.assertEqual(list(models.FileBlob.objects.all()), [kept.blob])
+
+    def test_reused_blob_collected_meanwhile(self):
+        """Test an upload reusing a blob the collector deletes meanwhile writes it again"""
+        dropped = self.upload('a.pdf', CONTENT)
+        name = dropped.file.name
+        dropped.delete()
+        store = type(self.storage).store
+        collected = []
+
+        def store_then_collect(storage, path, sha256):
+            # The storage found the blob, the collector deletes it before the row is locked
+            stored = store(storage, path, sha256)
+            if len(collected) == 0:
+                models.FileBlob.objects.filter(sha256=sha256).delete()
+                storage.delete(stored)
+                collected.append(stored)
+            return stored
+
+        with mock.patch.object(type(self.storage), 'store', store_then_collect):
+            upload = models.UploadedFile(owner=self.user, file=ContentFile(CONTENT, name='b.pdf'))
+            upload.save()
+
+        self.assertEqual(upload.file.name, name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(upload.blob.sha256, models.FileBlob.objects.get().sha256)
+        with upload.file.open('rb') as fh:
+            self.assertEqual(fh.read(), CONTENT)
@@ -0,0 +1,76 @@
+"""
+Tests for the file download API
+"""
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+
+CONTENT = b'0123456789' * 100
+
+
+class FileDownloadTests(TestCase):
+    """Test the streamed downloads"""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.upload = models.UploadedFile(owner=user, file=ContentFile(CONTENT, name='scan.pdf'))
+        self.upload.save()
+        self.url = reverse('assets:download-file', args=[self.upload.id])
+        self.client = APIClient()
+
+    def tearDown(self):
+        self.upload.file.delete(save=False)
+
+    def test_download(self):
+        """Test the whole file is streamed with its validators"""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(res.streaming_content), CONTENT)
+        self.assertEqual(res['Content-Type'], 'application/pdf')
+        self.assertEqual(res['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', res)
+        self.assertIn('Last-Modified', res)
+
+        res2 = self.client.get(self.url, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res2.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_range(self):
+        """Test partial downloads"""
+        res = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(res.streaming_content), CONTENT[10:20])
+        self.assertEqual(res['Content-Range'], f'bytes 10-19/{len(CONTENT)}')
+
+        res = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(res.streaming_content), CONTENT[-5:])
+
+        res = self.client.get(self.url, HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(res.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+    def test_if_range_changed(self):
+        """Test a stale If-Range gets the whole file"""
+        res = self.client.get(self.url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"stale"')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(res.streaming_content), CONTENT)
+
+    @override_settings(FILE_DOWNLOAD_OFFLOAD='x-accel', FILE_DOWNLOAD_ACCEL_PREFIX='/protected/')
+    def test_accel_redirect(self):
+        """Test the proxy offload sends only the internal location"""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['X-Accel-Redirect'], f'/protected/{self.upload.file.name}')
+
+    def test_missing_file(self):
+        """Test unknown files are not found"""
+        res = self.client.get(reverse('assets:download-file', args=[0]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
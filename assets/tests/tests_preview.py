@@ -0,0 +1,183 @@
+"""
+Tests for the previews of the uploaded files
+"""
+import io
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from PIL import Image
+from reportlab.pdfgen import canvas
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+
+from assets import previews
+from assets.serializers import FileUploadSerializer
+
+
+def image_content(size=(1200, 800)):
+    buf = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buf, 'JPEG')
+    return buf.getvalue()
+
+
+def pdf_content():
+    buf = io.BytesIO()
+    pdf = canvas.Canvas(buf)
+    pdf.drawString(100, 750, 'Evidencia')
+    pdf.save()
+    return buf.getvalue()
+
+
+class FilePreviewTests(TestCase):
+    """Test the first page previews"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.override = override_settings(PREVIEW_CACHE_DIR=self.directory, PREVIEW_SIZE=100)
+        self.override.enable()
+
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.uploads = []
+        self.client = APIClient()
+
+    def tearDown(self):
+        for upload in self.uploads:
+            upload.file.delete(save=False)
+        self.override.disable()
+        shutil.rmtree(self.directory)
+
+    def create_upload(self, content, name):
+        upload = models.UploadedFile(owner=self.user, file=ContentFile(content, name=name))
+        upload.save()
+        self.uploads.append(upload)
+        return upload
+
+    def test_image_preview(self):
+        """Test an image preview fits in PREVIEW_SIZE"""
+        upload = self.create_upload(image_content(), 'photo.jpg')
+
+        with previews.build(upload) as fh, Image.open(fh) as image:
+            self.assertEqual(image.format, 'PNG')
+            self.assertEqual(image.size, (100, 67))
+
+    def test_preview_shared_by_content(self):
+        """Test the uploads of the same content share the preview"""
+        first = self.create_upload(image_content(), 'photo.jpg')
+        second = self.create_upload(image_content(), 'copy.jpg')
+
+        with previews.build(first) as fh, previews.build(second) as fh2:
+            self.assertEqual(fh.name, fh2.name)
+
+    @override_settings(PREVIEW_WORKERS=0)
+    def test_preview_view_rebuilds(self):
+        """Test a missing preview is rendered on request without workers"""
+        upload = self.create_upload(image_content(), 'photo.jpg')
+        url = reverse('assets:preview-file', args=[upload.id])
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'image/png')
+        self.assertIn('photo.png', res['Content-Disposition'])
+        b''.join(res.streaming_content)
+
+        shutil.rmtree(self.directory)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(b''.join(res.streaming_content).startswith(b'\x89PNG'))
+
+    @override_settings(PREVIEW_WORKERS=1)
+    def test_preview_view_queues(self):
+        """Test a missing preview is queued and served once rendered"""
+        upload = self.create_upload(image_content(), 'photo.jpg')
+        url = reverse('assets:preview-file', args=[upload.id])
+        self.client.force_authenticate(self.user)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(callbacks), 1)
+
+        previews.build(upload).close()
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'image/png')
+        etag = res['ETag']
+        b''.join(res.streaming_content)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_preview_view_requires_auth(self):
+        """Test the previews are only served to authenticated users"""
+        upload = self.create_upload(image_content(), 'photo.jpg')
+
+        res = self.client.get(reverse('assets:preview-file', args=[upload.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_no_preview(self):
+        """Test the file types without a preview"""
+        upload = self.create_upload(b'notas', 'notes.txt')
+
+        self.assertEqual(previews.build(upload), None)
+        self.assertEqual(FileUploadSerializer(upload).data['preview'], None)
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(reverse('assets:preview-file', args=[upload.id]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_damaged_image(self):
+        """Test a file that can not be rendered has no preview"""
+        upload = self.create_upload(b'not an image', 'photo.png')
+
+        with self.assertLogs('assets.previews', level='ERROR'):
+            self.assertEqual(previews.build(upload), None)
+        self.assertTrue(previews.has_failed(upload))
+
+    def test_serializer_preview(self):
+        """Test the serialized upload links its preview"""
+        upload = self.create_upload(image_content(), 'photo.jpg')
+
+        data = FileUploadSerializer(upload).data
+
+        self.assertEqual(data['preview'], reverse('assets:preview-file', args=[upload.id]))
+
+    def test_upload_schedules_preview(self):
+        """Test the preview is queued once the upload commits"""
+        self.client.force_authenticate(self.user)
+
+        def upload(content, name):
+            with self.captureOnCommitCallbacks() as callbacks:
+                res = self.client.post(
+                    reverse('assets:upload-file'),
+                    {'file': ContentFile(content, name=name)},
+                    format='multipart'
+                )
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            self.uploads.append(models.UploadedFile.objects.get(id=res.data['id']))
+            return res, callbacks
+
+        res, callbacks = upload(image_content(), 'photo.jpg')
+        res2, callbacks2 = upload(b'notas', 'notes.txt')
+
+        self.assertTrue(res.data['preview'].endswith(reverse('assets:preview-file', args=[res.data['id']])))
+        self.assertEqual(res2.data['preview'], None)
+        self.assertEqual(len(callbacks), len(callbacks2) + 1)
+
+    @skipUnless(shutil.which('pdftoppm'), 'pdftoppm is not installed')
+    def test_pdf_preview(self):
+        """Test a PDF preview is its first page"""
+        upload = self.create_upload(pdf_content(), 'scan.pdf')
+
+        with previews.build(upload) as fh, Image.open(fh) as image:
+            self.assertEqual(image.format, 'PNG')
+            self.assertEqual(max(image.size), 100)
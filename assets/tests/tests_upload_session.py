@@ -0,0 +1,140 @@
+"""
+Tests for the resumable upload APIs
+"""
+import os
+import hashlib
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+
+CONTENT = b'%PDF-' + b'x' * 95
+
+SESSIONS_URL = reverse('assets:upload-session')
+
+
+def chunk_url(id, index):
+    return reverse('assets:upload-chunk', args=[id, index])
+
+
+def complete_url(id):
+    return reverse('assets:upload-complete', args=[id])
+
+
+@override_settings(UPLOAD_CHUNK_SIZE=40)
+class UploadSessionTests(TestCase):
+    """Test the chunked uploads"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        for upload in models.UploadedFile.objects.filter(owner=self.user):
+            upload.file.delete(save=False)
+        storage = models.UploadedFile._meta.get_field('file').storage
+        for session in models.UploadSession.objects.filter(owner=self.user):
+            storage.delete(session.path)
+
+    def open_session(self, **extra):
+        payload = {'filename': 'scan.pdf', 'size': len(CONTENT), **extra}
+        res = self.client.post(SESSIONS_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data
+
+    def put_chunk(self, id, index, **extra):
+        data = CONTENT[index * 40:(index + 1) * 40]
+        return self.client.put(chunk_url(id, index), data, content_type='application/octet-stream', **extra)
+
+    def test_upload_in_chunks(self):
+        """Test the chunks are appended and the file is created on completion"""
+        session = self.open_session(checksum=hashlib.sha256(CONTENT).hexdigest())
+        self.assertEqual(session['chunk_size'], 40)
+
+        for index in range(3):
+            res = self.put_chunk(session['id'], index)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        # A retried chunk is ignored
+        res = self.put_chunk(session['id'], 1)
+        self.assertEqual(res.data['received'], len(CONTENT))
+
+        res = self.client.post(complete_url(session['id']))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        upload = models.UploadedFile.objects.get(id=res.data['id'])
+        self.assertEqual(upload.owner, self.user)
+        self.assertEqual(upload.filename, 'scan.pdf')
+        self.assertEqual(upload.blob.sha256, hashlib.sha256(CONTENT).hexdigest())
+        with upload.file.open('rb') as fh:
+            self.assertEqual(fh.read(), CONTENT)
+
+    def test_resume(self):
+        """Test chunks out of order are rejected with the chunk to resume from"""
+        session = self.open_session()
+        self.put_chunk(session['id'], 0)
+
+        res = self.put_chunk(session['id'], 2)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+        res = self.client.post(complete_url(session['id']))
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+        res = self.client.get(reverse('assets:upload-session-detail', args=[session['id']]))
+        self.assertEqual(res.data['next_chunk'], 1)
+
+    def test_chunk_checksum(self):
+        """Test a damaged chunk is dropped"""
+        session = self.open_session()
+
+        res = self.put_chunk(session['id'], 0, HTTP_X_CHUNK_CHECKSUM='0' * 64)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.put_chunk(session['id'], 0, HTTP_X_CHUNK_CHECKSUM=hashlib.sha256(CONTENT[:40]).hexdigest())
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['received'], 40)
+
+    def test_file_checksum(self):
+        """Test a file not matching the session checksum starts over"""
+        session = self.open_session(checksum='0' * 64)
+        for index in range(3):
+            self.put_chunk(session['id'], index)
+
+        res = self.client.post(complete_url(session['id']))
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(models.UploadSession.objects.get(id=session['id']).received, 0)
+
+    def test_failed_after_move(self):
+        """Test a session whose file was moved before the completion failed is marked failed"""
+        session = self.open_session()
+        for index in range(3):
+            self.put_chunk(session['id'], index)
+
+        with mock.patch.object(models.UploadedFile, 'save', side_effect=RuntimeError('db down')):
+            with self.assertLogs('assets.uploads', level='ERROR'):
+                res = self.client.post(complete_url(session['id']))
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(models.UploadSession.objects.get(id=session['id']).status, models.UploadSession.Status.FAILED)
+
+        res = self.client.post(complete_url(session['id']))
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        res = self.put_chunk(session['id'], 0)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_abort(self):
+        """Test cancelling the upload deletes the partial file"""
+        session = self.open_session()
+        path = models.UploadSession.objects.get(id=session['id']).path
+        storage = models.UploadedFile._meta.get_field('file').storage
+        self.assertTrue(os.path.exists(storage.path(path)))
+
+        res = self.client.delete(reverse('assets:upload-session-detail', args=[session['id']]))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(os.path.exists(storage.path(path)))
@@ -0,0 +1,128 @@
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext as _
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import views, authentication, permissions
+from rest_framework import status
+from rest_framework.response import Response
+
+from core import models
+
+from assets import uploads
+from assets.serializers import CreateUploadSessionSerializer, FileUploadSerializer, UploadSessionSerializer
+
+
+def error_response(error):
+    code = status.HTTP_400_BAD_REQUEST
+    if error.conflict:
+        code = status.HTTP_409_CONFLICT
+    return Response({'detail': str(error)}, status=code)
+
+
+class UploadSessionView(views.APIView):
+    """Open a resumable upload"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description=_("[Protected | IsAuthenticated] Open a resumable upload, the chunks are sent to the chunks URL"),
+        request=CreateUploadSessionSerializer,
+        responses=UploadSessionSerializer,
+    )
+    def post(self, request):
+        serializer = CreateUploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        session = uploads.create(request.user, **serializer.validated_data)
+
+        s = UploadSessionSerializer(session)
+        return Response(s.data, status=status.HTTP_201_CREATED)
+
+
+class UploadSessionDetailView(views.APIView):
+    """Progress of a resumable upload"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description=_("[Protected | IsAuthenticated] Received bytes and next chunk expected of the upload"),
+        responses=UploadSessionSerializer,
+    )
+    def get(self, request, pk):
+        session = get_object_or_404(models.UploadSession, id=pk, owner=request.user)
+
+        s = UploadSessionSerializer(session)
+        return Response(s.data)
+
+    @extend_schema(description=_("[Protected | IsAuthenticated] Cancel the upload"))
+    def delete(self, request, pk):
+        session = get_object_or_404(models.UploadSession, id=pk, owner=request.user)
+
+        uploads.abort(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadChunkView(views.APIView):
+    """Receive a chunk of a resumable upload as the raw request body"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description=_("[Protected | IsAuthenticated] Append the chunk, numbered from 0, to the upload"),
+        parameters=[
+            OpenApiParameter(
+                'X-Chunk-Checksum',
+                OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                required=False,
+                description=_('sha256 of the chunk, verified before it is kept')
+            ),
+        ],
+        request={'application/octet-stream': OpenApiTypes.BINARY},
+        responses=UploadSessionSerializer,
+    )
+    def put(self, request, pk, index):
+        session = get_object_or_404(models.UploadSession, id=pk, owner=request.user)
+
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+
+        # Read the raw body in blocks, spooled to disk past FILE_UPLOAD_MAX_MEMORY_SIZE
+        try:
+            session = uploads.append(
+                session,
+                index,
+                request.stream,
+                length,
+                checksum=request.META.get('HTTP_X_CHUNK_CHECKSUM')
+            )
+        except uploads.UploadError as e:
+            return error_response(e)
+
+        s = UploadSessionSerializer(session)
+        return Response(s.data)
+
+
+class UploadCompleteView(views.APIView):
+    """Finish a resumable upload"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description=_("[Protected | IsAuthenticated] Verify the received file and create the uploaded file"),
+        request=None,
+        responses=FileUploadSerializer,
+    )
+    def post(self, request, pk):
+        session = get_object_or_404(models.UploadSession, id=pk, owner=request.user)
+
+        try:
+            session = uploads.complete(session)
+        except uploads.UploadError as e:
+            return error_response(e)
+
+        s = FileUploadSerializer(session.file)
+        return Response(s.data, status=status.HTTP_201_CREATED)
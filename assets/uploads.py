@@ -0,0 +1,212 @@
+"""
+Resumable chunked uploads of the UploadedFile records
+
+A session reserves a partial file in the storage (a multipart upload on
+S3), the numbered chunks are appended to it in order and completing the
+session verifies the size and the sha256 checksum before the file is moved
+into the blob of its hash and the UploadedFile row is created, so the file
+is never copied through the application.
+"""
+import os
+import uuid
+import logging
+import datetime
+import hashlib
+import tempfile
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core import models
+
+from assets import previews
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """Chunk or session rejected, `conflict` when the client must resume"""
+
+    def __init__(self, message, conflict=False):
+        super().__init__(message)
+        self.conflict = conflict
+
+
+def get_storage():
+    return models.UploadedFile._meta.get_field('file').storage
+
+
+def create(user, filename, size, checksum=None):
+    """Open a session and reserve the partial file"""
+    name = f'uploads/user_{user.id}/{uuid.uuid4().hex}'
+
+    return models.UploadSession.objects.create(
+        owner=user,
+        filename=os.path.basename(filename),
+        path=name,
+        upload_id=get_storage().create_partial(name),
+        size=size,
+        chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        checksum=checksum,
+    )
+
+
+def next_chunk(session):
+    return session.received // session.chunk_size
+
+
+def read_chunk(stream, length):
+    """Chunk copied in blocks to a file spooled to disk past FILE_UPLOAD_MAX_MEMORY_SIZE
+
+    Returns the file, the bytes read and their sha256.
+    """
+    fh = tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+    digest = hashlib.sha256()
+    read = 0
+    while read < length:
+        block = stream.read(min(BLOCK_SIZE, length - read))
+        if not block:
+            break
+        digest.update(block)
+        fh.write(block)
+        read = read + len(block)
+
+    fh.seek(0)
+    return fh, read, digest.hexdigest()
+
+
+def check_open(session):
+    if session.status == models.UploadSession.Status.COMPLETED:
+        raise UploadError('La carga ya fue completada', conflict=True)
+    if session.status == models.UploadSession.Status.FAILED:
+        raise UploadError('La carga falló, iníciela de nuevo', conflict=True)
+
+
+def check_offset(session, index):
+    """Offset of the chunk `index`, None when it was already received"""
+    offset = index * session.chunk_size
+    if offset < session.received:
+        return None
+    if offset > session.received:
+        raise UploadError(f'Se esperaba la parte {next_chunk(session)}', conflict=True)
+
+    return offset
+
+
+def append(session, index, stream, length, checksum=None):
+    """Append the chunk `index` read from the stream
+
+    A chunk already received is ignored so retries are safe. Any other
+    chunk than the next one is a conflict. The chunk is read, verified and
+    written before the session row is locked to record it, so a slow client
+    does not hold the lock.
+    """
+    check_open(session)
+    offset = check_offset(session, index)
+    if offset == None:
+        return session
+
+    expected = min(session.chunk_size, session.size - offset)
+    if length != expected:
+        raise UploadError(f'La parte {index} debe medir {expected} bytes')
+
+    # Verified before it is kept, the client sends it again otherwise
+    fh, read, sha256 = read_chunk(stream, length)
+    with fh:
+        if read != length or (checksum != None and sha256 != checksum.lower()):
+            raise UploadError(f'La parte {index} llegó incompleta o dañada')
+
+        part = get_storage().write_partial(session.path, session.upload_id, index, offset, fh)
+
+    with transaction.atomic():
+        session = models.UploadSession.objects.select_for_update().get(id=session.id)
+        check_open(session)
+        # A retry of the same chunk may have been recorded meanwhile
+        if check_offset(session, index) == None:
+            return session
+
+        if part != None:
+            session.parts = session.parts + [part]
+        session.received = offset + length
+        session.save()
+
+    return session
+
+
+def complete(session):
+    """Verify the received file and create its UploadedFile
+
+    A session whose partial file was already moved when completing it
+    failed is marked FAILED, the client has to start a new one.
+    """
+    moved = False
+    try:
+        with transaction.atomic():
+            session = models.UploadSession.objects.select_for_update().get(id=session.id)
+            if session.status == models.UploadSession.Status.COMPLETED:
+                return session
+            check_open(session)
+
+            if session.received != session.size:
+                raise UploadError(f'Se esperaba la parte {next_chunk(session)}', conflict=True)
+
+            storage = get_storage()
+            sha256 = storage.finish_partial(session.path, session.upload_id, session.parts)
+            valid = session.checksum == None or sha256 == session.checksum.lower()
+            if valid:
+                # Keeps the collector off a blob of the same content, the partial file can not be moved again
+                models.FileBlob.objects.select_for_update().filter(sha256=sha256).first()
+                upload = models.UploadedFile(owner=session.owner, filename=session.filename)
+                moved = True
+                upload.file.name = storage.store_partial(session.path, sha256)
+                upload.save()
+                previews.schedule(upload)
+
+                session.file = upload
+                session.status = models.UploadSession.Status.COMPLETED
+            else:
+                # Start over, the received bytes can not be trusted
+                storage.abort_partial(session.path, session.upload_id)
+                session.upload_id = storage.create_partial(session.path)
+                session.parts = []
+                session.received = 0
+            session.save()
+    except UploadError:
+        raise
+    except Exception:
+        if not moved:
+            raise
+        logger.exception('Could not complete the upload session %s', session.id)
+        models.UploadSession.objects.filter(id=session.id).update(status=models.UploadSession.Status.FAILED)
+        raise UploadError('La carga falló, iníciela de nuevo', conflict=True)
+
+    if not valid:
+        raise UploadError('El archivo no coincide con la suma de verificación')
+
+    return session
+
+
+def abort(session):
+    """Delete an open session and its partial file"""
+    if session.status == models.UploadSession.Status.OPEN:
+        get_storage().abort_partial(session.path, session.upload_id)
+    session.delete()
+
+
+def purge():
+    """Abort the open and failed sessions idle for more than UPLOAD_SESSIONS_RETENTION_HOURS"""
+    cutoff = timezone.now() - datetime.timedelta(hours=settings.UPLOAD_SESSIONS_RETENTION_HOURS)
+    expired = models.UploadSession.objects.filter(
+        status__in=[models.UploadSession.Status.OPEN, models.UploadSession.Status.FAILED],
+        updated_at__lt=cutoff
+    )
+
+    count = 0
+    for session in expired:
+        abort(session)
+        count = count + 1
+
+    return count
@@ -1,9 +1,14 @@
 from django.urls import path
-from assets import views
+from assets import views, upload_views
 
 app_name = 'assets'
 
 urlpatterns = [
     path('upload-file/', views.FileUploadAPIView.as_view(), name='upload-file'),
     path('download-file/<int:pk>', views.FileDownloadAPIView.as_view(), name='download-file'),
+    path('preview-file/<int:pk>', views.FilePreviewAPIView.as_view(), name='preview-file'),
+    path('upload-sessions/', upload_views.UploadSessionView.as_view(), name='upload-session'),
+    path('upload-sessions/<int:pk>/', upload_views.UploadSessionDetailView.as_view(), name='upload-session-detail'),
+    path('upload-sessions/<int:pk>/chunks/<int:index>/', upload_views.UploadChunkView.as_view(), name='upload-chunk'),
+    path('upload-sessions/<int:pk>/complete/', upload_views.UploadCompleteView.as_view(), name='upload-complete'),
 ]
\ No newline at end of file
@@ -10,8 +10,11 @@ from core import models
 
 import os
 from django.conf import settings
-from django.http import HttpResponse, Http404
-import mimetypes
+from django.http import Http404, HttpResponseRedirect
+
+from assets import previews
+from assets.downloads import file_response, open_file_response
+from core.storage import download_url
 
 class FileUploadAPIView(APIView):
     parser_classes = (MultiPartParser, FormParser)
@@ -37,6 +40,7 @@ class FileUploadAPIView(APIView):
             s = FileUploadSerializer(data=data)
             if s.is_valid():
                 s.save()
+                previews.schedule(s.instance)
                 return Response(
                     s.data,
                     status=status.HTTP_201_CREATED
@@ -52,13 +56,43 @@ class FileDownloadAPIView(APIView):
     # permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
-        model = models.UploadedFile.objects.get(id=pk)
-        file_path = os.path.join(model.file.path)
-        if os.path.exists(file_path):
-            mt = mimetypes.guess_type(file_path)
-            if mt:
-                with open(file_path, 'rb') as fh:
-                    response = HttpResponse(fh.read(), content_type=mt[0])
-                    response['Content-Disposition'] = 'inline; filename=' + os.path.basename(file_path)
-                    return response
-        raise Http404
+        model = models.UploadedFile.objects.filter(id=pk).first()
+        if model == None or not model.file.storage.exists(model.file.name):
+            raise Http404
+
+        url = download_url(model.file, model.filename or None)
+        if url != None:
+            return HttpResponseRedirect(url)
+
+        return file_response(request, model.file.path, filename=model.filename or None)
+
+
+class FilePreviewAPIView(APIView):
+    """First page PNG of an uploaded PDF or image
+
+    A missing preview is queued and answered with 202, it is only rendered
+    within the request when PREVIEW_WORKERS is 0.
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        model = models.UploadedFile.objects.filter(id=pk).first()
+        if model == None or not model.file or previews.get_cache() == None or not previews.can_preview(model):
+            raise Http404
+
+        fh = previews.open_preview(model)
+        if fh == None:
+            if previews.has_failed(model) or not model.file.storage.exists(model.file.name):
+                raise Http404
+
+            if settings.PREVIEW_WORKERS > 0:
+                previews.schedule(model)
+                return Response(status=status.HTTP_202_ACCEPTED, headers={'Retry-After': '2'})
+
+            fh = previews.build(model)
+            if fh == None:
+                raise Http404
+
+        filename = os.path.splitext(model.filename or str(model.id))[0] + '.png'
+        return open_file_response(request, fh, filename=filename)
@@ -0,0 +1,131 @@
+"""
+In process prefix indexes for the catalog pickers
+"""
+import bisect
+import threading
+import unicodedata
+
+from django.conf import settings
+from django.utils.translation import gettext as _
+
+from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core import catalog_cache, models
+
+# Catalog name: (model, searched fields, returned fields)
+CATALOGS = {
+    'supplier': (models.Supplier, ['name', 'tax_name', 'tax_id'], ['id', 'name', 'tax_id', 'tax_name']),
+    'entity': (models.Entity, ['name'], ['id', 'name', 'level', 'parent']),
+    'sifuser': (models.SifUser, ['name'], ['id', 'name', 'stateorg']),
+    'sianuser': (models.SianUser, ['name'], ['id', 'name', 'stateorg']),
+}
+
+
+def normalize(value):
+    """Lower case text without accents"""
+    value = unicodedata.normalize('NFKD', str(value))
+    return ''.join(c for c in value if not unicodedata.combining(c)).lower().strip()
+
+
+class PrefixIndex:
+    """Sorted (key, id) pairs of the active records searched with bisect
+
+    Every record has a key for each searched field and another one for
+    each word after the first, so "norte" finds "Distribuidora Norte".
+    The matches of a whole field go before the ones of a word.
+    """
+
+    def __init__(self, rows, fields):
+        self.rows = {}
+        whole = []
+        words = []
+        for row in rows:
+            self.rows[row['id']] = row
+            for field in fields:
+                value = normalize(row[field] or '')
+                if value == '':
+                    continue
+                whole.append((value, row['id']))
+                parts = value.split()
+                for i in range(1, len(parts)):
+                    words.append((' '.join(parts[i:]), row['id']))
+
+        whole.sort()
+        words.sort()
+        self.keys = [whole, words]
+
+    def search(self, term, limit):
+        """Rows of the first `limit` records with a key starting with the term"""
+        term = normalize(term)
+        ids = []
+        seen = set()
+        for keys in self.keys:
+            i = bisect.bisect_left(keys, (term,))
+            while i < len(keys) and len(ids) < limit and keys[i][0].startswith(term):
+                if keys[i][1] not in seen:
+                    seen.add(keys[i][1])
+                    ids.append(keys[i][1])
+                i = i + 1
+
+        return [self.rows[id] for id in ids]
+
+
+indexes = {}
+lock = threading.Lock()
+
+
+def get_index(catalog):
+    """Index of the catalog, loaded on first use and again after every write
+
+    Keyed by the catalog version kept in the database, so the writes and
+    imports of the other processes rebuild it too.
+    """
+    model, fields, values = CATALOGS[catalog]
+    version = catalog_cache.get_version(model)
+
+    current = indexes.get(catalog)
+    if current != None and current[0] == version:
+        return current[1]
+
+    with lock:
+        current = indexes.get(catalog)
+        if current != None and current[0] == version:
+            return current[1]
+
+        rows = model.objects.filter(is_active=True).values(*dict.fromkeys(values + fields))
+        index = PrefixIndex(rows, fields)
+        indexes[catalog] = (version, index)
+
+    return index
+
+
+def complete(catalog, term, limit=None):
+    """Rows of the best `limit` matches of the term in the catalog"""
+    if limit == None:
+        limit = settings.AUTOCOMPLETE_LIMIT
+    limit = min(limit, settings.AUTOCOMPLETE_MAX_LIMIT)
+
+    model, fields, values = CATALOGS[catalog]
+    rows = get_index(catalog).search(term, limit)
+    return [{field: row[field] for field in values} for row in rows]
+
+
+class AutocompleteMixin:
+    """Catalog viewset with an `autocomplete` action answered from the prefix index"""
+
+    # Name of the catalog in CATALOGS
+    autocomplete_catalog = None
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Best matches of the catalog from the in process prefix index"""
+        limit = request.query_params.get('limit')
+        if limit != None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise serializers.ValidationError(_('El límite debe ser un número entero'))
+
+        return Response(complete(self.autocomplete_catalog, request.query_params.get('q', ''), limit))
@@ -0,0 +1,162 @@
+"""
+Versioned cache of the catalog list responses
+"""
+import json
+import time
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, connection, transaction
+from django.db.models import BigIntegerField, F, Value
+from django.db.models.functions import Greatest
+
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from core import models
+
+# Catalogs whose writes invalidate the cached lists
+CATALOG_MODELS = [
+    models.Municipality,
+    models.Institution,
+    models.Dpe,
+    models.Supplier,
+    models.Department,
+    models.Entity,
+    models.StateOrg,
+    models.SifUser,
+    models.SianUser,
+    models.QualityControl,
+    models.EvidenceGroup,
+    models.EvidenceStage,
+    models.EvidenceStatus,
+]
+
+versions_ready = False
+
+
+def catalog_name(model):
+    return model._meta.model_name
+
+
+def get_versions(catalogs):
+    """Versions of the catalogs, read from the database shared by every process"""
+    names = [catalog_name(model) for model in catalogs]
+    rows = dict(models.CatalogVersion.objects.filter(catalog__in=names).values_list('catalog', 'version'))
+    return [rows.get(name, 0) for name in names]
+
+
+def get_version(model):
+    return get_versions([model])[0]
+
+
+def bump(model):
+    """Move the catalog to a new version
+
+    The versions are clock based and only grow, so a version never comes
+    back with different rows after a rolled back write.
+    """
+    name = catalog_name(model)
+    version = Greatest(F('version') + 1, Value(time.time_ns(), output_field=BigIntegerField()))
+    if models.CatalogVersion.objects.filter(catalog=name).update(version=version) > 0:
+        return
+
+    try:
+        with transaction.atomic():
+            models.CatalogVersion.objects.create(catalog=name, version=time.time_ns())
+    except IntegrityError:
+        # Created by another process meanwhile
+        models.CatalogVersion.objects.filter(catalog=name).update(version=version)
+
+
+def has_versions():
+    """The versions table exists, the data migrations write catalogs before it"""
+    global versions_ready
+
+    if not versions_ready:
+        versions_ready = models.CatalogVersion._meta.db_table in connection.introspection.table_names()
+    return versions_ready
+
+
+def invalidate(model):
+    """Discard the cached lists of the catalog
+
+    The new version is part of the write transaction, so the other
+    processes see it when they see the written rows.
+    """
+    if has_versions():
+        bump(model)
+
+
+def get_etag(request, catalogs):
+    """Entity tag of the list for the catalog versions and the query params"""
+    versions = [
+        f'{catalog_name(model)}:{version}'
+        for model, version in zip(catalogs, get_versions(catalogs))
+    ]
+    params = sorted(request.query_params.lists())
+    content = json.dumps([request.path, versions, params])
+
+    return '"' + hashlib.sha256(content.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+def is_not_modified(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if header == None:
+        return False
+
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+def cached_response(request, catalogs, build):
+    """List response served from the catalog cache
+
+    `build()` returns the response data and is only called on a miss. A
+    request whose If-None-Match holds the current ETag gets a 304 without
+    reading the cache, the database or the serializer.
+    """
+    etag = get_etag(request, catalogs)
+    headers = {
+        'ETag': etag,
+        'Cache-Control': 'private, no-cache',
+    }
+    if is_not_modified(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    local = caches[settings.CATALOG_CACHE_ALIAS]
+    key = f'catalog_list_{etag[1:-1]}'
+    data = local.get(key)
+    if data == None:
+        data = build()
+        if isinstance(data, Response):
+            if data.status_code != status.HTTP_200_OK:
+                return data
+            data = data.data
+
+        # Plain values, without the serializer the DRF lists keep a reference to
+        data = json.loads(JSONRenderer().render(data))
+        local.set(key, data, settings.CATALOG_CACHE_TIMEOUT)
+
+    return Response(data, headers=headers)
+
+
+class CachedListMixin:
+    """Catalog viewset whose list is cached and answers conditional requests"""
+
+    # Models the list is serialized from, the queryset model by default
+    cache_models = None
+
+    def get_cache_models(self):
+        if self.cache_models != None:
+            return self.cache_models
+        return [self.queryset.model]
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.get_cache_models(),
+            lambda: super(CachedListMixin, self).list(request, *args, **kwargs)
+        )
@@ -0,0 +1,106 @@
+"""
+Disk cache of generated files, evicted by least recent use
+"""
+import os
+import time
+import tempfile
+import threading
+
+
+# Directory: (estimated bytes, monotonic time of the last walk), per process
+usage = {}
+usage_lock = threading.Lock()
+
+
+class DiskCache:
+    """Content addressed files evicted by least recent use once over max_bytes
+
+    The use time is the access time, set on every hit, so the modified
+    time the responses build their validators from does not change.
+    """
+
+    # Seconds after which the other processes' writes are counted again
+    walk_interval = 300
+
+    def __init__(self, directory, max_bytes, extension='pdf'):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.{self.extension}')
+
+    def open(self, key):
+        """Open the cached file for reading or return None on a miss"""
+        path = self.path(key)
+        try:
+            fh = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+
+        # Access time for the LRU eviction
+        try:
+            os.utime(path, (time.time(), os.fstat(fh.fileno()).st_mtime))
+        except FileNotFoundError:
+            # Evicted meanwhile, the open file is still readable
+            pass
+        return fh
+
+    def put(self, key, content):
+        """Store content under key and return the opened file"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(content)
+        os.replace(tmp_path, path)
+
+        fh = open(path, 'rb')
+        self.added(len(content))
+        return fh
+
+    def added(self, size):
+        """Count a stored file, walking the cache only once it may be over max_bytes
+
+        The total is an estimate of this process, refreshed by a walk when
+        it goes over max_bytes or every walk_interval seconds.
+        """
+        now = time.monotonic()
+        with usage_lock:
+            total, walked_at = usage.get(self.directory, (None, None))
+            if total != None and total + size <= self.max_bytes and now - walked_at < self.walk_interval:
+                usage[self.directory] = (total + size, walked_at)
+                return
+
+        total = self.evict()
+        with usage_lock:
+            usage[self.directory] = (total, now)
+
+    def evict(self):
+        """Delete the least recently used files until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(f'.{self.extension}'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+                total = total + stat.st_size
+
+        entries.sort()
+        for atime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total = total - size
+
+        return total
@@ -0,0 +1,51 @@
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.translation import gettext as _
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import views, authentication, permissions
+
+from core.exporter import get_exporter
+from core.spreadsheet import Echo, write_sheet
+
+SHEET_NAME = 'Registros'
+
+
+class CatalogExportView(views.APIView):
+    """Export a catalog in the import layout, subclassed by every catalog app"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    catalog = None
+
+    @extend_schema(
+        description=_("[Protected] Export the records in the import layout"),
+        parameters=[
+            OpenApiParameter(
+                'type',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Either "xlsx" or "csv". Default: "xlsx"')
+            ),
+        ],
+        responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY},
+    )
+    def get(self, request, format=None):
+        rows = get_exporter(self.catalog).rows()
+
+        if request.query_params.get('type') == 'csv':
+            writer = csv.writer(Echo())
+            lines = (writer.writerow(row) for row in rows)
+
+            response = StreamingHttpResponse(lines, content_type='text/csv')
+            response['Content-Disposition'] = f'attachment; filename="{self.catalog}.csv"'
+            return response
+
+        # A workbook is a zip file, it is built on disk and then streamed
+        fh = tempfile.TemporaryFile()
+        write_sheet(fh, SHEET_NAME, rows)
+        fh.seek(0)
+
+        return FileResponse(fh, as_attachment=True, filename=f'{self.catalog}.xlsx')
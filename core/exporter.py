@@ -0,0 +1,65 @@
+"""
+Catalog exports in the column layout of the catalog imports
+"""
+from core import models
+
+
+class CatalogExporter:
+    """Rows of a catalog as read by CatalogImporter: [id, active, name, ...]"""
+    model = None
+    headers = ['Id', 'Activo', 'Nombre']
+    columns = ['id', 'is_active', 'name']
+    ordering = ['id']
+    chunk_size = 2000
+
+    def __init__(self, model=None):
+        if model != None:
+            self.model = model
+
+    def rows(self):
+        """Header and records, read in chunks with a server side cursor when available"""
+        yield self.headers
+
+        queryset = self.model.objects.order_by(*self.ordering).values_list(*self.columns)
+        for row in queryset.iterator(chunk_size=self.chunk_size):
+            yield self.format(row)
+
+    def format(self, row):
+        row = list(row)
+        row[1] = 'Si' if row[1] else 'No'
+        return ['' if value == None else value for value in row]
+
+
+class SupplierExporter(CatalogExporter):
+    model = models.Supplier
+    headers = ['Id', 'Activo', 'Nombre', 'RFC', 'Razón social']
+    columns = ['id', 'is_active', 'name', 'tax_id', 'tax_name']
+
+
+class HierarchyExporter(CatalogExporter):
+    """Parents are listed before their children"""
+    headers = ['Id', 'Activo', 'Nombre', 'Padre']
+    columns = ['id', 'is_active', 'name', 'parent__name']
+    ordering = ['level', 'id']
+
+
+class StateOrgUserExporter(CatalogExporter):
+    headers = ['Id', 'Activo', 'Nombre', 'Organización estatal']
+    columns = ['id', 'is_active', 'name', 'stateorg__name']
+
+
+EXPORTERS = {
+    'municipality': lambda: CatalogExporter(models.Municipality),
+    'institution': lambda: CatalogExporter(models.Institution),
+    'dpe': lambda: CatalogExporter(models.Dpe),
+    'supplier': lambda: SupplierExporter(),
+    'department': lambda: HierarchyExporter(models.Department),
+    'entity': lambda: HierarchyExporter(models.Entity),
+    'stateorg': lambda: HierarchyExporter(models.StateOrg),
+    'sifuser': lambda: StateOrgUserExporter(models.SifUser),
+    'sianuser': lambda: StateOrgUserExporter(models.SianUser),
+}
+
+
+def get_exporter(catalog):
+    return EXPORTERS[catalog]()
@@ -0,0 +1,79 @@
+"""
+Queries over the materialized paths of the HierarchyMixin models
+"""
+
+
+def descendants_of(queryset, id):
+    """Records below the one with the given id"""
+    node = queryset.model.objects.filter(id=id).first()
+    if node == None:
+        return queryset.none()
+
+    return queryset.filter(path__startswith=node.subtree_path())
+
+
+def ancestors_of(queryset, id):
+    """Records above the one with the given id"""
+    node = queryset.model.objects.filter(id=id).first()
+    if node == None:
+        return queryset.none()
+
+    ids = [int(part) for part in node.path.split('/') if part != '']
+    return queryset.filter(id__in=ids)
+
+
+def build_tree(queryset, fields=('id', 'is_active', 'name', 'level', 'parent')):
+    """Nested records read with a single query
+
+    Records whose parent is not in the queryset are returned as roots.
+    """
+    nodes = {}
+    rows = list(queryset.order_by('level', 'name').values(*fields))
+    for row in rows:
+        row['children'] = []
+        nodes[row['id']] = row
+
+    roots = []
+    for row in rows:
+        parent = nodes.get(row['parent'])
+        if parent != None:
+            parent['children'].append(row)
+        else:
+            roots.append(row)
+
+    return roots
+
+
+def rebuild_paths(model):
+    """Recompute the level and path of every record from the parents"""
+    rows = list(model.objects.values('id', 'parent', 'level', 'path'))
+    parents = {row['id']: row['parent'] for row in rows}
+
+    paths = {}
+
+    def path_of(id):
+        chain = []
+        current = id
+        while current != None and current not in paths and current not in chain:
+            chain.append(current)
+            current = parents.get(current)
+
+        # Rows in a parent cycle are rooted where the cycle closes
+        path = '/'
+        if current != None and current in paths:
+            path = f'{paths[current]}{current}/'
+
+        for node in reversed(chain):
+            paths[node] = path
+            path = f'{path}{node}/'
+        return paths[id]
+
+    changed = []
+    for row in rows:
+        path = path_of(row['id'])
+        level = path.count('/') - 1
+        if path != row['path'] or level != row['level']:
+            changed.append(model(id=row['id'], path=path, level=level))
+
+    model.objects.bulk_update(changed, ['path', 'level'], batch_size=1000)
+    return len(changed)
@@ -0,0 +1,88 @@
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext as _
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import views, authentication, permissions
+from rest_framework import status
+from rest_framework.parsers import FileUploadParser
+from rest_framework.response import Response
+
+from core import import_jobs, models
+from core.serializers import ImportJobSerializer
+
+DRY_RUN_PARAMETER = OpenApiParameter(
+    'dry_run',
+    OpenApiTypes.BOOL,
+    required=False,
+    description=_('Only compute the inserts, updates, unchanged rows and conflicts, without saving them')
+)
+
+
+def is_dry_run(request):
+    return request.query_params.get('dry_run') in ('1', 'true', 'True')
+
+
+def dry_run_response(request, catalog, rows):
+    """Summary and diff of the import of the rows, nothing is saved"""
+    job = import_jobs.preview_rows(request.user, catalog, rows)
+
+    s = ImportJobSerializer(job, context={'request': request})
+    return Response(s.data)
+
+
+class CatalogImportJobView(views.APIView):
+    """Queue the import of a catalog spreadsheet, subclassed by every catalog app"""
+    parser_classes = (FileUploadParser,)
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    catalog = None
+
+    @extend_schema(
+        description=_("[Protected] Queue the import of the records"),
+        parameters=[DRY_RUN_PARAMETER],
+        responses=ImportJobSerializer,
+    )
+    def post(self, request, filename, format=None):
+        file = request.FILES['file']
+
+        job = import_jobs.submit(request.user, self.catalog, file, dry_run=is_dry_run(request))
+
+        s = ImportJobSerializer(job, context={'request': request})
+        return Response(s.data, status=status.HTTP_202_ACCEPTED)
+
+
+@extend_schema(tags=['Catalogs'])
+class ImportJobDetailView(views.APIView):
+    """Progress of a catalog import job"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description=_("[Protected] Import job progress"),
+        responses=ImportJobSerializer,
+    )
+    def get(self, request, pk):
+        job = get_object_or_404(models.ImportJob, id=pk, owner=request.user)
+
+        s = ImportJobSerializer(job, context={'request': request})
+        return Response(s.data)
+
+
+@extend_schema(tags=['Catalogs'])
+class ImportJobDiffView(views.APIView):
+    """Download the diff of a dry run import"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        description=_("[Protected] Import dry run diff"),
+        responses={(200, 'text/csv'): OpenApiTypes.BINARY},
+    )
+    def get(self, request, pk):
+        job = get_object_or_404(models.ImportJob, id=pk, owner=request.user)
+        if not job.diff:
+            raise Http404
+
+        return FileResponse(job.diff.open('rb'), as_attachment=True, filename=f'diff_{job.id}.csv')
@@ -0,0 +1,171 @@
+"""
+Database backed queue for the catalog import jobs
+"""
+import csv
+import datetime
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from core import models
+from core.importer import DIFF_HEADERS, get_importer
+from core.jobs import heartbeat
+from core.spreadsheet import count_rows, read_sheet
+
+SHEET_NAME = 'Registros'
+
+
+def submit(user, catalog, file, dry_run=False):
+    """Queue the import of the uploaded spreadsheet into the catalog"""
+    job = models.ImportJob(owner=user, catalog=catalog, dry_run=dry_run)
+    job.file.save(file.name, file, save=False)
+    job.save()
+
+    return job
+
+
+def preview(job, rows):
+    """Classify the rows without writing them, attaching the summary and the diff to the job"""
+    importer = get_importer(job.catalog)
+    importer.dry_run = True
+
+    with tempfile.TemporaryFile('w+', encoding='utf-8', newline='') as fh:
+        importer.diff = csv.writer(fh)
+        importer.diff.writerow(DIFF_HEADERS)
+        job.messages = importer.import_sheet(rows)
+
+        fh.seek(0)
+        job.diff.save(f'diff_{job.id}.csv', File(fh), save=False)
+
+    job.summary = importer.summary
+    job.rows_processed = importer.processed
+    job.status = models.ImportJob.Status.COMPLETED
+    job.finished_at = timezone.now()
+    job.save()
+
+    return job
+
+
+def preview_rows(user, catalog, rows):
+    """Dry run of an import done within the request"""
+    job = models.ImportJob.objects.create(
+        owner=user,
+        catalog=catalog,
+        dry_run=True,
+        status=models.ImportJob.Status.RUNNING,
+        started_at=timezone.now()
+    )
+
+    with heartbeat(job, settings.IMPORT_JOBS_HEARTBEAT):
+        return preview(job, rows)
+
+
+def requeue_stalled():
+    """Send back to the queue the jobs of workers that died while running them
+
+    A running job touches its updated_at every IMPORT_JOBS_HEARTBEAT
+    seconds, the ones silent for IMPORT_JOBS_TIMEOUT lost their worker.
+    """
+    timeout = timezone.now() - datetime.timedelta(seconds=settings.IMPORT_JOBS_TIMEOUT)
+    stalled = models.ImportJob.objects.filter(
+        status=models.ImportJob.Status.RUNNING,
+        updated_at__lt=timeout
+    )
+
+    failed = stalled.filter(attempts__gte=settings.IMPORT_JOBS_MAX_ATTEMPTS).update(
+        status=models.ImportJob.Status.FAILED,
+        error='Se agotó el tiempo para importar el archivo',
+        finished_at=timezone.now()
+    )
+    requeued = stalled.update(status=models.ImportJob.Status.PENDING)
+
+    return failed + requeued
+
+
+def claim():
+    """Mark the oldest pending job as running and return it"""
+    with transaction.atomic():
+        job = models.ImportJob.objects.select_for_update(skip_locked=True).filter(
+            status=models.ImportJob.Status.PENDING
+        ).order_by('id').first()
+        if job == None:
+            return None
+
+        job.status = models.ImportJob.Status.RUNNING
+        job.attempts = job.attempts + 1
+        job.started_at = timezone.now()
+        job.resumed_from = job.rows_processed
+        job.save()
+
+    return job
+
+
+def run(job):
+    """Import the file of a claimed job, resuming after the rows already imported"""
+    importer = get_importer(job.catalog)
+    importer.messages = list(job.messages)
+    if len(job.summary) > 0:
+        importer.summary = dict(job.summary)
+
+    def progress(importer):
+        job.rows_processed = importer.processed
+        job.messages = list(importer.messages)
+        job.summary = dict(importer.summary)
+        job.save(update_fields=['total_rows', 'rows_processed', 'messages', 'summary', 'updated_at'])
+
+    try:
+        # The dry runs and the sort of the hierarchy rows go long before any progress
+        with heartbeat(job, settings.IMPORT_JOBS_HEARTBEAT), job.file.open('rb') as fh:
+            if job.dry_run:
+                return preview(job, read_sheet(fh, SHEET_NAME))
+
+            total_rows = count_rows(fh, SHEET_NAME)
+            if total_rows != None:
+                job.total_rows = max(total_rows - 1, 0)
+
+            fh.seek(0)
+            job.messages = importer.import_sheet(
+                read_sheet(fh, SHEET_NAME),
+                skip=job.rows_processed,
+                progress=progress
+            )
+
+        job.rows_processed = importer.processed
+        job.summary = importer.summary
+        job.status = models.ImportJob.Status.COMPLETED
+        job.error = None
+    except Exception as e:
+        job.error = str(e)
+        if job.attempts < settings.IMPORT_JOBS_MAX_ATTEMPTS:
+            job.status = models.ImportJob.Status.PENDING
+            job.save()
+            return job
+        job.status = models.ImportJob.Status.FAILED
+
+    job.finished_at = timezone.now()
+    job.save()
+
+    return job
+
+
+def purge():
+    """Delete the finished jobs and their files older than IMPORT_JOBS_RETENTION_DAYS"""
+    cutoff = timezone.now() - datetime.timedelta(days=settings.IMPORT_JOBS_RETENTION_DAYS)
+    expired = models.ImportJob.objects.filter(
+        status__in=[models.ImportJob.Status.COMPLETED, models.ImportJob.Status.FAILED],
+        finished_at__lt=cutoff
+    )
+
+    count = 0
+    for job in expired:
+        if job.file:
+            job.file.delete(save=False)
+        if job.diff:
+            job.diff.delete(save=False)
+        job.delete()
+        count = count + 1
+
+    return count
@@ -0,0 +1,440 @@
+"""
+Set based import of the catalog spreadsheets
+"""
+import itertools
+
+from django.db import transaction
+from django.utils import timezone
+
+from core import catalog_cache, models
+from core.hierarchy import rebuild_paths
+
+DIFF_HEADERS = ['Fila', 'Acción', 'Id', 'Nombre', 'Cambios', 'Mensajes']
+DIFF_ACTIONS = {
+    'inserts': 'Alta',
+    'updates': 'Actualización',
+    'unchanged': 'Sin cambios',
+    'conflicts': 'Conflicto',
+    'errors': 'Error',
+}
+
+
+class Pending:
+    """Key of a record waiting to be inserted"""
+
+    def __str__(self):
+        return 'nuevo'
+
+
+class CatalogImporter:
+    """Import the `Registros` rows of a catalog: [id, active, name, ...]
+
+    Ids and unique values are preloaded so every row is validated in
+    memory, as if the previous rows were already saved, and the records
+    are written in batches with bulk_create and bulk_update inside a
+    single transaction.
+
+    With `dry_run` nothing is written: the rows are only classified in
+    `summary` and, when `diff` is a csv writer, the inserts, updates,
+    conflicts and errors are written to it.
+    """
+    model = None
+    columns = 3
+    fields = ['is_active', 'name']
+    unique_fields = ['name']
+    preload_fields = []
+    unique_messages = {
+        'name': 'Registro duplicado: {name}',
+    }
+    batch_size = 1000
+
+    def __init__(self, model=None):
+        if model != None:
+            self.model = model
+
+        self.messages = []
+        self.summary = {action: 0 for action in DIFF_ACTIONS}
+        self.processed = 0
+        self.progress = None
+        self.dry_run = False
+        self.diff = None
+        self.row_number = None
+        self.creates = []
+        self.updates = {}
+        self.released = set()
+        self.load()
+
+    def load(self):
+        """Preload the ids and unique values of the existing records"""
+        self.ids = set()
+        self.owners = {field: {} for field in self.unique_fields}
+        self.values = {}
+        self.attnames = [self.model._meta.get_field(field).attname for field in self.fields]
+        names = dict.fromkeys(['id'] + self.unique_fields + self.preload_fields + self.attnames)
+        for row in self.model.objects.values(*names):
+            self.ids.add(row['id'])
+            self.values[row['id']] = row
+            for field in self.unique_fields:
+                self.owners[field][row[field]] = row['id']
+
+    def clean(self, field, value):
+        if value == None:
+            return None
+        return self.model._meta.get_field(field).to_python(value)
+
+    def read(self, row):
+        """Field values of the row or None when it can not be imported"""
+        return {
+            'is_active': row[1] == 'Si',
+            'name': self.clean('name', row[2]),
+        }
+
+    def validate(self, key, values):
+        """Error messages of the row values, in the order of the database checks"""
+        messages = []
+        for field in self.unique_fields:
+            if values[field] == None:
+                messages.append(self.unique_messages[field].format(**values))
+                continue
+            owner = self.owners[field].get(values[field])
+            if owner != None and owner != key:
+                messages.append(self.unique_messages[field].format(**values))
+        return messages
+
+    def import_sheet(self, rows, skip=0, progress=None):
+        """Import the rows of the `Registros` sheet and return the messages
+
+        Without a progress callback the whole sheet is imported in one
+        transaction. With it, every batch is committed together with the
+        progress(importer) call, and the first `skip` rows, already
+        imported by a previous run, are not imported again.
+        """
+        if rows == None:
+            return ['El archivo debe incluir una hoja llamada: Registros']
+
+        rows = iter(rows)
+        next(rows, None)
+        first = next(rows, None)
+        if first == None:
+            return ['Debe especificar al menos un registro para crear o actualizar.']
+
+        # Numbered as the spreadsheet rows, after the header
+        rows = enumerate(itertools.chain([first], rows), start=2)
+        self.progress = progress
+        if progress == None:
+            with transaction.atomic():
+                self.import_rows(rows, skip)
+        else:
+            self.import_rows(rows, skip)
+
+        return self.messages
+
+    def import_rows(self, rows, skip):
+        for number, row in rows:
+            if self.processed >= skip:
+                self.row_number = number
+                self.import_row(row)
+            self.processed = self.processed + 1
+
+            pending = len(self.creates) + len(self.updates)
+            if pending >= self.batch_size or (self.processed > skip and self.processed % self.batch_size == 0):
+                self.flush()
+        self.flush()
+
+    def import_row(self, row):
+        if len(row) < self.columns:
+            return
+
+        id = None
+        if type(row[0]) is int:
+            id = row[0]
+
+        count = len(self.messages)
+        values = self.read(row)
+        if values == None:
+            self.record('errors', id, row[2], messages=self.messages[count:])
+            return
+
+        if id != None and id not in self.ids:
+            self.messages.append(f"No existe un registro con el id: {id}")
+            self.record('errors', id, row[2], messages=self.messages[count:])
+            return
+
+        key = id
+        if key == None:
+            key = Pending()
+
+        messages = self.validate(key, values)
+        if len(messages) > 0:
+            self.messages += messages
+            self.record('conflicts', id, values['name'], messages=messages)
+            return
+
+        changes = []
+        if id != None:
+            previous = self.values[id]
+            changes = [
+                (field, previous.get(field), values.get(field))
+                for field in self.attnames
+                if previous.get(field) != values.get(field)
+            ]
+            if len(changes) == 0:
+                self.record('unchanged', id, values['name'])
+                return
+
+        # A single statement can not move a unique value between two records
+        claimed = set((field, values[field]) for field in self.unique_fields)
+        if len(claimed & self.released) > 0:
+            self.flush()
+
+        if id != None:
+            previous = self.values[id]
+            for field in self.unique_fields:
+                if previous[field] != values[field]:
+                    del self.owners[field][previous[field]]
+                    self.released.add((field, previous[field]))
+            self.updates[id] = self.model(id=id, **values)
+        else:
+            self.creates.append((key, self.model(**values)))
+
+        self.values[key] = values
+        for field in self.unique_fields:
+            self.owners[field][values[field]] = key
+
+        if id != None:
+            self.record('updates', id, values['name'], changes=changes)
+        else:
+            self.record('inserts', id, values['name'])
+
+    def record(self, action, id, name, changes=[], messages=[]):
+        """Count the row in the summary and add it to the diff"""
+        self.summary[action] = self.summary[action] + 1
+        if self.diff == None or action == 'unchanged':
+            return
+
+        self.diff.writerow([
+            self.row_number,
+            DIFF_ACTIONS[action],
+            id,
+            name,
+            '; '.join(f'{field}: {old} -> {new}' for field, old, new in changes),
+            ' | '.join(messages),
+        ])
+
+    def flush(self):
+        """Write the pending records"""
+        with transaction.atomic():
+            if not self.dry_run:
+                self.write()
+            if self.progress != None:
+                self.progress(self)
+
+        self.creates = []
+        self.updates = {}
+        self.released = set()
+
+    def write(self):
+        if len(self.updates) > 0:
+            now = timezone.now()
+            updates = list(self.updates.values())
+            for instance in updates:
+                instance.updated_at = now
+            self.model.objects.bulk_update(updates, self.fields + ['updated_at'], batch_size=self.batch_size)
+
+        if len(self.creates) > 0:
+            instances = [instance for key, instance in self.creates]
+            self.model.objects.bulk_create(instances, batch_size=self.batch_size)
+
+            # Only some databases return the ids of the inserted rows
+            if any(instance.pk == None for instance in instances):
+                ids = dict(self.model.objects.filter(
+                    name__in=[instance.name for instance in instances]
+                ).values_list('name', 'id'))
+                for instance in instances:
+                    instance.pk = ids[instance.name]
+
+            for key, instance in self.creates:
+                self.created(key, instance.pk)
+
+        if len(self.updates) > 0 or len(self.creates) > 0:
+            catalog_cache.invalidate(self.model)
+
+    def created(self, key, id):
+        """Replace the placeholder key of an inserted record by its id"""
+        values = self.values.pop(key)
+        self.ids.add(id)
+        self.values[id] = values
+        for field in self.unique_fields:
+            if self.owners[field].get(values[field]) is key:
+                self.owners[field][values[field]] = id
+
+
+class SupplierImporter(CatalogImporter):
+    """Rows with the tax id and the tax name: [id, active, name, tax_id, tax_name]"""
+    model = models.Supplier
+    columns = 5
+    fields = ['is_active', 'name', 'tax_id', 'tax_name']
+    unique_fields = ['name', 'tax_id', 'tax_name']
+    unique_messages = {
+        'name': 'Registro duplicado: {name}',
+        'tax_id': 'El RFC {tax_id} ya se encuentra asociado a otro registro',
+        'tax_name': 'La razón social {tax_name} ya se encuentra asociada a otro registro',
+    }
+
+    def read(self, row):
+        values = super().read(row)
+        values.update({
+            'tax_id': self.clean('tax_id', row[3]),
+            'tax_name': self.clean('tax_name', row[4]),
+        })
+        return values
+
+
+class HierarchyImporter(CatalogImporter):
+    """Rows with the name of the parent record: [id, active, name, parent_name]
+
+    The whole sheet is sorted so the parents defined in the file are
+    imported before their children, whatever the order of the rows. When
+    a record changes of parent the paths of its subtree are rebuilt at
+    the end of the import.
+    """
+    fields = ['is_active', 'name', 'parent', 'level', 'path']
+    preload_fields = ['level', 'path']
+
+    def import_rows(self, rows, skip):
+        # The rows imported by a previous run may have moved records
+        self.moved = skip > 0
+        super().import_rows(self.sort_rows(list(rows)), skip)
+
+        if self.moved and not self.dry_run:
+            rebuild_paths(self.model)
+            catalog_cache.invalidate(self.model)
+
+    def sort_rows(self, rows):
+        """Rows ordered by their depth in the parent graph of the file
+
+        The order only depends on the file, so a resumed job skips the same
+        rows. Rows in a parent cycle go last, in the order of the file.
+        """
+        index = {}
+        for i, (number, row) in enumerate(rows):
+            if len(row) >= self.columns:
+                index.setdefault(self.clean('name', row[2]), i)
+
+        parents = []
+        for i, (number, row) in enumerate(rows):
+            parent = None
+            if len(row) > 3 and row[3] != None:
+                parent = index.get(self.clean('name', row[3]))
+            if parent == i:
+                parent = None
+            parents.append(parent)
+
+        depths = [None] * len(rows)
+        for i in range(len(rows)):
+            path = []
+            visited = set()
+            j = i
+            while j != None and depths[j] == None and j not in visited:
+                path.append(j)
+                visited.add(j)
+                j = parents[j]
+
+            if j == None:
+                depth = -1
+            elif depths[j] != None:
+                depth = depths[j]
+            else:
+                depth = float('inf')
+
+            for k in reversed(path):
+                depth = depth + 1
+                depths[k] = depth
+
+        order = sorted(range(len(rows)), key=lambda i: (depths[i], i))
+        return [rows[i] for i in order]
+
+    def read(self, row):
+        values = super().read(row)
+
+        parent_name = None
+        if len(row) > 3:
+            parent_name = row[3]
+
+        parent = None
+        if parent_name != None:
+            name = self.clean('name', parent_name)
+            parent = self.owners['name'].get(name)
+            if parent == None:
+                self.messages.append(f"No se encontró el registro padre: {parent_name}")
+                return None
+
+            # The parent is still waiting to be inserted
+            if type(parent) is not int:
+                self.flush()
+                parent = self.owners['name'][name]
+
+        if parent != None and parent == row[0]:
+            parent = None
+
+        level = 0
+        path = '/'
+        if parent != None:
+            level = self.values[parent]['level'] + 1
+            path = f"{self.values[parent]['path']}{parent}/"
+
+        if row[0] in self.ids and self.values[row[0]]['parent_id'] != parent:
+            self.moved = True
+
+        values.update({
+            'parent_id': parent,
+            'level': level,
+            'path': path,
+        })
+        return values
+
+
+class StateOrgUserImporter(CatalogImporter):
+    """Rows with the name of the state organization: [id, active, name, stateorg_name]"""
+    fields = ['is_active', 'name', 'stateorg']
+
+    def load(self):
+        super().load()
+        self.stateorgs = dict(models.StateOrg.objects.values_list('name', 'id'))
+
+    def read(self, row):
+        values = super().read(row)
+
+        stateorg_name = None
+        if len(row) > 3:
+            stateorg_name = row[3]
+
+        if stateorg_name == None:
+            self.messages.append('Organización estatal es obligatoria')
+            return None
+
+        stateorg = self.stateorgs.get(stateorg_name)
+        if stateorg == None:
+            self.messages.append(f"No se encontró la dependencia estatal: {stateorg_name}")
+            return None
+
+        values.update({'stateorg_id': stateorg})
+        return values
+
+
+IMPORTERS = {
+    'municipality': lambda: CatalogImporter(models.Municipality),
+    'institution': lambda: CatalogImporter(models.Institution),
+    'dpe': lambda: CatalogImporter(models.Dpe),
+    'supplier': lambda: SupplierImporter(),
+    'department': lambda: HierarchyImporter(models.Department),
+    'entity': lambda: HierarchyImporter(models.Entity),
+    'stateorg': lambda: HierarchyImporter(models.StateOrg),
+    'sifuser': lambda: StateOrgUserImporter(models.SifUser),
+    'sianuser': lambda: StateOrgUserImporter(models.SianUser),
+}
+
+
+def get_importer(catalog):
+    """New importer for the catalog name used by the import jobs"""
+    return IMPORTERS[catalog]()
@@ -0,0 +1,33 @@
+"""
+Helpers shared by the database backed job queues
+"""
+import threading
+import contextlib
+
+from django.db import connection
+from django.utils import timezone
+
+
+@contextlib.contextmanager
+def heartbeat(job, interval):
+    """Touch the updated_at of the running job every interval seconds
+
+    The workers requeue the running jobs whose updated_at is older than
+    their timeout, so a long job stays claimed while its worker is alive.
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                type(job).objects.filter(id=job.id).update(updated_at=timezone.now())
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
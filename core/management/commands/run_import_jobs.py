@@ -0,0 +1,45 @@
+"""
+Django command to run the queued catalog import jobs
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import import_jobs
+
+
+class Command(BaseCommand):
+    """Django command to process the catalog import jobs queue"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the pending jobs and exit',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5,
+            help='Seconds to wait when the queue is empty',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        self.stdout.write('Waiting for import jobs...')
+        while True:
+            import_jobs.requeue_stalled()
+            purged = import_jobs.purge()
+            if purged > 0:
+                self.stdout.write(f'Purged {purged} expired import jobs')
+
+            job = import_jobs.claim()
+            if job != None:
+                job = import_jobs.run(job)
+                self.stdout.write(f'Import job {job.id}: {job.get_status_display()} ({job.rows_processed} rows)')
+                continue
+
+            if options['once']:
+                break
+
+            time.sleep(options['poll_interval'])
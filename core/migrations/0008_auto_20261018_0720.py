@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_auto_20240522_1942'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['owner', 'status', 'type', 'group', 'id'], name='evidence_owner_filters_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['group', 'status', 'id'], name='evidence_group_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['type', 'status', 'id'], name='evidence_type_status_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:23
+
+import core.models
+from django.conf import settings
+import django.core.files.storage
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_auto_20261018_0720'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('PEN', 'Pending'), ('RUN', 'Running'), ('COM', 'Completed'), ('ERR', 'Failed')], default='PEN', max_length=3)),
+                ('format', models.CharField(default='pdf', max_length=8)),
+                ('parameters', models.JSONField(default=dict)),
+                ('file', models.FileField(blank=True, null=True, storage=django.core.files.storage.FileSystemStorage(location='/repo/files'), upload_to=core.models.get_report_path)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='reportjob',
+            index=models.Index(fields=['status', 'id'], name='reportjob_status_idx'),
+        ),
+    ]
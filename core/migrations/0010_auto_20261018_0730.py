@@ -0,0 +1,59 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_status_counts(apps, schema_editor):
+    """Fill the rollup with the existing evidences"""
+    Evidence = apps.get_model('core', 'Evidence')
+    EvidenceStatusCount = apps.get_model('core', 'EvidenceStatusCount')
+
+    rows = Evidence.objects.order_by().values(
+        'group_id',
+        'status_id',
+        'owner_id',
+        'owner__profile__division',
+    ).annotate(total=models.Count('id'))
+
+    EvidenceStatusCount.objects.bulk_create([
+        EvidenceStatusCount(
+            group_id=row['group_id'],
+            status_id=row['status_id'],
+            owner_id=row['owner_id'],
+            division_id=row['owner__profile__division'],
+            count=row['total'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_auto_20261018_0723'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidenceStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('division', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.division')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.evidencegroup')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('status', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.evidencestatus')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='evidencestatuscount',
+            index=models.Index(fields=['division', 'group', 'status'], name='statuscount_division_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='evidencestatuscount',
+            unique_together={('group', 'status', 'owner')},
+        ),
+        migrations.RunPython(build_status_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:38
+
+import core.models
+from django.conf import settings
+import django.core.files.storage
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_auto_20261018_0730'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('PEN', 'Pending'), ('RUN', 'Running'), ('COM', 'Completed'), ('ERR', 'Failed')], default='PEN', max_length=3)),
+                ('catalog', models.CharField(max_length=32)),
+                ('file', models.FileField(storage=django.core.files.storage.FileSystemStorage(location='/repo/files'), upload_to=core.models.get_import_path)),
+                ('total_rows', models.IntegerField(blank=True, null=True)),
+                ('rows_processed', models.IntegerField(default=0)),
+                ('resumed_from', models.IntegerField(default=0)),
+                ('messages', models.JSONField(default=list)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='importjob',
+            index=models.Index(fields=['status', 'id'], name='importjob_status_idx'),
+        ),
+    ]
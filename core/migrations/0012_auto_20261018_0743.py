@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:43
+
+import core.models
+import django.core.files.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_auto_20261018_0738'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='diff',
+            field=models.FileField(blank=True, null=True, storage=django.core.files.storage.FileSystemStorage(location='/repo/files'), upload_to=core.models.get_import_path),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='dry_run',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='summary',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=django.core.files.storage.FileSystemStorage(location='/repo/files'), upload_to=core.models.get_import_path),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    """Fill the path and level of the existing records, breadth first from the roots"""
+    for name in ['Department', 'Entity', 'StateOrg', 'EvidenceType']:
+        model = apps.get_model('core', name)
+        rows = list(model.objects.values('id', 'parent'))
+
+        children = {}
+        for row in rows:
+            children.setdefault(row['parent'], []).append(row['id'])
+
+        changed = []
+        level = [(id, '/') for id in children.get(None, [])]
+        depth = 0
+        while len(level) > 0:
+            following = []
+            for id, path in level:
+                changed.append(model(id=id, path=path, level=depth))
+                for child in children.get(id, []):
+                    following.append((child, f'{path}{id}/'))
+            level = following
+            depth = depth + 1
+
+        model.objects.bulk_update(changed, ['path', 'level'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_auto_20261018_0743'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='path',
+            field=models.CharField(db_index=True, default='/', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='entity',
+            name='path',
+            field=models.CharField(db_index=True, default='/', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='evidencetype',
+            name='path',
+            field=models.CharField(db_index=True, default='/', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='stateorg',
+            name='path',
+            field=models.CharField(db_index=True, default='/', max_length=255),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
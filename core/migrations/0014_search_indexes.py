@@ -0,0 +1,54 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Columns filtered with icontains, which PostgreSQL runs as UPPER(<column>) LIKE
+SEARCH_COLUMNS = [
+    ('core_municipality', 'name'),
+    ('core_institution', 'name'),
+    ('core_dpe', 'name'),
+    ('core_supplier', 'name'),
+    ('core_supplier', 'tax_id'),
+    ('core_supplier', 'tax_name'),
+    ('core_department', 'name'),
+    ('core_entity', 'name'),
+    ('core_stateorg', 'name'),
+    ('core_sifuser', 'name'),
+    ('core_sianuser', 'name'),
+    ('core_division', 'name'),
+    ('core_evidencetype', 'name'),
+    ('core_evidencestatus', 'name'),
+    ('core_evidencestatus', 'description'),
+    ('core_evidencestatus', 'color'),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    """Trigram indexes, only PostgreSQL has pg_trgm"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for table, column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm '
+            f'ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for table, column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_auto_20261018_0747'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:06
+
+import core.models
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_auto_20261018_0802'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='parts',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='uploadsession',
+            name='upload_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='diff',
+            field=models.FileField(blank=True, null=True, storage=core.storage.get_reports_storage, upload_to=core.models.get_import_path),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=core.storage.get_reports_storage, upload_to=core.models.get_import_path),
+        ),
+        migrations.AlterField(
+            model_name='reportjob',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=core.storage.get_reports_storage, upload_to=core.models.get_report_path),
+        ),
+        migrations.AlterField(
+            model_name='uploadedfile',
+            name='file',
+            field=models.FileField(storage=core.storage.get_attachments_storage, upload_to=core.models.get_upload_path),
+        ),
+    ]
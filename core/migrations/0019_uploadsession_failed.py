@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_catalogversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uploadsession',
+            name='status',
+            field=models.CharField(choices=[('OPE', 'Open'), ('COM', 'Completed'), ('ERR', 'Failed')], default='OPE', max_length=3),
+        ),
+    ]
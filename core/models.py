@@ -3,15 +3,14 @@ Database models
 """
 import os
 
-from django.core.files.storage import FileSystemStorage
-
 from django.utils.translation import gettext_lazy as _
-from app import settings
 import eav
 from eav.models import Attribute
 from typing import Any
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -20,11 +19,21 @@ from django.contrib.auth.models import (
 )
 from django.contrib.auth import get_user_model
 
+from core.storage import blob_sha256, get_attachments_storage, get_reports_storage
+
 
 def get_upload_path(instance, filename):
     return os.path.join(
       "user_%d" % instance.owner.id, filename)
 
+def get_report_path(instance, filename):
+    return os.path.join(
+      "reports", "user_%d" % instance.owner.id, filename)
+
+def get_import_path(instance, filename):
+    return os.path.join(
+      "imports", "user_%d" % instance.owner.id, filename)
+
 class TimeStampMixin(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -32,6 +41,46 @@ class TimeStampMixin(models.Model):
     class Meta:
         abstract = True
 
+class HierarchyMixin(models.Model):
+    """Level and materialized path of the ancestor ids ("/1/5/") of a `parent` tree
+
+    Both are computed from the parent on save. Moving a record rewrites
+    the path and level of its whole subtree with a single update.
+    """
+    path = models.CharField(max_length=255, default='/', db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def subtree_path(self):
+        """Path prefix shared by all the descendants"""
+        return f'{self.path}{self.id}/'
+
+    def is_ancestor_of(self, other):
+        return f'/{self.id}/' in other.path
+
+    def save(self, *args, **kwargs):
+        previous = None
+        if self.pk != None:
+            previous = type(self).objects.filter(pk=self.pk).values('path', 'level').first()
+
+        parent = self.parent
+        if parent != None:
+            self.level = parent.level + 1
+            self.path = parent.subtree_path()
+        else:
+            self.level = 0
+            self.path = '/'
+
+        super().save(*args, **kwargs)
+
+        if previous != None and previous['path'] != self.path:
+            old_prefix = f"{previous['path']}{self.id}/"
+            type(self).objects.filter(path__startswith=old_prefix).update(
+                path=Concat(Value(self.subtree_path()), Substr('path', len(old_prefix) + 1)),
+                level=F('level') + (self.level - previous['level'])
+            )
+
 class UserManager(BaseUserManager):
     """Manager for users"""
 
@@ -142,7 +191,7 @@ class Supplier(TimeStampMixin):
     def __str__(self):
         return f"Supplier: {self.id}"
 
-class Department(TimeStampMixin):
+class Department(HierarchyMixin, TimeStampMixin):
     is_active = models.BooleanField(default=True)
     name = models.CharField(max_length=128,unique=True)
     level = models.IntegerField(default=0)
@@ -166,7 +215,7 @@ class Department(TimeStampMixin):
     def __str__(self):
         return f"Department: {self.id}"
 
-class Entity(TimeStampMixin):
+class Entity(HierarchyMixin, TimeStampMixin):
     is_active = models.BooleanField(default=True)
     name = models.CharField(max_length=128,unique=True)
     level = models.IntegerField(default=0)
@@ -191,7 +240,7 @@ class Entity(TimeStampMixin):
     def __str__(self):
         return f"Entity: {self.id}"
 
-class StateOrg(TimeStampMixin):
+class StateOrg(HierarchyMixin, TimeStampMixin):
     is_active = models.BooleanField(default=True)
     name = models.CharField(max_length=128,unique=True)
     level = models.IntegerField(default=0)
@@ -390,7 +439,7 @@ class QualityControl(TimeStampMixin):
     def __str__(self):
         return f"QualityControl: {self.id}"
 
-class EvidenceType(TimeStampMixin):
+class EvidenceType(HierarchyMixin, TimeStampMixin):
     is_active = models.BooleanField(default=True)
     is_owner_open = models.BooleanField(default=False)
     creation_status = models.ForeignKey(
@@ -461,8 +510,28 @@ class EvidenceTypeQualityControl(TimeStampMixin):
     def __str__(self):
         return f"EvidenceTypeQualityControl: {self.id}"
 
+class FileBlob(models.Model):
+    """Stored content shared by every UploadedFile with the same sha256
+
+    The UploadedFile rows pointing to it are its references, the blobs
+    without any are deleted by the collect_file_blobs command.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"FileBlob: {self.id}"
+
 class UploadedFile(models.Model):
-    file = models.FileField(storage=FileSystemStorage(location=settings.MEDIA_ROOT), upload_to=get_upload_path)
+    file = models.FileField(storage=get_attachments_storage, upload_to=get_upload_path)
+    filename = models.CharField(max_length=255, blank=True, default='')
+    blob = models.ForeignKey(
+        FileBlob,
+        on_delete=models.PROTECT,
+        blank=True,
+        null=True
+    )
     owner = models.ForeignKey(
         User,
         on_delete=models.CASCADE
@@ -475,6 +544,43 @@ class UploadedFile(models.Model):
     def __str__(self):
         return f"UploadedFile: {self.id}"
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            content = None
+            if self.file and not self.file._committed:
+                content = self.file.file
+                self.filename = os.path.basename(self.file.name)
+                self.file.save(self.file.name, content, save=False)
+
+            sha256 = blob_sha256(self.file.name)
+            if sha256 != None and (self.blob == None or self.blob.sha256 != sha256):
+                self.blob = self.lock_blob(sha256, content)
+
+            super().save(*args, **kwargs)
+
+    def lock_blob(self, sha256, content):
+        """Blob row of the stored file, locked against the collector until the save commits
+
+        The collector may have deleted a blob reused by the storage before
+        the row was locked, its file is then written again from the content.
+        """
+        blob = FileBlob.objects.select_for_update().filter(sha256=sha256).first()
+
+        storage = self.file.storage
+        if not storage.exists(self.file.name):
+            if content == None:
+                raise FileNotFoundError(f'The blob {self.file.name} was collected')
+            content.seek(0)
+            storage.save(self.file.name, content)
+
+        if blob == None:
+            blob, created = FileBlob.objects.get_or_create(
+                sha256=sha256,
+                defaults={'size': self.file.size}
+            )
+
+        return blob
+
 class Evidence(TimeStampMixin):
     # history = AuditlogHistoryField()
     status = models.ForeignKey(
@@ -516,6 +622,12 @@ class Evidence(TimeStampMixin):
     version = models.IntegerField(default=0)
 
     class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'status', 'type', 'group', 'id'], name='evidence_owner_filters_idx'),
+            models.Index(fields=['group', 'status', 'id'], name='evidence_group_status_idx'),
+            models.Index(fields=['type', 'status', 'id'], name='evidence_type_status_idx'),
+        ]
+
         # set_indian_status permission
         permissions = [
             (
@@ -649,6 +761,180 @@ class Theme(TimeStampMixin):
     terciary = models.TextField()
     quaternary = models.TextField()
 
+class ReportJob(TimeStampMixin):
+    class Status(models.TextChoices):
+        PENDING = 'PEN', _('Pending')
+        RUNNING = 'RUN', _('Running')
+        COMPLETED = 'COM', _('Completed')
+        FAILED = 'ERR', _('Failed')
+
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE
+    )
+    status = models.CharField(
+        max_length=3,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    format = models.CharField(max_length=8, default='pdf')
+    parameters = models.JSONField(default=dict)
+    file = models.FileField(
+        storage=get_reports_storage,
+        upload_to=get_report_path,
+        blank=True,
+        null=True
+    )
+    error = models.TextField(
+        blank=True,
+        null=True
+    )
+    attempts = models.IntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='reportjob_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"ReportJob: {self.id}"
+
+class ImportJob(TimeStampMixin):
+    class Status(models.TextChoices):
+        PENDING = 'PEN', _('Pending')
+        RUNNING = 'RUN', _('Running')
+        COMPLETED = 'COM', _('Completed')
+        FAILED = 'ERR', _('Failed')
+
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE
+    )
+    status = models.CharField(
+        max_length=3,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    catalog = models.CharField(max_length=32)
+    dry_run = models.BooleanField(default=False)
+    file = models.FileField(
+        storage=get_reports_storage,
+        upload_to=get_import_path,
+        blank=True,
+        null=True
+    )
+    diff = models.FileField(
+        storage=get_reports_storage,
+        upload_to=get_import_path,
+        blank=True,
+        null=True
+    )
+    summary = models.JSONField(default=dict)
+    total_rows = models.IntegerField(blank=True, null=True)
+    rows_processed = models.IntegerField(default=0)
+    resumed_from = models.IntegerField(default=0)
+    messages = models.JSONField(default=list)
+    error = models.TextField(
+        blank=True,
+        null=True
+    )
+    attempts = models.IntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='importjob_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"ImportJob: {self.id}"
+
+class EvidenceStatusCount(models.Model):
+    """Evidence count rollup maintained by the report app signals"""
+    group = models.ForeignKey(
+        EvidenceGroup,
+        on_delete=models.CASCADE
+    )
+    status = models.ForeignKey(
+        EvidenceStatus,
+        on_delete=models.CASCADE
+    )
+    division = models.ForeignKey(
+        Division,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True
+    )
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('group', 'status', 'owner')
+        indexes = [
+            models.Index(fields=['division', 'group', 'status'], name='statuscount_division_idx'),
+        ]
+
+    def __str__(self):
+        return f"EvidenceStatusCount: {self.id}"
+
+class CatalogVersion(models.Model):
+    """Version of a catalog, bumped by its writes to invalidate the cached lists"""
+    catalog = models.CharField(max_length=64, unique=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"CatalogVersion: {self.catalog}"
+
+class UploadSession(TimeStampMixin):
+    """Resumable upload appended chunk by chunk into a partial file of the storage"""
+    class Status(models.TextChoices):
+        OPEN = 'OPE', _('Open')
+        COMPLETED = 'COM', _('Completed')
+        FAILED = 'ERR', _('Failed')
+
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE
+    )
+    status = models.CharField(
+        max_length=3,
+        choices=Status.choices,
+        default=Status.OPEN,
+    )
+    filename = models.CharField(max_length=255)
+    # Storage name reserved for the file while the chunks arrive
+    path = models.CharField(max_length=255)
+    # Multipart upload id and part ETags of the object storages
+    upload_id = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True
+    )
+    parts = models.JSONField(default=list)
+    size = models.BigIntegerField()
+    chunk_size = models.IntegerField()
+    received = models.BigIntegerField(default=0)
+    checksum = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True
+    )
+    file = models.ForeignKey(
+        UploadedFile,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True
+    )
+
+    def __str__(self):
+        return f"UploadSession: {self.id}"
+
 ## Register eav for models
 eav.register(Evidence)
 
@@ -0,0 +1,31 @@
+"""
+Pagination for the list APIs
+"""
+from django.conf import settings
+
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Opt-in cursor pagination over the ordering set by the view queryset.
+
+    Lists are only paginated when the request sends a `cursor` or a
+    `page_size` query param, otherwise the whole list is returned as before.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 1000)
+    default_ordering = '-id'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if params.get(self.cursor_query_param) == None and params.get(self.page_size_query_param) == None:
+            return None
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(queryset.query.order_by)
+        if len(ordering) == 0 or '__' in ordering[0]:
+            return (self.default_ordering,)
+
+        return ordering
@@ -0,0 +1,42 @@
+"""
+Ranked search over the catalog names
+
+On PostgreSQL the matches are served by the pg_trgm GIN indexes over
+UPPER(<field>): substring matches plus the fuzzy ones by trigram
+similarity, ranked by prefix match and then by similarity. Other
+databases, like SQLite in the tests, only get the substring matches
+ranked by prefix match.
+"""
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest, Upper
+
+
+def greatest(expressions):
+    if len(expressions) == 1:
+        return expressions[0]
+    return Greatest(*expressions)
+
+
+def ranked_search(queryset, fields, term):
+    """Records matching the term in any of the fields, best matches first"""
+    term = term.strip()
+    if term == '':
+        return queryset.order_by('name')
+
+    condition = Q()
+    prefixes = []
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': term})
+        prefixes.append(When(**{f'{field}__istartswith': term}, then=Value(1.0)))
+    rank = Case(*prefixes, default=Value(0.0), output_field=FloatField())
+
+    if connections[queryset.db].vendor == 'postgresql':
+        upper = {f'search_{field}': Upper(field) for field in fields}
+        queryset = queryset.annotate(**upper)
+        for alias in upper:
+            condition |= Q(**{f'{alias}__trigram_similar': term.upper()})
+        rank = rank + greatest([TrigramSimilarity(alias, term.upper()) for alias in upper])
+
+    return queryset.filter(condition).annotate(search_rank=rank).order_by('-search_rank', 'name')
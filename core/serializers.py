@@ -1,4 +1,88 @@
+from django.urls import reverse
+from django.utils import timezone
+
 from rest_framework import serializers
 
+from core import models
+
 class IntegerListField(serializers.ListField):
     child = serializers.IntegerField(min_value=1)
+
+
+class SparseFieldsMixin:
+    """Restrict the rendered fields with the `fields` and `expand` kwargs.
+
+    Fields listed in `expandable_fields` are only rendered when they are
+    requested through `expand` (or `fields`), the rest are rendered unless
+    `fields` leaves them out.
+    """
+    expandable_fields = []
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+        expanded = set(expand or []) | set(fields or [])
+        for name in self.expandable_fields:
+            if name not in expanded:
+                self.fields.pop(name, None)
+
+        if fields != None:
+            for name in list(self.fields):
+                if name not in fields:
+                    self.fields.pop(name)
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Serializer for the catalog import job progress"""
+    errors = serializers.SerializerMethodField()
+    rows_per_second = serializers.SerializerMethodField()
+    eta_seconds = serializers.SerializerMethodField()
+    diff = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.ImportJob
+        fields = [
+            'id', 'status', 'catalog', 'dry_run', 'total_rows', 'rows_processed', 'errors',
+            'rows_per_second', 'eta_seconds', 'summary', 'diff', 'messages', 'error', 'attempts',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_diff(self, obj):
+        if not obj.diff:
+            return None
+
+        url = reverse('core:import-job-diff', args=[obj.id])
+        request = self.context.get('request')
+        if request != None:
+            url = request.build_absolute_uri(url)
+        return url
+
+    def get_errors(self, obj):
+        return len(obj.messages)
+
+    def get_rows_per_second(self, obj):
+        if obj.started_at == None:
+            return None
+
+        end = obj.finished_at
+        if end == None:
+            end = timezone.now()
+
+        seconds = (end - obj.started_at).total_seconds()
+        if seconds <= 0:
+            return None
+
+        return round((obj.rows_processed - obj.resumed_from) / seconds, 2)
+
+    def get_eta_seconds(self, obj):
+        if obj.status == models.ImportJob.Status.COMPLETED:
+            return 0
+
+        rate = self.get_rows_per_second(obj)
+        if obj.total_rows == None or rate == None or rate <= 0:
+            return None
+
+        return round(max(obj.total_rows - obj.rows_processed, 0) / rate)
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+
+from core import catalog_cache
+
+
+def catalog_changed(sender, **kwargs):
+    catalog_cache.invalidate(sender)
+
+
+for model in catalog_cache.CATALOG_MODELS:
+    post_save.connect(catalog_changed, sender=model)
+    post_delete.connect(catalog_changed, sender=model)
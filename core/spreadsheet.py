@@ -0,0 +1,57 @@
+"""
+Streaming access to the catalog spreadsheets
+"""
+from openpyxl import Workbook, load_workbook
+
+
+class Echo:
+    """File-like object that hands back what is written, used to stream csv rows"""
+    def write(self, value):
+        return value
+
+
+def read_sheet(file, name):
+    """Rows of the named sheet as lists, read one at a time
+
+    Returns None when the workbook has no sheet with that name. Trailing
+    empty cells are dropped, other empty cells are returned as ''.
+    """
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    if name not in workbook.sheetnames:
+        workbook.close()
+        return None
+
+    return _iter_rows(workbook, workbook[name])
+
+
+def _iter_rows(workbook, sheet):
+    try:
+        for values in sheet.iter_rows(values_only=True):
+            row = list(values)
+            while len(row) > 0 and (row[-1] == None or row[-1] == ''):
+                row.pop()
+            if len(row) == 0:
+                continue
+            yield ['' if value == None else value for value in row]
+    finally:
+        workbook.close()
+
+
+def count_rows(file, name):
+    """Rows of the named sheet declared by the workbook, None when unknown"""
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        if name not in workbook.sheetnames:
+            return None
+        return workbook[name].max_row
+    finally:
+        workbook.close()
+
+
+def write_sheet(file, name, rows):
+    """Write the rows to a new workbook with a single sheet, one row at a time"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(name)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(file)
@@ -0,0 +1,303 @@
+"""
+Storage backends of the uploaded files and the generated reports
+
+ATTACHMENTS_STORAGE selects the filesystem under MEDIA_ROOT or a bucket
+of an S3 compatible service (AWS, a MinIO server...). The uploaded files
+are content addressed in both.
+"""
+import os
+import re
+import shutil
+import hashlib
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, Storage
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+BLOB_DIR = 'blobs'
+BLOB_NAME_RE = re.compile(r'^blobs/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})$')
+BLOCK_SIZE = 64 * 1024
+
+
+def blob_name(sha256):
+    """Name of the blob, sharded by the first bytes of the hash"""
+    return f'{BLOB_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def blob_sha256(name):
+    """Hash of a blob name, None for the names out of the blob store"""
+    match = BLOB_NAME_RE.match(name or '')
+    if match == None:
+        return None
+    return match.group(1)
+
+
+def is_local(storage):
+    """The files of the storage can be opened by path"""
+    return isinstance(storage, FileSystemStorage)
+
+
+def get_attachments_storage():
+    """Storage of the UploadedFile records"""
+    if settings.ATTACHMENTS_STORAGE == 's3':
+        return S3BlobStorage()
+    return BlobStorage(location=settings.MEDIA_ROOT)
+
+
+def get_reports_storage():
+    """Storage of the generated reports and the import files"""
+    if settings.ATTACHMENTS_STORAGE == 's3':
+        return S3Storage()
+    return FileSystemStorage(location=settings.MEDIA_ROOT)
+
+
+def download_url(file, filename=None):
+    """Presigned URL the client can download the file from, None on the filesystem"""
+    if is_local(file.storage):
+        return None
+    return file.storage.url(file.name, filename=filename)
+
+
+class BlobStorageMixin:
+    """Files stored once under the sha256 of their content
+
+    The content is hashed while it is written to a temporary file, which
+    is then stored as blobs/<aa>/<bb>/<sha256> unless the same content is
+    already there. The name asked for is ignored, the original file name
+    is kept by the model.
+
+    The resumable uploads write the chunks to a partial file with
+    create_partial, write_partial and finish_partial and then move it
+    into the blob of its hash with store_partial.
+    """
+    temporary_directory = None
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory = self.temporary_directory
+        if directory != None:
+            os.makedirs(directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    fh.write(chunk)
+            return self.store(tmp_path, digest.hexdigest())
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+@deconstructible
+class BlobStorage(BlobStorageMixin, FileSystemStorage):
+    """Content addressed files under MEDIA_ROOT"""
+
+    @property
+    def temporary_directory(self):
+        # Same filesystem as the blobs, so they are moved and not copied
+        return self.path(os.path.join(BLOB_DIR, 'tmp'))
+
+    def store(self, path, sha256):
+        """Move the local file at path into the blob of its hash and return the name"""
+        name = blob_name(sha256)
+        target = self.path(name)
+        if os.path.exists(target):
+            # Already stored, refresh it for the garbage collector
+            os.utime(target)
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if self.file_permissions_mode != None:
+                os.chmod(path, self.file_permissions_mode)
+            os.replace(path, target)
+
+        return name
+
+    def create_partial(self, name):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'xb').close()
+        return None
+
+    def write_partial(self, name, token, index, offset, content):
+        """Copy the content file into the partial file at offset"""
+        with open(self.path(name), 'r+b') as fh:
+            fh.seek(offset)
+            shutil.copyfileobj(content, fh, BLOCK_SIZE)
+        return None
+
+    def finish_partial(self, name, token, parts):
+        """sha256 of the received file"""
+        digest = hashlib.sha256()
+        with open(self.path(name), 'rb') as fh:
+            for block in iter(lambda: fh.read(BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def store_partial(self, name, sha256):
+        return self.store(self.path(name), sha256)
+
+    def abort_partial(self, name, token):
+        self.delete(name)
+
+
+@deconstructible
+class S3Storage(Storage):
+    """Objects of an S3 compatible bucket
+
+    Large files are sent with multipart uploads and the clients download
+    them from presigned URLs.
+    """
+
+    def __init__(self, bucket=None):
+        self.bucket = bucket
+
+    @cached_property
+    def bucket_name(self):
+        return self.bucket or settings.S3_BUCKET
+
+    @cached_property
+    def client(self):
+        import boto3
+        from botocore.config import Config
+
+        return boto3.client(
+            's3',
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            config=Config(signature_version='s3v4'),
+        )
+
+    @cached_property
+    def transfer_config(self):
+        from boto3.s3.transfer import TransferConfig
+
+        return TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE,
+        )
+
+    def head(self, name):
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket_name, Key=name)
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def _open(self, name, mode='rb'):
+        fh = tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+        self.client.download_fileobj(self.bucket_name, name, fh, Config=self.transfer_config)
+        fh.seek(0)
+        return File(fh, name=name)
+
+    def _save(self, name, content):
+        content.seek(0)
+        self.client.upload_fileobj(content, self.bucket_name, name, Config=self.transfer_config)
+        return name
+
+    def exists(self, name):
+        return self.head(name) != None
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket_name, Key=name)
+
+    def size(self, name):
+        return self.head(name)['ContentLength']
+
+    def get_modified_time(self, name):
+        return self.head(name)['LastModified']
+
+    def url(self, name, filename=None):
+        params = {'Bucket': self.bucket_name, 'Key': name}
+        if filename != None:
+            params['ResponseContentDisposition'] = f'inline; filename="{filename}"'
+
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params=params,
+            ExpiresIn=settings.S3_PRESIGNED_EXPIRES
+        )
+
+
+@deconstructible
+class S3BlobStorage(BlobStorageMixin, S3Storage):
+    """Content addressed objects of an S3 compatible bucket
+
+    The chunks of the resumable uploads are the parts of a multipart
+    upload, the finished object is copied inside the bucket to its blob.
+    """
+
+    def store(self, path, sha256):
+        """Upload the local file at path as the blob of its hash and return the name"""
+        name = blob_name(sha256)
+        if not self.exists(name):
+            self.client.upload_file(path, self.bucket_name, name, Config=self.transfer_config)
+        os.remove(path)
+
+        return name
+
+    def create_partial(self, name):
+        """Id of the multipart upload"""
+        return self.client.create_multipart_upload(Bucket=self.bucket_name, Key=name)['UploadId']
+
+    def write_partial(self, name, token, index, offset, content):
+        """Send the content file as a part and return its ETag"""
+        return self.client.upload_part(
+            Bucket=self.bucket_name,
+            Key=name,
+            UploadId=token,
+            PartNumber=index + 1,
+            Body=content
+        )['ETag']
+
+    def finish_partial(self, name, token, parts):
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=name,
+            UploadId=token,
+            MultipartUpload={
+                'Parts': [{'ETag': etag, 'PartNumber': i + 1} for i, etag in enumerate(parts)]
+            }
+        )
+
+        digest = hashlib.sha256()
+        body = self.client.get_object(Bucket=self.bucket_name, Key=name)['Body']
+        for block in body.iter_chunks(BLOCK_SIZE):
+            digest.update(block)
+        return digest.hexdigest()
+
+    def store_partial(self, name, sha256):
+        blob = blob_name(sha256)
+        if not self.exists(blob):
+            self.client.copy(
+                {'Bucket': self.bucket_name, 'Key': name},
+                self.bucket_name,
+                blob,
+                Config=self.transfer_config
+            )
+        self.delete(name)
+
+        return blob
+
+    def abort_partial(self, name, token):
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=name, UploadId=token)
+        except ClientError:
+            # Already completed
+            pass
+        self.delete(name)
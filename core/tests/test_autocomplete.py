@@ -0,0 +1,83 @@
+"""
+Tests for the catalog autocomplete
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+from core.autocomplete import PrefixIndex, complete
+
+
+class PrefixIndexTests(TestCase):
+    """Test the sorted prefix index"""
+
+    def test_whole_names_before_words(self):
+        """Test the names starting with the term go before the words"""
+        index = PrefixIndex([
+            {'id': 1, 'name': 'Distribuidora Norte'},
+            {'id': 2, 'name': 'Norteño'},
+            {'id': 3, 'name': 'Abarrotes'},
+        ], ['name'])
+
+        self.assertEqual([row['id'] for row in index.search('NOR', 10)], [2, 1])
+        self.assertEqual([row['id'] for row in index.search('norteno', 10)], [2])
+        self.assertEqual([row['id'] for row in index.search('nor', 1)], [2])
+        self.assertEqual(index.search('xyz', 10), [])
+
+
+class AutocompleteTests(TestCase):
+    """Test the autocomplete endpoints"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.user.user_permissions.add(Permission.objects.get(codename='view_supplier'))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        models.Supplier.objects.create(name='Papelera del Norte', tax_id='PNO010101AAA', tax_name='Papelera SA')
+        models.Supplier.objects.create(name='Inactiva', tax_id='INA010101BBB', tax_name='Inactiva SA', is_active=False)
+
+    def test_autocomplete(self):
+        """Test the matches of the active suppliers by name, word and tax id"""
+        url = reverse('supplier:supplier-autocomplete')
+
+        res = self.client.get(url, {'q': 'norte'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['name'] for row in res.data], ['Papelera del Norte'])
+
+        res = self.client.get(url, {'q': 'pno01'})
+        self.assertEqual([row['tax_id'] for row in res.data], ['PNO010101AAA'])
+
+        res = self.client.get(url, {'q': 'ina'})
+        self.assertEqual(res.data, [])
+
+        res = self.client.get(url, {'q': 'pa', 'limit': 'x'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuilt_after_writes(self):
+        """Test the index is loaded again when the catalog changes"""
+        self.assertEqual(complete('supplier', 'abarrotes'), [])
+
+        models.Supplier.objects.create(name='Abarrotes', tax_id='ABA010101CCC', tax_name='Abarrotes SA')
+
+        self.assertEqual([row['name'] for row in complete('supplier', 'abarrotes')], ['Abarrotes'])
+
+    def test_autocomplete_requires_permission(self):
+        """Test the autocomplete needs the view permission of the catalog"""
+        res = self.client.get(reverse('entity:entity-autocomplete'), {'q': 'a'})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_write_of_other_process(self):
+        """Test the index is rebuilt when another process bumps the version"""
+        self.assertEqual(complete('supplier', 'remota'), [])
+
+        # Written without signals, the version is only seen in the database
+        models.Supplier.objects.filter(tax_id='PNO010101AAA').update(name='Remota')
+        models.CatalogVersion.objects.update_or_create(catalog='supplier', defaults={'version': 1})
+
+        self.assertEqual([row['name'] for row in complete('supplier', 'remota')], ['Remota'])
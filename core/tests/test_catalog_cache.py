@@ -0,0 +1,97 @@
+"""
+Tests for the cached catalog lists
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import catalog_cache, models
+from core.importer import CatalogImporter
+
+MUNICIPALITY_URL = reverse('municipality:municipality-list')
+
+
+class CatalogCacheTests(TestCase):
+    """Test the catalog lists served from the cache"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.user.user_permissions.add(Permission.objects.get(codename='view_municipality'))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.municipality = models.Municipality.objects.create(name='cached')
+
+    def names(self, res):
+        return [row['name'] for row in res.data]
+
+    def test_not_modified(self):
+        """Test a request with the current ETag gets a 304"""
+        res = self.client.get(MUNICIPALITY_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        etag = res['ETag']
+
+        res = self.client.get(MUNICIPALITY_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+
+        res = self.client.get(MUNICIPALITY_URL, {'name': 'cac'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_writes_invalidate(self):
+        """Test the list is served from the cache until the catalog is written"""
+        res = self.client.get(MUNICIPALITY_URL)
+        etag = res['ETag']
+        self.assertIn('cached', self.names(res))
+
+        # Updates without signals are not seen
+        models.Municipality.objects.filter(id=self.municipality.id).update(name='stale')
+        res = self.client.get(MUNICIPALITY_URL)
+        self.assertIn('cached', self.names(res))
+
+        self.municipality.refresh_from_db()
+        self.municipality.save()
+        res = self.client.get(MUNICIPALITY_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('stale', self.names(res))
+
+    def test_version_shared(self):
+        """Test a write made by another process changes the ETag"""
+        res = self.client.get(MUNICIPALITY_URL)
+        etag = res['ETag']
+
+        # Bump seen through the database only, as from another worker
+        models.Municipality.objects.filter(id=self.municipality.id).update(name='remote')
+        models.CatalogVersion.objects.update_or_create(catalog='municipality', defaults={'version': 1})
+        res = self.client.get(MUNICIPALITY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('remote', self.names(res))
+
+    def test_import_invalidates(self):
+        """Test the bulk writes of the imports bump the catalog version"""
+        version = catalog_cache.get_version(models.Municipality)
+
+        CatalogImporter(models.Municipality).import_sheet([
+            ['Id', 'Activo', 'Nombre'],
+            ['', 'Si', 'imported'],
+        ])
+
+        self.assertGreater(catalog_cache.get_version(models.Municipality), version)
+        res = self.client.get(MUNICIPALITY_URL)
+        self.assertIn('imported', self.names(res))
+
+    def test_nested_catalogs(self):
+        """Test the evidence stages list is invalidated by its own writes"""
+        url = reverse('evidence_stage:list')
+        res = self.client.get(url)
+        etag = res['ETag']
+
+        models.EvidenceStage.objects.create(name='new stage')
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('new stage', self.names(res))
@@ -0,0 +1,74 @@
+"""
+Tests for the disk cache of generated files
+"""
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from core.disk_cache import DiskCache
+
+
+class DiskCacheTests(SimpleTestCase):
+    """Test the generated files disk cache"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(self.directory.name, max_bytes=10)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_miss_then_hit(self):
+        """Test a stored file is served on the next lookup"""
+        self.assertIsNone(self.cache.open('ab12'))
+
+        with self.cache.put('ab12', b'1234') as fh:
+            self.assertEqual(fh.read(), b'1234')
+
+        with self.cache.open('ab12') as fh:
+            self.assertEqual(fh.read(), b'1234')
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'ab', 'ab12.pdf')))
+
+    def test_evict_least_recently_used(self):
+        """Test the least recently used files are evicted over max_bytes"""
+        self.cache.put('aa01', b'1234').close()
+        self.cache.put('bb02', b'1234').close()
+        os.utime(self.cache.path('aa01'), (1, 1))
+        os.utime(self.cache.path('bb02'), (2, 2))
+
+        self.cache.open('aa01').close()
+        self.cache.put('cc03', b'1234').close()
+
+        self.assertIsNotNone(self.cache.open('aa01'))
+        self.assertIsNone(self.cache.open('bb02'))
+        self.assertIsNotNone(self.cache.open('cc03'))
+
+    def test_walk_only_over_budget(self):
+        """Test the cache is walked again only when the estimate is over max_bytes or stale"""
+        self.cache.put('aa01', b'12').close()
+
+        # Written by another process, unseen until the next walk
+        os.makedirs(os.path.join(self.directory.name, 'ff'))
+        with open(os.path.join(self.directory.name, 'ff', 'ff09.pdf'), 'wb') as fh:
+            fh.write(b'0123456789')
+        os.utime(os.path.join(self.directory.name, 'ff', 'ff09.pdf'), (1, 1))
+
+        self.cache.put('bb02', b'12').close()
+        self.assertTrue(os.path.exists(self.cache.path('ff09')))
+
+        self.cache.walk_interval = 0
+        self.cache.put('cc03', b'12').close()
+        self.assertIsNone(self.cache.open('ff09'))
+        self.assertIsNotNone(self.cache.open('cc03'))
+
+    def test_hit_keeps_modified_time(self):
+        """Test a hit only moves the access time"""
+        self.cache.put('aa01', b'1234').close()
+        os.utime(self.cache.path('aa01'), (1, 1))
+
+        self.cache.open('aa01').close()
+
+        stat = os.stat(self.cache.path('aa01'))
+        self.assertEqual(stat.st_mtime, 1)
+        self.assertGreater(stat.st_atime, 1)
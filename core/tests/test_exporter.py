@@ -0,0 +1,61 @@
+"""
+Tests for the catalog exports
+"""
+import io
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+from core.importer import HierarchyImporter
+from core.spreadsheet import read_sheet
+
+
+class CatalogExportTests(TestCase):
+    """Test the catalog export API"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.user.user_permissions.add(Permission.objects.get(codename='view_entity'))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        root = models.Entity.objects.create(name='root')
+        models.Entity.objects.create(name='child', parent=root, level=1, is_active=False)
+
+    def test_export_xlsx_round_trip(self):
+        """Test the exported workbook imports back without changes"""
+        res = self.client.get(reverse('entity:export'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        content = io.BytesIO(b''.join(res.streaming_content))
+        rows = list(read_sheet(content, 'Registros'))
+        self.assertEqual(rows[0], ['Id', 'Activo', 'Nombre', 'Padre'])
+        self.assertIn(['Si', 'root'], [row[1:3] for row in rows])
+        self.assertIn(['No', 'child', 'root'], [row[1:] for row in rows])
+
+        importer = HierarchyImporter(models.Entity)
+        importer.dry_run = True
+        importer.import_sheet(rows)
+        self.assertEqual(importer.summary['unchanged'], len(rows) - 1)
+        self.assertEqual(importer.summary['updates'], 0)
+
+    def test_export_csv(self):
+        """Test the csv export streams the same layout"""
+        res = self.client.get(reverse('entity:export'), {'type': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        lines = b''.join(res.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(lines[0], 'Id,Activo,Nombre,Padre')
+        self.assertIn(',No,child,root', ''.join(lines))
+
+    def test_export_requires_permission(self):
+        """Test the export needs the view permission of the catalog"""
+        res = self.client.get(reverse('dpe:export'))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,70 @@
+"""
+Tests for the materialized paths of the hierarchy models
+"""
+from django.test import TestCase
+
+from core import models
+from core.hierarchy import ancestors_of, build_tree, descendants_of, rebuild_paths
+
+
+class HierarchyTests(TestCase):
+    """Test the path and level kept on save"""
+
+    def setUp(self):
+        self.root = models.Department.objects.create(name='root')
+        self.child = models.Department.objects.create(name='child', parent=self.root)
+        self.grandchild = models.Department.objects.create(name='grandchild', parent=self.child)
+        self.other = models.Department.objects.create(name='other')
+
+    def test_path_from_parent(self):
+        """Test the path lists the ancestor ids"""
+        self.assertEqual(self.root.path, '/')
+        self.assertEqual(self.grandchild.path, f'/{self.root.id}/{self.child.id}/')
+        self.assertEqual(self.grandchild.level, 2)
+        self.assertTrue(self.root.is_ancestor_of(self.grandchild))
+        self.assertFalse(self.grandchild.is_ancestor_of(self.root))
+
+    def test_move_subtree(self):
+        """Test moving a record rewrites the paths of its descendants"""
+        self.child.parent = self.other
+        self.child.save()
+
+        self.grandchild.refresh_from_db()
+        self.assertEqual(self.grandchild.path, f'/{self.other.id}/{self.child.id}/')
+        self.assertEqual(self.grandchild.level, 2)
+
+        self.child.parent = None
+        self.child.save()
+
+        self.grandchild.refresh_from_db()
+        self.assertEqual(self.grandchild.path, f'/{self.child.id}/')
+        self.assertEqual(self.grandchild.level, 1)
+
+    def test_descendants_and_ancestors(self):
+        """Test the subtree queries"""
+        queryset = models.Department.objects.all()
+
+        descendants = descendants_of(queryset, self.root.id)
+        self.assertEqual(set(descendants), {self.child, self.grandchild})
+
+        ancestors = ancestors_of(queryset, self.grandchild.id)
+        self.assertEqual(set(ancestors), {self.root, self.child})
+
+        self.assertEqual(descendants_of(queryset, 0).count(), 0)
+
+    def test_build_tree(self):
+        """Test the records are nested under their parents"""
+        tree = build_tree(models.Department.objects.filter(name__in=['root', 'child', 'grandchild', 'other']))
+
+        self.assertEqual([node['name'] for node in tree], ['other', 'root'])
+        self.assertEqual(tree[1]['children'][0]['children'][0]['name'], 'grandchild')
+
+    def test_rebuild_paths(self):
+        """Test the paths are recomputed from the parents"""
+        models.Department.objects.filter(id=self.grandchild.id).update(path='/', level=0)
+
+        rebuild_paths(models.Department)
+
+        self.grandchild.refresh_from_db()
+        self.assertEqual(self.grandchild.path, f'/{self.root.id}/{self.child.id}/')
+        self.assertEqual(self.grandchild.level, 2)
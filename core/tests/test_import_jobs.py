@@ -0,0 +1,94 @@
+"""
+Tests for the catalog import jobs
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import import_jobs, models
+from core.tests.test_spreadsheet import workbook_file
+
+HEADERS = ['Id', 'Activo', 'Nombre', 'Padre']
+
+
+def detail_url(id):
+    return reverse('core:import-job-detail', args=[id])
+
+
+class ImportJobTests(TestCase):
+    """Test the catalog import jobs queue and APIs"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.user.user_permissions.add(Permission.objects.get(codename='import_department'))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_job(self, rows, **params):
+        job = models.ImportJob(owner=self.user, catalog='department', **params)
+        job.file.save('departments.xlsx', ContentFile(workbook_file({'Registros': rows}).getvalue()), save=False)
+        job.save()
+        return job
+
+    def test_import_job_progress(self):
+        """Test queue an import, run it in the worker and poll its progress"""
+        content = workbook_file({'Registros': [
+            HEADERS,
+            ['', 'Si', 'department1'],
+            ['', 'Si', 'department2', 'department1'],
+            ['', 'Si', 'department3', 'missing'],
+        ]})
+        res = self.client.post(
+            reverse('department:import-job', args=['departments']),
+            content.getvalue(),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            HTTP_CONTENT_DISPOSITION='attachment; filename=departments.xlsx'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['status'], models.ImportJob.Status.PENDING)
+        self.assertFalse(models.Department.objects.filter(name='department1').exists())
+
+        job = import_jobs.run(import_jobs.claim())
+        self.assertEqual(job.status, models.ImportJob.Status.COMPLETED)
+
+        res = self.client.get(detail_url(job.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['total_rows'], 3)
+        self.assertEqual(res.data['rows_processed'], 3)
+        self.assertEqual(res.data['errors'], 1)
+        self.assertEqual(res.data['eta_seconds'], 0)
+        self.assertEqual(res.data['messages'], ['No se encontró el registro padre: missing'])
+        self.assertEqual(models.Department.objects.get(name='department2').level, 1)
+
+    def test_resume_after_imported_rows(self):
+        """Test a requeued job does not import again the rows it already committed"""
+        models.Department.objects.create(name='department1')
+        job = self.create_job([
+            HEADERS,
+            ['', 'Si', 'department1'],
+            ['', 'Si', 'department2'],
+        ], rows_processed=1, messages=['previous'])
+
+        job = import_jobs.run(import_jobs.claim())
+
+        self.assertEqual(job.status, models.ImportJob.Status.COMPLETED)
+        self.assertEqual(job.resumed_from, 1)
+        self.assertEqual(job.rows_processed, 2)
+        self.assertEqual(job.messages, ['previous'])
+        self.assertTrue(models.Department.objects.filter(name='department2').exists())
+
+    def test_job_of_other_user_not_found(self):
+        """Test a user can not read the import jobs of other users"""
+        other = get_user_model().objects.create_user(email='other@example.com', password='testpass123')
+        job = self.create_job([HEADERS, ['', 'Si', 'department1']])
+        job.owner = other
+        job.save()
+
+        res = self.client.get(detail_url(job.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,263 @@
+"""
+Tests for the catalog import engine
+"""
+import csv
+import io
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+from core.tests.test_spreadsheet import workbook_file
+from core.importer import (
+    CatalogImporter,
+    HierarchyImporter,
+    StateOrgUserImporter,
+    SupplierImporter,
+)
+
+HEADERS = ['Id', 'Activo', 'Nombre', 'Padre']
+
+
+class CatalogImporterTests(TestCase):
+    """Test the set based catalog imports"""
+
+    def test_create_and_update(self):
+        """Test rows with an id update and rows without one create"""
+        dpe = models.Dpe.objects.create(name='dpe1')
+
+        messages = CatalogImporter(models.Dpe).import_sheet([
+            HEADERS,
+            [dpe.id, 'No', 'dpe1 renamed'],
+            ['', 'Si', 'dpe2'],
+            [999, 'Si', 'dpe3'],
+            ['', 'Si', 'dpe2'],
+        ])
+
+        self.assertEqual(messages, [
+            'No existe un registro con el id: 999',
+            'Registro duplicado: dpe2',
+        ])
+        dpe.refresh_from_db()
+        self.assertEqual(dpe.name, 'dpe1 renamed')
+        self.assertFalse(dpe.is_active)
+        self.assertTrue(models.Dpe.objects.filter(name='dpe2', is_active=True).exists())
+
+    def test_sheet_messages(self):
+        """Test the messages of a missing or empty sheet"""
+        self.assertEqual(
+            CatalogImporter(models.Dpe).import_sheet(None),
+            ['El archivo debe incluir una hoja llamada: Registros']
+        )
+        self.assertEqual(
+            CatalogImporter(models.Dpe).import_sheet([HEADERS]),
+            ['Debe especificar al menos un registro para crear o actualizar.']
+        )
+
+    def test_swap_names_between_records(self):
+        """Test a name released by a row can be taken by a later row"""
+        first = models.Dpe.objects.create(name='first')
+        second = models.Dpe.objects.create(name='second')
+
+        messages = CatalogImporter(models.Dpe).import_sheet([
+            HEADERS,
+            [first.id, 'Si', 'tmp'],
+            [second.id, 'Si', 'first'],
+            [first.id, 'Si', 'second'],
+        ])
+
+        self.assertEqual(messages, [])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.name, second.name), ('second', 'first'))
+
+    def test_hierarchy_resolves_parents_of_the_same_file(self):
+        """Test parents created by previous rows are resolved with their level"""
+        importer = HierarchyImporter(models.Entity)
+        importer.batch_size = 2
+        messages = importer.import_sheet([
+            HEADERS,
+            ['', 'Si', 'root'],
+            ['', 'Si', 'child', 'root'],
+            ['', 'Si', 'grandchild', 'child'],
+            ['', 'Si', 'orphan', 'missing'],
+        ])
+
+        self.assertEqual(messages, ['No se encontró el registro padre: missing'])
+        grandchild = models.Entity.objects.get(name='grandchild')
+        self.assertEqual(grandchild.level, 2)
+        self.assertEqual(grandchild.parent.name, 'child')
+        self.assertEqual(grandchild.parent.parent.name, 'root')
+
+    def test_hierarchy_children_before_parents(self):
+        """Test rows are imported whatever the order of parents and children"""
+        models.Department.objects.create(name='existing')
+
+        messages = HierarchyImporter(models.Department).import_sheet([
+            HEADERS,
+            ['', 'Si', 'leaf', 'middle'],
+            ['', 'Si', 'middle', 'root'],
+            ['', 'No', 'root', 'existing'],
+            ['', 'Si', 'cycle1', 'cycle2'],
+            ['', 'Si', 'cycle2', 'cycle1'],
+        ])
+
+        self.assertEqual(messages, [
+            'No se encontró el registro padre: cycle2',
+            'No se encontró el registro padre: cycle1',
+        ])
+        levels = dict(models.Department.objects.values_list('name', 'level'))
+        self.assertEqual(levels['root'], 1)
+        self.assertEqual(levels['middle'], 2)
+        self.assertEqual(levels['leaf'], 3)
+        self.assertEqual(
+            models.Department.objects.get(name='leaf').parent,
+            models.Department.objects.get(name='middle')
+        )
+
+    def test_hierarchy_move_rebuilds_subtree_paths(self):
+        """Test moving a record in the file updates the paths of its descendants"""
+        root = models.Department.objects.create(name='root')
+        other = models.Department.objects.create(name='other')
+        child = models.Department.objects.create(name='child', parent=root)
+        leaf = models.Department.objects.create(name='leaf', parent=child)
+
+        messages = HierarchyImporter(models.Department).import_sheet([
+            HEADERS,
+            [child.id, 'Si', 'child', 'other'],
+        ])
+
+        self.assertEqual(messages, [])
+        leaf.refresh_from_db()
+        self.assertEqual(leaf.path, f'/{other.id}/{child.id}/')
+        self.assertEqual(leaf.level, 2)
+
+    def test_supplier_unique_messages(self):
+        """Test the tax id and tax name duplicates are reported"""
+        models.Supplier.objects.create(name='supplier1', tax_id='AAA010101AAA', tax_name='Supplier 1')
+
+        messages = SupplierImporter().import_sheet([
+            HEADERS,
+            ['', 'Si', 'supplier2', 'AAA010101AAA', 'Supplier 1'],
+            ['', 'Si', 'supplier3', 'BBB010101BBB', 'Supplier 3'],
+        ])
+
+        self.assertEqual(messages, [
+            'El RFC AAA010101AAA ya se encuentra asociado a otro registro',
+            'La razón social Supplier 1 ya se encuentra asociada a otro registro',
+        ])
+        self.assertEqual(models.Supplier.objects.count(), 2)
+
+    def test_stateorg_users(self):
+        """Test the state organization is required and resolved by name"""
+        stateorg = models.StateOrg.objects.create(name='stateorg1')
+
+        messages = StateOrgUserImporter(models.SifUser).import_sheet([
+            HEADERS,
+            ['', 'Si', 'user1', 'stateorg1'],
+            ['', 'Si', 'user2', 'missing'],
+            ['', 'Si', 'user3'],
+        ])
+
+        self.assertEqual(messages, [
+            'No se encontró la dependencia estatal: missing',
+            'Organización estatal es obligatoria',
+        ])
+        self.assertEqual(models.SifUser.objects.get().stateorg, stateorg)
+
+
+class DryRunTests(TestCase):
+    """Test the import dry runs"""
+
+    def test_summary_and_diff(self):
+        """Test the rows are classified without saving them"""
+        supplier = models.Supplier.objects.create(name='supplier1', tax_id='AAA010101AAA', tax_name='Supplier 1')
+        unchanged = models.Supplier.objects.create(name='supplier2', tax_id='BBB010101BBB', tax_name='Supplier 2')
+
+        diff = io.StringIO()
+        importer = SupplierImporter()
+        importer.dry_run = True
+        importer.diff = csv.writer(diff)
+        messages = importer.import_sheet([
+            HEADERS,
+            [supplier.id, 'No', 'supplier1', 'AAA010101AAA', 'Supplier 1'],
+            [unchanged.id, 'Si', 'supplier2', 'BBB010101BBB', 'Supplier 2'],
+            ['', 'Si', 'supplier3', 'CCC010101CCC', 'Supplier 3'],
+            ['', 'Si', 'supplier4', 'CCC010101CCC', 'Supplier 4'],
+            [999, 'Si', 'supplier5', 'DDD010101DDD', 'Supplier 5'],
+        ])
+
+        self.assertEqual(importer.summary, {
+            'inserts': 1,
+            'updates': 1,
+            'unchanged': 1,
+            'conflicts': 1,
+            'errors': 1,
+        })
+        self.assertEqual(messages, [
+            'El RFC CCC010101CCC ya se encuentra asociado a otro registro',
+            'No existe un registro con el id: 999',
+        ])
+        self.assertEqual(list(csv.reader(io.StringIO(diff.getvalue()))), [
+            ['2', 'Actualización', str(supplier.id), 'supplier1', 'is_active: True -> False', ''],
+            ['4', 'Alta', '', 'supplier3', '', ''],
+            ['5', 'Conflicto', '', 'supplier4', '', 'El RFC CCC010101CCC ya se encuentra asociado a otro registro'],
+            ['6', 'Error', '999', 'supplier5', '', 'No existe un registro con el id: 999'],
+        ])
+        self.assertEqual(models.Supplier.objects.count(), 2)
+        supplier.refresh_from_db()
+        self.assertTrue(supplier.is_active)
+
+    def test_dry_run_api(self):
+        """Test the dry run of an uploaded file returns the summary and the diff"""
+        user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        user.user_permissions.add(Permission.objects.get(codename='import_dpe'))
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        content = workbook_file({'Registros': [HEADERS, ['', 'Si', 'dpe1']]})
+        res = client.post(
+            reverse('dpe:import', args=['dpes']) + '?dry_run=true',
+            content.getvalue(),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            HTTP_CONTENT_DISPOSITION='attachment; filename=dpes.xlsx'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['summary']['inserts'], 1)
+        self.assertFalse(models.Dpe.objects.filter(name='dpe1').exists())
+
+        res = client.get(res.data['diff'])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        content = b''.join(res.streaming_content).decode('utf-8')
+        self.assertIn('Alta', content)
+
+
+class ImportViewTests(TestCase):
+    """Test the catalog import API"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.user.user_permissions.add(Permission.objects.get(codename='import_dpe'))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_import_xlsx(self):
+        """Test import the Registros sheet of an uploaded workbook"""
+        content = workbook_file({'Registros': [HEADERS, ['', 'Si', 'dpe1'], ['', 'No', 'dpe2']]})
+
+        res = self.client.post(
+            reverse('dpe:import', args=['dpes']),
+            content.getvalue(),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            HTTP_CONTENT_DISPOSITION='attachment; filename=dpes.xlsx'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['messages'], [])
+        self.assertEqual(models.Dpe.objects.filter(name__in=['dpe1', 'dpe2']).count(), 2)
@@ -0,0 +1,52 @@
+"""
+Tests for the ranked catalog search
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+from core.search import ranked_search
+
+
+class RankedSearchTests(TestCase):
+    """Test the substring search ranked by prefix match"""
+
+    def setUp(self):
+        models.Supplier.objects.create(name='Papelera del Norte', tax_id='PNO010101AAA', tax_name='Papelera SA')
+        models.Supplier.objects.create(name='Distribuidora Norte', tax_id='DNO010101BBB', tax_name='Distribuidora SA')
+        models.Supplier.objects.create(name='Abarrotes', tax_id='ABA010101CCC', tax_name='Abarrotes SA')
+
+    def test_prefix_matches_first(self):
+        """Test the records starting with the term are ranked first"""
+        models.Supplier.objects.create(name='Norteño', tax_id='NOR010101DDD', tax_name='Norteño SA')
+
+        queryset = ranked_search(models.Supplier.objects.all(), ['name'], 'nor')
+        names = [supplier.name for supplier in queryset]
+
+        self.assertEqual(names, ['Norteño', 'Distribuidora Norte', 'Papelera del Norte'])
+
+        queryset = ranked_search(models.Supplier.objects.all(), ['name'], 'dis')
+        self.assertEqual([supplier.name for supplier in queryset], ['Distribuidora Norte'])
+
+    def test_any_field(self):
+        """Test the term is matched in every field"""
+        queryset = ranked_search(models.Supplier.objects.all(), ['name', 'tax_name', 'tax_id'], 'aba0')
+
+        self.assertEqual([supplier.name for supplier in queryset], ['Abarrotes'])
+
+    def test_search_api(self):
+        """Test the search param of the supplier list"""
+        user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        user.user_permissions.add(Permission.objects.get(codename='view_supplier'))
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        res = client.get(reverse('supplier:supplier-list'), {'search': 'papelera'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['name'] for row in res.data], ['Papelera del Norte'])
@@ -0,0 +1,58 @@
+"""
+Tests for the streaming spreadsheet reader
+"""
+import io
+import types
+
+from openpyxl import Workbook
+
+from django.test import SimpleTestCase
+
+from core.spreadsheet import read_sheet
+
+
+def workbook_file(sheets):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+
+    content = io.BytesIO()
+    workbook.save(content)
+    content.seek(0)
+    return content
+
+
+class ReadSheetTests(SimpleTestCase):
+    """Test reading the rows of a sheet"""
+
+    def test_read_rows(self):
+        """Test the rows are generated without the trailing empty cells"""
+        file = workbook_file({
+            'Otros': [['ignored']],
+            'Registros': [
+                ['Id', 'Activo', 'Nombre', 'Padre'],
+                [1, 'Si', 'name1', None],
+                [None, 'No', 'name2', 'name1'],
+                [None, None, None, None],
+                [None, 'Si', None, 'name1'],
+            ],
+        })
+
+        rows = read_sheet(file, 'Registros')
+
+        self.assertIsInstance(rows, types.GeneratorType)
+        self.assertEqual(list(rows), [
+            ['Id', 'Activo', 'Nombre', 'Padre'],
+            [1, 'Si', 'name1'],
+            ['', 'No', 'name2', 'name1'],
+            ['', 'Si', '', 'name1'],
+        ])
+
+    def test_missing_sheet(self):
+        """Test None is returned when the sheet does not exist"""
+        file = workbook_file({'Otros': [['ignored']]})
+
+        self.assertIsNone(read_sheet(file, 'Registros'))
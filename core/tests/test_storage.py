@@ -0,0 +1,111 @@
+"""
+Tests for the S3 storage of the uploaded files, against the moto stand in
+"""
+import io
+import hashlib
+from urllib.parse import parse_qs, urlparse
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+import boto3
+from moto import mock_aws
+
+from core.storage import S3BlobStorage, S3Storage, blob_name, download_url
+
+BUCKET = 'attachments'
+PART_SIZE = 5 * 1024 * 1024
+
+
+@override_settings(
+    S3_BUCKET=BUCKET,
+    S3_ENDPOINT_URL=None,
+    S3_REGION='us-east-1',
+    S3_ACCESS_KEY_ID='testing',
+    S3_SECRET_ACCESS_KEY='testing',
+    S3_MULTIPART_THRESHOLD=PART_SIZE,
+    S3_MULTIPART_CHUNK_SIZE=PART_SIZE,
+)
+class S3StorageTests(TestCase):
+    """Test the S3 storages"""
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        boto3.client('s3', region_name='us-east-1').create_bucket(Bucket=BUCKET)
+        self.storage = S3BlobStorage()
+
+    def tearDown(self):
+        self.mock.stop()
+
+    def test_save_by_content(self):
+        """Test the files are stored once under the hash of their content"""
+        content = b'%PDF-signed'
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        name = self.storage.save('scan.pdf', ContentFile(content))
+        again = self.storage.save('other.pdf', ContentFile(content))
+
+        self.assertEqual(name, blob_name(sha256))
+        self.assertEqual(again, name)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(self.storage.size(name), len(content))
+        with self.storage.open(name) as fh:
+            self.assertEqual(fh.read(), content)
+
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+
+    def test_presigned_url(self):
+        """Test the download URL is presigned with the original file name"""
+        storage = S3Storage()
+        name = storage.save('reports/report.xlsx', ContentFile(b'xlsx'))
+        file = ContentFile(b'', name=name)
+        file.storage = storage
+
+        url = urlparse(download_url(file, 'report.xlsx'))
+        params = parse_qs(url.query)
+
+        self.assertIn(BUCKET, url.netloc + url.path)
+        self.assertTrue(url.path.endswith('reports/report.xlsx'))
+        self.assertIn('X-Amz-Signature', params)
+        self.assertEqual(params['response-content-disposition'], ['inline; filename="report.xlsx"'])
+
+    def test_multipart_partial(self):
+        """Test the chunks of a resumable upload are the parts of a multipart upload"""
+        chunks = [b'a' * PART_SIZE, b'b' * 10]
+        content = b''.join(chunks)
+        sha256 = hashlib.sha256(content).hexdigest()
+        name = 'uploads/user_1/partial'
+
+        token = self.storage.create_partial(name)
+        parts = []
+        offset = 0
+        for index, chunk in enumerate(chunks):
+            parts.append(self.storage.write_partial(name, token, index, offset, io.BytesIO(chunk)))
+            offset = offset + len(chunk)
+
+        self.assertEqual(self.storage.finish_partial(name, token, parts), sha256)
+
+        blob = self.storage.store_partial(name, sha256)
+        self.assertEqual(blob, blob_name(sha256))
+        self.assertFalse(self.storage.exists(name))
+        self.assertEqual(self.storage.size(blob), len(content))
+
+    def test_abort_partial(self):
+        """Test an aborted upload leaves nothing in the bucket"""
+        name = 'uploads/user_1/partial'
+        token = self.storage.create_partial(name)
+        self.storage.write_partial(name, token, 0, 0, io.BytesIO(b'data'))
+
+        self.storage.abort_partial(name, token)
+
+        uploads = self.storage.client.list_multipart_uploads(Bucket=BUCKET)
+        self.assertEqual(uploads.get('Uploads', []), [])
+        self.assertFalse(self.storage.exists(name))
+
+    def test_large_save_multipart(self):
+        """Test a file over the threshold is sent in parts"""
+        name = self.storage.save('big.bin', ContentFile(b'c' * (PART_SIZE + 1)))
+
+        self.assertEqual(self.storage.size(name), PART_SIZE + 1)
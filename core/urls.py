@@ -0,0 +1,13 @@
+"""
+URL mappings for the catalog import jobs
+"""
+from django.urls import path
+
+from core import import_job_views
+
+app_name = 'core'
+
+urlpatterns = [
+    path('<int:pk>/', import_job_views.ImportJobDetailView.as_view(), name='import-job-detail'),
+    path('<int:pk>/diff/', import_job_views.ImportJobDiffView.as_view(), name='import-job-diff'),
+]
@@ -346,3 +346,31 @@ class DepartmentTests(TestCase):
 
         res = self.client.delete(detail_url(parent_res.data['id']))
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_department_move_under_descendant_not_allowed(self):
+        """Test department update with a descendant as parent not allowed"""
+        root = create_department(name='root')
+        child = create_department(name='child', parent=root)
+        grandchild = create_department(name='grandchild', parent=child)
+
+        payload = {'is_active': True, 'name': 'root', 'parent': grandchild.id}
+        res = self.client.put(detail_url(root.id), payload)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_department_tree_success(self):
+        """Test nested departments and the subtree filters"""
+        root = create_department(name='root')
+        child = create_department(name='child', parent=root)
+        grandchild = create_department(name='grandchild', parent=child)
+        create_department(name='other')
+
+        res = self.client.get(reverse('department:department-tree'))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([node['name'] for node in res.data], ['other', 'root'])
+        self.assertEqual(res.data[1]['children'][0]['children'][0]['id'], grandchild.id)
+
+        res = self.client.get(MAIN_URL, {'descendants_of': root.id})
+        self.assertEqual([d['id'] for d in res.data], [child.id, grandchild.id])
+
+        res = self.client.get(MAIN_URL, {'ancestors_of': grandchild.id})
+        self.assertEqual([d['id'] for d in res.data], [child.id, root.id])
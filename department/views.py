@@ -8,13 +8,17 @@ from drf_spectacular.types import OpenApiTypes
 from django.utils.translation import gettext as _
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework import permissions
 from rest_framework import serializers
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 
 from core import models
+from core.catalog_cache import CachedListMixin
+from core.hierarchy import ancestors_of, build_tree, descendants_of
 
 from department.serializers import (
     DepartmentSerializer
@@ -26,7 +30,7 @@ class DepartmentPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         """Validate user permissions depending on the request method"""
 
-        if view.action == 'list' or view.action == 'retrieve':
+        if view.action == 'list' or view.action == 'retrieve' or view.action == 'tree':
             return request.user.has_perm('core.view_department') 
 
         if view.action == 'create':
@@ -66,9 +70,24 @@ class DepartmentPermission(permissions.BasePermission):
                 OpenApiTypes.INT,
                 required=False,
                 description=_('Parent id filter value')
+            ),
+            OpenApiParameter(
+                'descendants_of',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Only the records below the one with this id')
+            ),
+            OpenApiParameter(
+                'ancestors_of',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Only the records above the one with this id')
             )
         ]
     ),
+    tree=extend_schema(
+        description=_('[Protected | ViewDepartment] Nested tree of the departments, accepts the list filters')
+    ),
     create=extend_schema(
         description=_('[Protected | AddDepartment] Add an department')
     ),
@@ -85,7 +104,7 @@ class DepartmentPermission(permissions.BasePermission):
         description=_('[Protected | DeleteDepartment] Delete an department by id')
     ),
 )
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manage department APIs."""
     serializer_class = DepartmentSerializer
     queryset = models.Department.objects.all()
@@ -109,31 +128,35 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         if parent != None:
             queryset = queryset.filter(parent=parent)
 
+        descendants = self.request.query_params.get('descendants_of')
+        if descendants != None:
+            queryset = descendants_of(queryset, descendants)
+
+        ancestors = self.request.query_params.get('ancestors_of')
+        if ancestors != None:
+            queryset = ancestors_of(queryset, ancestors)
+
         return queryset.order_by('name')
+
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """Nested departments read with a single query"""
+        return Response(build_tree(self.get_queryset()))
         
     
-    def _update_level(self, serializer):
-        # Save level depending on the parent
-        level = 0
-        parent = serializer.validated_data.get('parent', None)
-        if parent != None:
-            level = parent.level + 1
-
-        return serializer.save(level=level)
-
     def perform_create(self, serializer):
         """Create a new supplier"""
-        return self._update_level(serializer)
+        return serializer.save()
 
     def perform_update(self, serializer):
         """Update a supplier"""
         
         parent = serializer.validated_data.get('parent', None)
         instance = self.get_object()
-        if parent != None and parent.id == instance.id:
+        if parent != None and (parent.id == instance.id or instance.is_ancestor_of(parent)):
             raise serializers.ValidationError(_('Debe especificar un registro padre diferente'))
         
-        return self._update_level(serializer)
+        return serializer.save()
     
     def perform_destroy(self, instance):
         """Destroy a supplier"""
@@ -1,11 +1,7 @@
 # import xlrd
-from pyexcel_xlsx import get_data
 from rest_framework.parsers import FileUploadParser
 
 
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import IntegrityError
-
 from django.utils.translation import gettext as _
 
 from rest_framework import status
@@ -14,6 +10,9 @@ from rest_framework import views, authentication, permissions
 from rest_framework.response import Response
 
 from core import models
+from core.import_job_views import CatalogImportJobView, DRY_RUN_PARAMETER, dry_run_response, is_dry_run
+from core.spreadsheet import read_sheet
+from core.importer import CatalogImporter
 
 
 class ImportCatalogPermission(permissions.BasePermission):
@@ -38,57 +37,26 @@ class ImportView(views.APIView):
 
     @extend_schema(
         description=_("[Protected | ImportDpe] Import records"),
+        parameters=[DRY_RUN_PARAMETER],
     )
     def post(self, request, filename, format=None):
         file = request.FILES['file']
-        data = get_data(file)
-
-        rows = data.get('Registros')
-        messages = []
-        if rows != None:
-            if(len(rows) > 1):
-                headers = rows.pop(0)
-                for row in rows:
-                    if len(row) >= 3:
-                        id = None
-                        if type(row[0]) is int:
-                            id = row[0]
-                        
-                        is_active = False
-                        if row[1] == 'Si':
-                            is_active = True
-
-                        name = row[2]
-
-                        if id != None:
-                            try:
-                                instance = models.Dpe.objects.get(id=id)
-
-                                instance.is_active = is_active
-                                instance.name = name
-
-                                instance.save()
+        rows = read_sheet(file, 'Registros')
 
-                            except ObjectDoesNotExist:
-                                messages.append(f"No existe un registro con el id: {id}")
-                            except IntegrityError:
-                                messages.append(f"Registro duplicado: {name}")
-                        else:
-                            try:
-                                models.Dpe.objects.create(
-                                    is_active=is_active,
-                                    name=name,
-                                )
+        if is_dry_run(request):
+            return dry_run_response(request, 'dpe', rows)
 
-                            except IntegrityError:
-                                messages.append(f"Registro duplicado: {name}")
-            else:
-                messages.append('Debe especificar al menos un registro para crear o actualizar.')
-        else:
-            messages.append('El archivo debe incluir una hoja llamada: Registros')
+        messages = CatalogImporter(models.Dpe).import_sheet(rows)
 
         return Response({
             "success": True,
             "messages": messages
         })
-        
\ No newline at end of file
+
+
+@extend_schema(tags=['Catalogs'])
+class ImportJobView(CatalogImportJobView):
+    permission_classes = [permissions.IsAuthenticated,
+                          ImportCatalogPermission
+                          ]
+    catalog = 'dpe'
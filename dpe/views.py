@@ -13,6 +13,7 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from core import models
+from core.catalog_cache import CachedListMixin
 
 from dpe.serializers import (
     DpeSerializer
@@ -77,7 +78,7 @@ class DpePermission(permissions.BasePermission):
         description=_('[Protected | DeleteDpe] Delete a decentralized public entity by id')
     ),
 )
-class DpeViewSet(viewsets.ModelViewSet):
+class DpeViewSet(CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manage dpe APIs."""
     serializer_class = DpeSerializer
     queryset = models.Dpe.objects.all()
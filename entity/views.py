@@ -8,13 +8,19 @@ from drf_spectacular.types import OpenApiTypes
 from django.utils.translation import gettext as _
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework import permissions
 from rest_framework import serializers
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 
 from core import models
+from core.autocomplete import AutocompleteMixin
+from core.catalog_cache import CachedListMixin
+from core.hierarchy import ancestors_of, build_tree, descendants_of
+from core.search import ranked_search
 
 from entity.serializers import (
     EntitySerializer
@@ -26,7 +32,7 @@ class EntityPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         """Validate user permissions depending on the request method"""
 
-        if view.action == 'list' or view.action == 'retrieve':
+        if view.action == 'list' or view.action == 'retrieve' or view.action == 'tree' or view.action == 'autocomplete':
             return request.user.has_perm('core.view_entity') 
 
         if view.action == 'create':
@@ -66,7 +72,45 @@ class EntityPermission(permissions.BasePermission):
                 OpenApiTypes.INT,
                 required=False,
                 description=_('Parent id filter value')
-            )
+            ),
+            OpenApiParameter(
+                'descendants_of',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Only the records below the one with this id')
+            ),
+            OpenApiParameter(
+                'ancestors_of',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Only the records above the one with this id')
+            ),
+            OpenApiParameter(
+                'search',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Ranked search value, best matches first')
+            ),
+        ]
+    ),
+    tree=extend_schema(
+        description=_('[Protected | ViewEntity] Nested tree of the entities, accepts the list filters')
+    ),
+    autocomplete=extend_schema(
+        description=_('[Protected | ViewEntity] Best matches of the active entities for the pickers'),
+        parameters=[
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Start of the name or of any of its words')
+            ),
+            OpenApiParameter(
+                'limit',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Maximum number of matches. Default: 10')
+            ),
         ]
     ),
     create=extend_schema(
@@ -85,10 +129,11 @@ class EntityPermission(permissions.BasePermission):
         description=_('[Protected | DeleteEntity] Delete an entity by id')
     ),
 )
-class EntityViewSet(viewsets.ModelViewSet):
+class EntityViewSet(AutocompleteMixin, CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manage entity APIs."""
     serializer_class = EntitySerializer
     queryset = models.Entity.objects.all()
+    autocomplete_catalog = 'entity'
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, EntityPermission]
 
@@ -109,30 +154,38 @@ class EntityViewSet(viewsets.ModelViewSet):
         if parent != None:
             queryset = queryset.filter(parent=parent)
 
-        return queryset.order_by('name')
-    
-    def _update_level(self, serializer):
-        # Save level depending on the parent
-        level = 0
-        parent = serializer.validated_data.get('parent', None)
-        if parent != None:
-            level = parent.level + 1
+        descendants = self.request.query_params.get('descendants_of')
+        if descendants != None:
+            queryset = descendants_of(queryset, descendants)
 
-        return serializer.save(level=level)
+        ancestors = self.request.query_params.get('ancestors_of')
+        if ancestors != None:
+            queryset = ancestors_of(queryset, ancestors)
 
+        search = self.request.query_params.get('search')
+        if search != None:
+            return ranked_search(queryset, ['name'], search)
+
+        return queryset.order_by('name')
+
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """Nested entities read with a single query"""
+        return Response(build_tree(self.get_queryset()))
+    
     def perform_create(self, serializer):
         """Create a new supplier"""
-        return self._update_level(serializer)
+        return serializer.save()
 
     def perform_update(self, serializer):
         """Update a supplier"""
         
         parent = serializer.validated_data.get('parent', None)
         instance = self.get_object() 
-        if parent != None and parent.id == instance.id:
+        if parent != None and (parent.id == instance.id or instance.is_ancestor_of(parent)):
             raise serializers.ValidationError(_('Debe especificar un registro padre diferente'))
         
-        return self._update_level(serializer)
+        return serializer.save()
     
     def perform_destroy(self, instance):
         """Destroy a supplier"""
@@ -0,0 +1,138 @@
+"""
+Bulk loading of the related rows rendered by the evidence serializers
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import prefetch_related_objects
+
+from easyaudit.models import CRUDEvent
+from eav.models import Value
+
+from core import models
+
+PREFETCH_CONTEXT_KEY = 'evidence_prefetch'
+
+
+def get_prefetched(context, name, key):
+    """Return the prefetched rows for key or None if they were not loaded"""
+    prefetch = context.get(PREFETCH_CONTEXT_KEY)
+    if prefetch == None:
+        return None
+
+    return getattr(prefetch, name).get(key)
+
+
+def _group_by(rows, keys, key):
+    grouped = {k: [] for k in keys}
+    for row in rows:
+        grouped[key(row)].append(row)
+    return grouped
+
+
+class EvidencePrefetch:
+    """Related rows for a page of evidences, loaded with a fixed number of queries
+
+    Only the sections backing the rendered `fields` are loaded, all of them
+    when `fields` is None. The custom fields and quality controls of the
+    types are only loaded for a `nested_type`, not for a type rendered as
+    its id.
+    """
+
+    def __init__(self, evidences, fields=None, nested_type=True):
+        self.fields = fields
+
+        self.authorizers = {}
+        self.signers = {}
+        self.comments = {}
+        self.quality_controls = {}
+        self.logs = {}
+        self.type_custom_fields = {}
+        self.type_quality_controls = {}
+        self.eav = {}
+
+        lookups = []
+        if self.wants('status'):
+            lookups += ['status__group', 'status__stage']
+        if self.wants('group'):
+            lookups.append('group')
+        if self.wants('owner'):
+            lookups.append('owner')
+        if self.wants('division'):
+            lookups.append('owner__profile__division')
+        if self.wants('creator'):
+            lookups.append('creator')
+        if self.wants('type', 'type_name'):
+            lookups.append('type')
+        if self.wants('uploaded_file'):
+            lookups.append('uploaded_file')
+        prefetch_related_objects(evidences, *lookups)
+
+        ids = [e.id for e in evidences]
+        type_ids = set([e.type_id for e in evidences])
+
+        if self.wants('authorizers'):
+            rows = models.EvidenceAuth.objects.filter(evidence__in=ids).select_related('user').order_by('id')
+            self.authorizers = _group_by(rows, ids, lambda r: r.evidence_id)
+
+        if self.wants('signers'):
+            rows = models.EvidenceSignature.objects.filter(evidence__in=ids).select_related('user').order_by('id')
+            self.signers = _group_by(rows, ids, lambda r: r.evidence_id)
+
+        if self.wants('comments'):
+            rows = models.EvidenceComment.objects.filter(evidence__in=ids).select_related('user').order_by('-id')
+            self.comments = _group_by(rows, ids, lambda r: r.evidence_id)
+
+        if self.wants('quality_controls'):
+            rows = models.EvidenceQualityControl.objects.filter(evidence__in=ids).select_related('user', 'quality_control').order_by('-id')
+            self.quality_controls = _group_by(rows, ids, lambda r: r.evidence_id)
+
+        evidence_type = ContentType.objects.get_for_model(models.Evidence)
+        if self.wants('logs'):
+            rows = CRUDEvent.objects.filter(
+                content_type_id=evidence_type.id,
+                object_id__in=[str(id) for id in ids]
+            ).select_related('user').order_by('-id')
+            self.logs = _group_by(rows, ids, lambda r: int(r.object_id))
+
+        type_details = nested_type and self.wants('type')
+        if type_details or self.wants('eav'):
+            rows = models.EvidenceTypeCustomField.objects.filter(type__in=type_ids).select_related('custom_field__attribute').order_by('id')
+            self.type_custom_fields = _group_by(rows, type_ids, lambda r: r.type_id)
+
+        if type_details:
+            rows = models.EvidenceTypeQualityControl.objects.filter(type__in=type_ids).select_related('quality_control').order_by('id')
+            self.type_quality_controls = _group_by(rows, type_ids, lambda r: r.type_id)
+
+        if self.wants('eav'):
+            self._load_eav(evidences, evidence_type)
+
+    def wants(self, *names):
+        """Whether any of the given fields is rendered"""
+        if self.fields == None:
+            return True
+
+        return any(name in self.fields for name in names)
+
+    def _load_eav(self, evidences, evidence_type):
+        ids = [e.id for e in evidences]
+
+        attribute_ids = set()
+        for custom_fields in self.type_custom_fields.values():
+            for cf in custom_fields:
+                attribute_ids.add(cf.custom_field.attribute_id)
+
+        values = {}
+        if len(ids) > 0 and len(attribute_ids) > 0:
+            rows = Value.objects.filter(
+                entity_ct=evidence_type,
+                entity_id__in=ids,
+                attribute__in=attribute_ids
+            ).select_related('attribute', 'value_enum')
+            for row in rows:
+                values[(row.entity_id, row.attribute_id)] = row.value
+
+        for evidence in evidences:
+            eav = {}
+            for cf in self.type_custom_fields.get(evidence.type_id, []):
+                attribute = cf.custom_field.attribute
+                eav.update({attribute.slug: values.get((evidence.id, attribute.id))})
+            self.eav[evidence.id] = eav
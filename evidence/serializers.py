@@ -23,6 +23,7 @@ from django.contrib.auth import get_user_model
 
 
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Manager
 
 from core import models
 
@@ -30,6 +31,7 @@ from easyaudit.models import CRUDEvent
 
 from core.serializers import (
     IntegerListField,
+    SparseFieldsMixin,
 )
 
 from evidence_group.serializers import (
@@ -41,7 +43,8 @@ from evidence_type.serializers import (
 )
 
 from evidence_status.serializers import (
-    EvidenceStatusSerializer
+    EvidenceStatusSerializer,
+    EvidenceStatusSummarySerializer,
 )
 
 from user.serializers import (
@@ -52,6 +55,12 @@ from assets.serializers import (
     FileUploadSerializer,
 )
 
+from evidence.prefetch import (
+    PREFETCH_CONTEXT_KEY,
+    EvidencePrefetch,
+    get_prefetched,
+)
+
 
 
 class EvidenceAuthSerializer(serializers.ModelSerializer):
@@ -95,8 +104,23 @@ class CRUDEventSerializer(serializers.ModelSerializer):
                   'object_json_repr',
                   'user',
                   ]
+
+class EvidenceListSerializer(serializers.ListSerializer):
+    """Serialize a list of evidences loading their related rows in bulk."""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, Manager) else data
+        evidences = list(iterable)
+
+        fields = set(self.child.fields.keys())
+        nested_type = isinstance(self.child.fields.get('type'), EvidenceTypeSerializer)
+        self.context[PREFETCH_CONTEXT_KEY] = EvidencePrefetch(evidences, fields, nested_type=nested_type)
+        try:
+            return [self.child.to_representation(item) for item in evidences]
+        finally:
+            self.context.pop(PREFETCH_CONTEXT_KEY, None)
         
-class EvidenceSerializer(serializers.ModelSerializer):
+class EvidenceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for evidence creation."""
 
     authorizers = serializers.SerializerMethodField()
@@ -119,18 +143,27 @@ class EvidenceSerializer(serializers.ModelSerializer):
         fields = ['id', 'version','owner', 'creator', 'status', 'group', 'type', 'parent', 'uploaded_file', 'authorizers', 'signers', 'eav', 'comments', 'logs', 
                   'quality_controls', 'division', 'created_at', 'updated_at']
         read_only_fields = ['version']
+        list_serializer_class = EvidenceListSerializer
 
     def get_authorizers(self, obj):
-        rows = models.EvidenceAuth.objects.filter(evidence=obj)
+        rows = get_prefetched(self.context, 'authorizers', obj.id)
+        if rows == None:
+            rows = models.EvidenceAuth.objects.filter(evidence=obj)
         s = EvidenceAuthSerializer(rows, many=True)
         return s.data
 
     def get_signers(self, obj):
-        rows = models.EvidenceSignature.objects.filter(evidence=obj)
+        rows = get_prefetched(self.context, 'signers', obj.id)
+        if rows == None:
+            rows = models.EvidenceSignature.objects.filter(evidence=obj)
         s = EvidenceSignatureSerializer(rows, many=True)
         return s.data
     
     def get_eav(self, obj):
+        eav = get_prefetched(self.context, 'eav', obj.id)
+        if eav != None:
+            return eav
+
         eav = {}
         custom_fields = models.EvidenceTypeCustomField.objects.filter(type=obj.type)
         for cf in custom_fields:
@@ -139,25 +172,45 @@ class EvidenceSerializer(serializers.ModelSerializer):
         return eav
     
     def get_comments(self, obj):
-        rows = models.EvidenceComment.objects.filter(evidence=obj).order_by('-id')
+        rows = get_prefetched(self.context, 'comments', obj.id)
+        if rows == None:
+            rows = models.EvidenceComment.objects.filter(evidence=obj).order_by('-id')
         s = EvidenceCommentSerializer(rows, many=True)
         return s.data
     
     def get_logs(self, obj):
-        evidence_type = ContentType.objects.get(app_label="core", model="evidence")
-        logs = CRUDEvent.objects.filter(content_type_id=evidence_type.id, object_id=obj.id).order_by('-id')
+        logs = get_prefetched(self.context, 'logs', obj.id)
+        if logs == None:
+            evidence_type = ContentType.objects.get(app_label="core", model="evidence")
+            logs = CRUDEvent.objects.filter(content_type_id=evidence_type.id, object_id=obj.id).order_by('-id')
 
         s = CRUDEventSerializer(logs, many=True)
         return s.data
 
     def get_quality_controls(self, obj):
-        rows = models.EvidenceQualityControl.objects.filter(evidence=obj).order_by('-id')
+        rows = get_prefetched(self.context, 'quality_controls', obj.id)
+        if rows == None:
+            rows = models.EvidenceQualityControl.objects.filter(evidence=obj).order_by('-id')
         s = EvidenceQualityControlSerializer(rows, many=True)
         return s.data
     
     def get_division(self, obj):
         s = DivisionSerializer(obj.owner.profile.division)
         return s.data
+
+class EvidenceSummarySerializer(EvidenceSerializer):
+    """Compact evidence representation for list views."""
+    expandable_fields = ['creator', 'uploaded_file', 'authorizers', 'signers', 'eav', 'comments', 'logs',
+                         'quality_controls', 'division']
+
+    status = EvidenceStatusSummarySerializer()
+    group = serializers.PrimaryKeyRelatedField(read_only=True)
+    type = serializers.PrimaryKeyRelatedField(read_only=True)
+    type_name = serializers.CharField(source='type.name', read_only=True)
+
+    class Meta(EvidenceSerializer.Meta):
+        fields = ['id', 'version', 'owner', 'status', 'group', 'type', 'type_name', 'parent', 'created_at', 'updated_at',
+                  'creator', 'uploaded_file', 'authorizers', 'signers', 'eav', 'comments', 'logs', 'quality_controls', 'division']
     
 
 class CreateEvidenceSerializer(serializers.Serializer):
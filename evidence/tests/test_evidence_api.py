@@ -1,10 +1,12 @@
 """
 Test for the user API
 """
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from evidence.serializers import EvidenceSerializer
+from evidence.serializers import EvidenceSerializer, EvidenceSummarySerializer
 from permission.views import PermissionQuerySet
 # from evidence.serializers import serialize_evidence
 
@@ -193,4 +195,205 @@ class PrivateUserApiTests(TestCase):
         }
 
         res = self.client.patch(detail_url(model.id), data, format='json')
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+class EvidenceListSerializerTests(TestCase):
+    """Test the bulk loading of evidence list representations"""
+
+    def setUp(self):
+        division = models.Division.objects.create(name='division1')
+        self.user = get_user_model().objects.create_user(
+            email='list@example.com',
+            password='testpass123',
+            name='List Name'
+        )
+        models.Profile.objects.create(user=self.user, division=division, job_position='CTO')
+
+        stage = create_evidence_stage(name='stage1', position=1)
+        self.egroup = create_evidence_group(name='group1', alias='group1')
+        self.estatus = create_evidence_status(
+            name='status1',
+            position=1,
+            color='#ffffff',
+            group=self.egroup,
+            stage=stage
+        )
+        self.etype = create_evidence_type(
+            name='type1',
+            alias='type1',
+            attachment_required=False,
+            group=self.egroup,
+            creation_status=self.estatus
+        )
+
+        custom_field = models.CustomField.create_custom_field(
+            name='Color',
+            slug='color',
+            datatype=Attribute.TYPE_TEXT
+        )
+        models.EvidenceTypeCustomField.objects.create(type=self.etype, custom_field=custom_field)
+        quality_control = models.QualityControl.objects.create(name='qc1')
+        models.EvidenceTypeQualityControl.objects.create(type=self.etype, quality_control=quality_control)
+        self.quality_control = quality_control
+
+    def create_evidences(self, count):
+        for i in range(count):
+            evidence = models.Evidence.objects.create(
+                type=self.etype,
+                group=self.egroup,
+                status=self.estatus,
+                owner=self.user,
+                creator=self.user,
+                version=1,
+                eav__color=f'#00000{i}'
+            )
+            models.EvidenceAuth.objects.create(evidence=evidence, user=self.user)
+            models.EvidenceSignature.objects.create(evidence=evidence, user=self.user)
+            models.EvidenceComment.objects.create(evidence=evidence, user=self.user, comments=f'comment {i}')
+            models.EvidenceQualityControl.objects.create(
+                evidence=evidence,
+                user=self.user,
+                quality_control=self.quality_control,
+                comments=f'finding {i}'
+            )
+
+    def test_list_matches_single_representation(self):
+        """Test the list representation matches each single evidence representation"""
+        self.create_evidences(3)
+
+        rows = models.Evidence.objects.order_by('-id')
+        data = EvidenceSerializer(rows, many=True).data
+
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data, [EvidenceSerializer(row).data for row in rows])
+        self.assertEqual(data[0]['eav'], {'color': '#000002'})
+
+    def test_list_query_count_is_constant(self):
+        """Test the number of queries does not grow with the number of evidences"""
+        self.create_evidences(2)
+        with CaptureQueriesContext(connection) as small:
+            EvidenceSerializer(models.Evidence.objects.order_by('-id'), many=True).data
+
+        self.create_evidences(4)
+        with CaptureQueriesContext(connection) as large:
+            EvidenceSerializer(models.Evidence.objects.order_by('-id'), many=True).data
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_list_sparse_fields(self):
+        """Test the fields kwarg restricts the rendered fields"""
+        self.create_evidences(2)
+
+        rows = models.Evidence.objects.order_by('-id')
+        data = EvidenceSerializer(rows, many=True, fields=['id', 'status', 'signers']).data
+
+        self.assertEqual(list(data[0].keys()), ['id', 'status', 'signers'])
+        self.assertEqual(data[0]['signers'], EvidenceSerializer(rows[0]).data['signers'])
+
+    def test_list_summary_success(self):
+        """Test list evidence summaries with expanded sections"""
+        self.create_evidences(2)
+        permission = Permission.objects.get(codename='view_evidence')
+        self.user.user_permissions.add(permission)
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        res = client.get(MAIN_URL, {'view': 'summary', 'expand': 'comments'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        rows = models.Evidence.objects.order_by('-id')
+        s = EvidenceSummarySerializer(rows, many=True, expand=['comments'])
+        self.assertEqual(s.data, res.data)
+        self.assertEqual(res.data[0]['type_name'], 'type1')
+        self.assertIn('comments', res.data[0])
+        self.assertNotIn('logs', res.data[0])
+
+    def test_list_summary_skips_type_details(self):
+        """Test the summary list does not load the custom fields and quality controls of the types"""
+        self.create_evidences(2)
+
+        with CaptureQueriesContext(connection) as queries:
+            EvidenceSummarySerializer(models.Evidence.objects.order_by('-id'), many=True).data
+
+        tables = [models.EvidenceTypeCustomField._meta.db_table, models.EvidenceTypeQualityControl._meta.db_table]
+        for query in queries.captured_queries:
+            for table in tables:
+                self.assertNotIn(table, query['sql'])
+
+
+class EvidenceVisibilityTests(TestCase):
+    """Test the evidences visible to work_evidence users"""
+
+    def setUp(self):
+        division = models.Division.objects.create(name='division1')
+        self.user = get_user_model().objects.create_user(email='worker@example.com', password='testpass123', name='Worker')
+        self.other = get_user_model().objects.create_user(email='other@example.com', password='testpass123', name='Other')
+        models.Profile.objects.create(user=self.user, division=division, job_position='Worker')
+        models.Profile.objects.create(user=self.other, division=division, job_position='Other')
+
+        permission = Permission.objects.get(codename='work_evidence')
+        self.user.user_permissions.add(permission)
+
+        stage = create_evidence_stage(name='stage1', position=1)
+        egroup = create_evidence_group(name='group1', alias='group1')
+        estatus = create_evidence_status(name='status1', position=1, color='#ffffff', group=egroup, stage=stage)
+        etype = create_evidence_type(name='type1', alias='type1', group=egroup, creation_status=estatus)
+
+        def create(owner):
+            return models.Evidence.objects.create(
+                type=etype, group=egroup, status=estatus, owner=owner, creator=owner, version=1
+            )
+
+        self.owned = create(self.user)
+        self.signed = create(self.other)
+        self.authorized = create(self.other)
+        self.hidden = create(self.other)
+        models.EvidenceSignature.objects.create(evidence=self.signed, user=self.user)
+        models.EvidenceAuth.objects.create(evidence=self.authorized, user=self.user)
+        models.EvidenceAuth.objects.create(evidence=self.hidden, user=self.other)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_visible_evidences(self):
+        """Test a work_evidence user lists owned, signed and authorized evidences"""
+        res = self.client.get(MAIN_URL, {'fields': 'id'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [row['id'] for row in res.data]
+        self.assertEqual(ids, [self.authorized.id, self.signed.id, self.owned.id])
+
+    def test_retrieve_hidden_evidence_not_found(self):
+        """Test a work_evidence user can not retrieve other evidences"""
+        res = self.client.get(detail_url(self.hidden.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.get(detail_url(self.signed.id), {'fields': 'id'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_division_evidences(self):
+        """Test a manage_evidence user lists the evidences of the division owners"""
+        division = models.Division.objects.create(name='division2')
+        outsider = get_user_model().objects.create_user(email='outsider@example.com', password='testpass123', name='Out')
+        models.Profile.objects.create(user=outsider, division=division, job_position='Out')
+        models.Evidence.objects.create(
+            type=self.owned.type,
+            group=self.owned.group,
+            status=self.owned.status,
+            owner=outsider,
+            creator=outsider,
+            version=1
+        )
+
+        manager = get_user_model().objects.create_user(email='manager@example.com', password='testpass123', name='Manager')
+        models.Profile.objects.create(user=manager, division=self.user.profile.division, job_position='Manager')
+        manager.user_permissions.add(Permission.objects.get(codename='manage_evidence'))
+
+        client = APIClient()
+        client.force_authenticate(user=manager)
+        res = client.get(MAIN_URL, {'fields': 'id'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [row['id'] for row in res.data]
+        self.assertEqual(ids, [self.hidden.id, self.authorized.id, self.signed.id, self.owned.id])
@@ -2,7 +2,6 @@
 Views fro the evidence APIs
 """
 from datetime import datetime
-from django.db.models import Q
 import json
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
@@ -23,8 +22,34 @@ from core import models
 from evidence.serializers import (
     CreateEvidenceSerializer,
     EvidenceSerializer,
+    EvidenceSummarySerializer,
     UpdateEvidenceSerializer
 )
+from evidence.visibility import (
+    is_visible,
+    visible_evidences,
+)
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        'view',
+        OpenApiTypes.STR,
+        required=False,
+        description=_('Either "full" or "summary" depending on the desired representation. Default: "full"')
+    ),
+    OpenApiParameter(
+        'fields',
+        OpenApiTypes.STR,
+        required=False,
+        description=_('Comma separated list of the fields to include')
+    ),
+    OpenApiParameter(
+        'expand',
+        OpenApiTypes.STR,
+        required=False,
+        description=_('Comma separated list of the sections to add to the summary representation')
+    ),
+]
 
 class EvidencePermission(permissions.BasePermission):
     message = _('Requested action is not authorized')
@@ -61,14 +86,10 @@ class EvidencePermission(permissions.BasePermission):
                 return True
 
         if request.user.has_perm('core.work_evidence'):
-            if obj.owner.id == request.user.id:
+            if obj.owner_id == request.user.id:
                 return True
-            
-            signers = models.EvidenceSignature.objects.filter(evidence=obj, user=request.user.id).count()
-            authorizers = models.EvidenceAuth.objects.filter(evidence=obj, user=request.user.id).count()
 
-            if (signers + authorizers )> 0:
-                return True
+            return is_visible(request.user, obj)
 
         return False
 
@@ -89,13 +110,14 @@ class EvidencePermission(permissions.BasePermission):
                 required=False,
                 description=_('Parent id filter value')
             )
-        ]
+        ] + SPARSE_FIELDS_PARAMETERS
     ),
     create=extend_schema(
         description=_('[Protected | AddEvidence] Add an evidence')
     ),
     retrieve=extend_schema(
-        description=_('[Protected | ViewEvidence] Retrieve an evidence by id')
+        description=_('[Protected | ViewEvidence] Retrieve an evidence by id'),
+        parameters=SPARSE_FIELDS_PARAMETERS
     ),
     partial_update=extend_schema(
         description=_('[Protected | ChangeEvidence] Partial update an evidence by id')
@@ -122,45 +144,34 @@ class EvidenceViewSet(viewsets.ModelViewSet):
         if self.action == 'partial_update':
             return UpdateEvidenceSerializer
 
+        view = self.request.query_params.get('view')
+        if view != None and view.strip().lower() == 'summary':
+            return EvidenceSummarySerializer
+
         return self.serializer_class
 
+    def _get_list_param(self, name):
+        value = self.request.query_params.get(name)
+        if value == None:
+            return None
+
+        return [v.strip() for v in value.split(',') if len(v.strip()) > 0]
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == 'list' or self.action == 'retrieve':
+            kwargs['fields'] = self._get_list_param('fields')
+            kwargs['expand'] = self._get_list_param('expand')
+
+        return super().get_serializer(*args, **kwargs)
+
     def get_queryset(self):
         """Retrieve evidences sorted by name"""
-        # Filter objects by active status
-        queryset = self.queryset
-
-        if self.request.user.has_perm('core.manage_evidence'): 
-            profiles = models.Profile.objects.filter(division=self.request.user.profile.division)
-            owners = []
-            for v in profiles:
-                owners.append(v.user)
-            queryset = queryset.filter(owner__in=owners)
-        elif self.request.user.has_perm('core.work_evidence'):
-            # Signers
-            signers = models.EvidenceSignature.objects.filter(user=self.request.user)
-            evidences = []
-            for v in signers:
-                evidences.append(v.evidence.id)
-
-            # Authorizers
-            authorizers = models.EvidenceAuth.objects.filter(user=self.request.user)
-            for v in authorizers:
-                evidences.append(v.evidence.id)
-
-            q_evidences = None
-            if(len(evidences) > 0):
-                q_evidences = Q(id__in=evidences)
-
-            # Owner
-            q_owner = Q(owner=self.request.user)
-
-            if q_evidences != None:
-                bd_q = Q(q_owner | q_evidences)
-                queryset = queryset.filter(bd_q)
-            else:
-                queryset = queryset.filter(q_owner)
-
-        elif self.request.user.has_perm('core.view_evidence'):
+        # Filter objects by the user visibility
+        user = self.request.user
+        queryset = visible_evidences(user, self.queryset)
+
+        # Only the view_evidence role filters by owner
+        if not user.has_perm('core.manage_evidence') and not user.has_perm('core.work_evidence') and user.has_perm('core.view_evidence'):
             owner = self.request.query_params.get('owner')
             if owner != None:
                 queryset = queryset.filter(owner=owner)
@@ -0,0 +1,37 @@
+"""
+Evidence visibility rules shared by the evidence and report APIs
+"""
+from django.db.models import Q
+
+from core import models
+
+
+def participant_q(user):
+    """Evidences owned, signed or authorized by the user
+
+    Signers and authorizers are matched with subqueries so the whole rule
+    stays a single SQL predicate.
+    """
+    signed = models.EvidenceSignature.objects.filter(user=user.id).values('evidence')
+    authorized = models.EvidenceAuth.objects.filter(user=user.id).values('evidence')
+
+    return Q(owner=user.id) | Q(id__in=signed) | Q(id__in=authorized)
+
+
+def visible_evidences(user, queryset=None):
+    """Restrict the evidences queryset to the ones the user is allowed to see"""
+    if queryset == None:
+        queryset = models.Evidence.objects.all()
+
+    if user.has_perm('core.manage_evidence'):
+        return queryset.filter(owner__profile__division=user.profile.division_id)
+
+    if user.has_perm('core.work_evidence'):
+        return queryset.filter(participant_q(user))
+
+    return queryset
+
+
+def is_visible(user, evidence):
+    """Whether the user is allowed to see the given evidence"""
+    return visible_evidences(user).filter(id=evidence.id).exists()
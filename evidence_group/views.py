@@ -6,10 +6,10 @@ from drf_spectacular.utils import extend_schema
 from django.utils.translation import gettext as _
 
 from rest_framework import views, authentication, permissions
-from rest_framework.response import Response
 
 
 from core import models
+from core.catalog_cache import cached_response
 
 from evidence_group.serializers import (
     EvidenceGroupSerializer
@@ -26,6 +26,5 @@ class ListEvidenceGroupView(views.APIView):
     )
     def get(self, request):
         rows = models.EvidenceGroup.objects.filter(is_active=True).order_by('name')
-        serializer = EvidenceGroupSerializer(rows, many=True)
-        return Response(serializer.data)
+        return cached_response(request, [models.EvidenceGroup], lambda: EvidenceGroupSerializer(rows, many=True).data)
 
@@ -6,10 +6,10 @@ from drf_spectacular.utils import extend_schema
 from django.utils.translation import gettext as _
 
 from rest_framework import views, authentication, permissions
-from rest_framework.response import Response
 
 
 from core import models
+from core.catalog_cache import cached_response
 
 from evidence_stage.serializers import (
     EvidenceStageSerializer
@@ -26,6 +26,5 @@ class ListEvidenceStageView(views.APIView):
     )
     def get(self, request):
         rows = models.EvidenceStage.objects.filter(is_active=True).order_by('name')
-        serializer = EvidenceStageSerializer(rows, many=True)
-        return Response(serializer.data)
+        return cached_response(request, [models.EvidenceStage], lambda: EvidenceStageSerializer(rows, many=True).data)
 
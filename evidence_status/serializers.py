@@ -23,4 +23,12 @@ class EvidenceStatusSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
     def __str__(self):
-        return f'EvidenceStatus: {self.name}'
\ No newline at end of file
+        return f'EvidenceStatus: {self.name}'
+
+
+class EvidenceStatusSummarySerializer(serializers.ModelSerializer):
+    """Serializer for the compact evidence status object"""
+    class Meta:
+        model = models.EvidenceStatus
+        fields = ['id', 'name', 'color']
+        read_only_fields = ['id']
@@ -15,6 +15,7 @@ from rest_framework.permissions import IsAuthenticated
 
 
 from core import models
+from core.catalog_cache import CachedListMixin
 
 from evidence_status.serializers import (
     EvidenceStatusSerializer,
@@ -104,10 +105,11 @@ class EvidenceStatusPermission(permissions.BasePermission):
         description=_('[Protected | DeleteEvidenceStatus] Delete an evidence status by id')
     ),
 )
-class EvidenceStatusViewSet(viewsets.ModelViewSet):
+class EvidenceStatusViewSet(CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manage evidence status APIs."""
     serializer_class = EvidenceStatusSerializer
     queryset = models.EvidenceStatus.objects.all()
+    cache_models = [models.EvidenceStatus, models.EvidenceGroup, models.EvidenceStage]
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, EvidenceStatusPermission]
     
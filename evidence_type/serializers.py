@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from core import models
 
+from evidence.prefetch import get_prefetched
+
 from custom_field.serializers import (
     EvidenceTypeCustomFieldSerializer,
     EvidenceTypeQualityControlSerializer,
@@ -17,12 +19,16 @@ class EvidenceTypeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
     def get_custom_fields(self, obj):
-        custom_fields = models.EvidenceTypeCustomField.objects.filter(type=obj)
+        custom_fields = get_prefetched(self.context, 'type_custom_fields', obj.id)
+        if custom_fields == None:
+            custom_fields = models.EvidenceTypeCustomField.objects.filter(type=obj)
         serializer = EvidenceTypeCustomFieldSerializer(custom_fields, many=True)
         return serializer.data
     
     def get_quality_controls(self, obj):
-        quality_control = models.EvidenceTypeQualityControl.objects.filter(type=obj)
+        quality_control = get_prefetched(self.context, 'type_quality_controls', obj.id)
+        if quality_control == None:
+            quality_control = models.EvidenceTypeQualityControl.objects.filter(type=obj)
         serializer = EvidenceTypeQualityControlSerializer(quality_control, many=True)
         return serializer.data
 
@@ -8,6 +8,7 @@ from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from rest_framework import views, viewsets
+from rest_framework.decorators import action
 from rest_framework import permissions
 from rest_framework import serializers
 from rest_framework.authentication import TokenAuthentication
@@ -16,6 +17,7 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from core import models
+from core.hierarchy import ancestors_of, build_tree, descendants_of
 
 from evidence_type.serializers import (
     AddEvidenceTypeQualityControlSerializer,
@@ -41,7 +43,7 @@ class EvidenceTypePermission(permissions.BasePermission):
 
         if hasattr(view, 'action'):
 
-            if view.action == 'list' or view.action == 'retrieve':
+            if view.action == 'list' or view.action == 'retrieve' or view.action == 'tree':
                 return request.user.has_perm('core.view_evidencetype') 
 
             if view.action == 'create':
@@ -96,6 +98,18 @@ class EvidenceTypePermission(permissions.BasePermission):
                 required=False,
                 description=_('Parent id filter value')
             ),
+            OpenApiParameter(
+                'descendants_of',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Only the records below the one with this id')
+            ),
+            OpenApiParameter(
+                'ancestors_of',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Only the records above the one with this id')
+            ),
             OpenApiParameter(
                 'group',
                 OpenApiTypes.INT,
@@ -104,6 +118,9 @@ class EvidenceTypePermission(permissions.BasePermission):
             )
         ]
     ),
+    tree=extend_schema(
+        description=_('[Protected | ViewEvidenceType] Nested tree of the evidence types, accepts the list filters')
+    ),
     create=extend_schema(
         description=_('[Protected | AddEvidenceType] Add an evidence type')
     ),
@@ -148,29 +165,38 @@ class EvidenceTypeViewSet(viewsets.ModelViewSet):
         if parent != None:
             queryset = queryset.filter(parent=parent)
 
+        descendants = self.request.query_params.get('descendants_of')
+        if descendants != None:
+            queryset = descendants_of(queryset, descendants)
+
+        ancestors = self.request.query_params.get('ancestors_of')
+        if ancestors != None:
+            queryset = ancestors_of(queryset, ancestors)
+
         group = self.request.query_params.get('group')
         if group != None:
             queryset = queryset.filter(group=group)
 
         return queryset.order_by('name')
+
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """Nested evidence types read with a single query"""
+        return Response(build_tree(self.get_queryset()))
         
     
-    def _update_level(self, serializer):
-        # Save level depending on the parent
-        level = 0
-        parent = serializer.validated_data.get('parent', None)
-        if parent != None:
-            level = parent.level + 1
-
-        return serializer.save(level=level)
-
     def perform_create(self, serializer):
         """Create a new evidence type"""
-        return self._update_level(serializer)
+        return serializer.save()
 
     def perform_update(self, serializer):
         """Update a evidence type"""
-        return self._update_level(serializer)
+        parent = serializer.validated_data.get('parent', None)
+        instance = self.get_object()
+        if parent != None and (parent.id == instance.id or instance.is_ancestor_of(parent)):
+            raise serializers.ValidationError(_('Debe especificar un registro padre diferente'))
+
+        return serializer.save()
     
     def perform_destroy(self, instance):
         """Destroy a evidence type"""
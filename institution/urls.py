@@ -8,7 +8,7 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
-from institution import views, import_views
+from institution import views, import_views, export_views
 
 router = DefaultRouter()
 router.register('', views.InstitutionViewSet)
@@ -17,5 +17,7 @@ app_name = 'institution'
 
 urlpatterns = [
     path('import/<slug:filename>/', import_views.ImportView.as_view(), name='import'),
+    path('import-jobs/<slug:filename>/', import_views.ImportJobView.as_view(), name='import-job'),
+    path('export/', export_views.ExportView.as_view(), name='export'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
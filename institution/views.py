@@ -13,6 +13,7 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from core import models
+from core.catalog_cache import CachedListMixin
 
 from institution.serializers import (
     InstitutionSerializer
@@ -77,7 +78,7 @@ class InstitutionPermission(permissions.BasePermission):
         description=_('[Protected | DeleteInstitution] Delete an institution by id')
     ),
 )
-class InstitutionViewSet(viewsets.ModelViewSet):
+class InstitutionViewSet(CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manage institution APIs."""
     serializer_class = InstitutionSerializer
     queryset = models.Institution.objects.all()
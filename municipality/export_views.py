@@ -0,0 +1,26 @@
+from django.utils.translation import gettext as _
+
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+
+from core.export_views import CatalogExportView
+
+
+class ExportCatalogPermission(permissions.BasePermission):
+    """Custom permission for user handling"""
+    message = _('Requested action is not authorized')
+
+    def has_permission(self, request, view):
+        """Validate user permissions depending on the request method"""
+        if request.method == 'GET':
+            return request.user.has_perm('core.view_municipality')
+
+        return False
+
+
+@extend_schema(tags=['Catalogs'])
+class ExportView(CatalogExportView):
+    permission_classes = [permissions.IsAuthenticated,
+                          ExportCatalogPermission
+                          ]
+    catalog = 'municipality'
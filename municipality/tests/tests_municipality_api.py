@@ -223,6 +223,24 @@ class MunicipalityTests(TestCase):
         serializer = MunicipalitySerializer(rows, many=True)
         self.assertEqual(res.data, serializer.data)
 
+    def test_list_municipalities_paginated_success(self):
+        """Test list municipalities by cursor pages"""
+        for name in ['name1', 'name2', 'name3']:
+            create_municipality(name=name)
+
+        res = self.client.get(MAIN_URL, {'page_size': 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        rows = models.Municipality.objects.all().order_by('name')
+        serializer = MunicipalitySerializer(rows, many=True)
+        self.assertEqual(res.data['results'], serializer.data[:2])
+        self.assertIsNone(res.data['previous'])
+
+        res2 = self.client.get(res.data['next'])
+        self.assertEqual(res2.status_code, status.HTTP_200_OK)
+        self.assertEqual(res2.data['results'], serializer.data[2:])
+        self.assertIsNone(res2.data['next'])
+
 
     def test_municipality_detail_success(self):
         """Test municipality detail success"""
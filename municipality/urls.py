@@ -8,7 +8,7 @@ from django.urls import (
 
 from rest_framework.routers import DefaultRouter
 
-from municipality import views, import_views
+from municipality import views, import_views, export_views
 
 router = DefaultRouter()
 router.register('', views.MunicipalityViewSet)
@@ -17,5 +17,7 @@ app_name = 'municipality'
 
 urlpatterns = [
     path('import/<slug:filename>/', import_views.ImportView.as_view(), name='import'),
+    path('import-jobs/<slug:filename>/', import_views.ImportJobView.as_view(), name='import-job'),
+    path('export/', export_views.ExportView.as_view(), name='export'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -13,6 +13,7 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from core import models
+from core.catalog_cache import CachedListMixin
 
 from municipality.serializers import (
     MunicipalitySerializer
@@ -77,7 +78,7 @@ class MunicipalityPermission(permissions.BasePermission):
         description=_('[Protected | DeleteMunicipality] Delete a municipality by id')
     ),
 )
-class MunicipalityViewSet(viewsets.ModelViewSet):
+class MunicipalityViewSet(CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manage municipality APIs."""
     serializer_class = MunicipalitySerializer
     queryset = models.Municipality.objects.all()
@@ -15,6 +15,7 @@ from rest_framework.permissions import IsAuthenticated
 
 
 from core import models
+from core.catalog_cache import CachedListMixin
 
 from quality_control.serializers import (
     QualityControlSerializer
@@ -79,7 +80,7 @@ class QualityControlPermission(permissions.BasePermission):
         description=_('[Protected | DeleteQualityControl] Delete an quality control by id')
     ),
 )
-class QualityControlViewSet(viewsets.ModelViewSet):
+class QualityControlViewSet(CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manage quality control APIs."""
     serializer_class = QualityControlSerializer
     queryset = models.QualityControl.objects.all()
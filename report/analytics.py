@@ -0,0 +1,104 @@
+"""
+Evidence counts by group and status for the analytics dashboard
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from evidence.visibility import visible_evidences
+
+from report import rollup
+
+VERSION_CACHE_KEY = 'evidence_analytics_version'
+
+
+def visibility_scope(user):
+    """Name shared by all the users that see the same evidences"""
+    if user.has_perm('core.manage_evidence'):
+        return f'division_{user.profile.division_id}'
+
+    if user.has_perm('core.work_evidence'):
+        return f'user_{user.id}'
+
+    return 'all'
+
+
+def get_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version == None:
+        version = 1
+        cache.add(VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def invalidate():
+    """Discard the cached analytics of every visibility scope"""
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, None)
+
+
+def group_rows(rows, counts=None):
+    """Merge (group, status) count rows into the analytics of each group"""
+    if counts == None:
+        counts = {}
+
+    for row in rows:
+        analytics = counts.setdefault(row['group_id'], [])
+        current = [a for a in analytics if a['status_id'] == row['status_id']]
+        if len(current) > 0:
+            current[0]['count'] = current[0]['count'] + row['count']
+            continue
+        analytics.append({
+            'status_id': row['status_id'],
+            'status': row['status__name'],
+            'color': row['status__color'],
+            'count': row['count'],
+        })
+
+    for analytics in counts.values():
+        analytics.sort(key=lambda a: a['status_id'])
+
+    return counts
+
+
+def group_status_counts(queryset):
+    """Evidence count of every (group, status) pair in a single query"""
+    rows = queryset.order_by().values(
+        'group_id',
+        'status_id',
+        'status__name',
+        'status__color',
+    ).annotate(count=Count('id'))
+
+    return group_rows(rows)
+
+
+def compute_analytics(user):
+    """Counts read from the rollup, plus the evidences a worker signs or authorizes"""
+    if user.has_perm('core.manage_evidence'):
+        return group_rows(rollup.scoped_counts(f'division_{user.profile.division_id}'))
+
+    if user.has_perm('core.work_evidence'):
+        counts = group_rows(rollup.scoped_counts(f'owner_{user.id}'))
+        participant = visible_evidences(user).exclude(owner=user.id).order_by().values(
+            'group_id',
+            'status_id',
+            'status__name',
+            'status__color',
+        ).annotate(count=Count('id'))
+        return group_rows(participant, counts)
+
+    return group_rows(rollup.scoped_counts('all'))
+
+
+def get_analytics(user):
+    """Counts by group and status visible to the user, cached per visibility scope"""
+    key = f'evidence_analytics_{get_version()}_{visibility_scope(user)}'
+    counts = cache.get(key)
+    if counts == None:
+        counts = compute_analytics(user)
+        cache.set(key, counts, settings.ANALYTICS_CACHE_TIMEOUT)
+
+    return counts
@@ -0,0 +1,39 @@
+"""
+Disk cache for the rendered evidence export files
+"""
+import json
+import hashlib
+
+from django.conf import settings
+
+from core import models
+from core.disk_cache import DiskCache
+
+
+def export_key(instance):
+    """Hash of everything the evidence export renders that can change"""
+    signers = models.EvidenceSignature.objects.filter(evidence=instance).order_by('id')
+    authorizers = models.EvidenceAuth.objects.filter(evidence=instance).order_by('id')
+    quality_controls = models.EvidenceQualityControl.objects.filter(evidence=instance).order_by('id')
+
+    parts = {
+        'evidence': [instance.id, instance.version, instance.updated_at.isoformat()],
+        'signers': list(signers.values_list('id', 'version', 'status')),
+        'authorizers': list(authorizers.values_list('id', 'version', 'status')),
+        'quality_controls': [
+            [id, status, updated_at.isoformat()]
+            for id, status, updated_at in quality_controls.values_list('id', 'status', 'updated_at')
+        ],
+    }
+    content = json.dumps(parts, sort_keys=True)
+
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def get_cache():
+    """Cache configured in the settings, None when it is disabled"""
+    directory = getattr(settings, 'EXPORT_CACHE_DIR', None)
+    if directory == None:
+        return None
+
+    return DiskCache(directory, settings.EXPORT_CACHE_MAX_BYTES)
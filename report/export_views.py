@@ -4,13 +4,14 @@ import io
 import datetime
 
 from evidence.serializers import EvidenceSerializer
+from evidence.visibility import visible_evidences
 from evidence_group.serializers import EvidenceGroupSerializer
 from report.report_views import NumberedCanvas
+from report.export_cache import export_key, get_cache
 from rest_framework import views, generics, authentication, permissions
 from rest_framework import views
 from rest_framework.response import Response
 
-from core import models
 from rest_framework import status
 from django.db import connection
 
@@ -27,6 +28,7 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
 
 from django.http import FileResponse
+from django.shortcuts import get_object_or_404
 
 class Print:
     def __init__(self, buffer, pagesize):
@@ -321,11 +323,21 @@ class EvidenceExportView(views.APIView):
         if not (self.request.user.has_perm('core.manage_evidence') or self.request.user.has_perm('core.work_evidence') or self.request.user.has_perm('core.view_evidence')):
             return Response(None, status=status.HTTP_401_UNAUTHORIZED)
         
-        instance = models.Evidence.objects.get(id=pk)
+        instance = get_object_or_404(visible_evidences(request.user), id=pk)
+
+        cache = get_cache()
+        if cache != None:
+            key = export_key(instance)
+            fh = cache.open(key)
+            if fh != None:
+                return FileResponse(fh, as_attachment=True, filename="report.pdf")
 
         buf = io.BytesIO()
 
         print = Print(buf, 'Letter')
         buf = print.build(instance)
 
+        if cache != None:
+            buf = cache.put(key, buf.getvalue())
+
         return FileResponse(buf, as_attachment=True, filename="report.pdf")
\ No newline at end of file
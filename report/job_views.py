@@ -0,0 +1,58 @@
+from django.http import FileResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+
+from rest_framework import views, authentication, permissions
+from rest_framework import status
+from rest_framework.response import Response
+
+from core import models
+from core.storage import download_url
+
+from report import jobs
+from report.serializers import EvidenceReportSerializer, ReportJobSerializer
+
+
+class EvidenceReportJobView(views.APIView):
+    """Queue an evidence report to be built by the report worker"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = EvidenceReportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = jobs.submit(request.user, serializer.data)
+
+        s = ReportJobSerializer(job)
+        return Response(s.data, status=status.HTTP_202_ACCEPTED)
+
+
+class ReportJobDetailView(views.APIView):
+    """Status of a report job"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        job = get_object_or_404(models.ReportJob, id=pk, owner=request.user)
+
+        s = ReportJobSerializer(job)
+        return Response(s.data)
+
+
+class ReportJobDownloadView(views.APIView):
+    """Download the file of a completed report job"""
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        job = get_object_or_404(models.ReportJob, id=pk, owner=request.user)
+
+        if job.status != models.ReportJob.Status.COMPLETED or not job.file:
+            s = ReportJobSerializer(job)
+            return Response(s.data, status=status.HTTP_409_CONFLICT)
+
+        url = download_url(job.file, f'report.{job.format}')
+        if url != None:
+            return HttpResponseRedirect(url)
+
+        return FileResponse(job.file.open('rb'), as_attachment=True, filename=f"report.{job.format}")
@@ -0,0 +1,141 @@
+"""
+Database backed queue for the evidence report jobs
+"""
+import io
+import datetime
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core import models
+from core.jobs import heartbeat
+
+from report.report_views import CSV, EvidenceReportView, Print
+
+# Advisory lock key of the claims, any number unique to the queue
+QUEUE_LOCK_ID = 7301
+
+
+def submit(user, config):
+    """Queue a report for the given serialized EvidenceReportSerializer data"""
+    format = config.get('format')
+    if format == None:
+        format = 'pdf'
+
+    return models.ReportJob.objects.create(
+        owner=user,
+        format=format,
+        parameters=config,
+    )
+
+
+def requeue_stalled():
+    """Send back to the queue the jobs of workers that died while running them
+
+    A running job touches its updated_at every REPORT_JOBS_HEARTBEAT
+    seconds, the ones silent for REPORT_JOBS_TIMEOUT lost their worker.
+    """
+    timeout = timezone.now() - datetime.timedelta(seconds=settings.REPORT_JOBS_TIMEOUT)
+    stalled = models.ReportJob.objects.filter(
+        status=models.ReportJob.Status.RUNNING,
+        updated_at__lt=timeout
+    )
+
+    failed = stalled.filter(attempts__gte=settings.REPORT_JOBS_MAX_ATTEMPTS).update(
+        status=models.ReportJob.Status.FAILED,
+        error='Se agotó el tiempo para generar el reporte',
+        finished_at=timezone.now()
+    )
+    requeued = stalled.update(status=models.ReportJob.Status.PENDING)
+
+    return failed + requeued
+
+
+def lock_queue():
+    """Serialize the claims until the end of the transaction
+
+    PostgreSQL takes an advisory lock, SQLite already serializes the writes.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [QUEUE_LOCK_ID])
+
+
+def claim():
+    """Mark the oldest pending job as running and return it
+
+    Returns None when there are no pending jobs or when the number of
+    running jobs already reached REPORT_JOBS_CONCURRENCY.
+    """
+    with transaction.atomic():
+        lock_queue()
+        running = models.ReportJob.objects.filter(status=models.ReportJob.Status.RUNNING).count()
+        if running >= settings.REPORT_JOBS_CONCURRENCY:
+            return None
+
+        job = models.ReportJob.objects.select_for_update(skip_locked=True).filter(
+            status=models.ReportJob.Status.PENDING
+        ).order_by('id').first()
+        if job == None:
+            return None
+
+        job.status = models.ReportJob.Status.RUNNING
+        job.attempts = job.attempts + 1
+        job.started_at = timezone.now()
+        job.save()
+
+    return job
+
+
+def run(job):
+    """Build the report file of a claimed job"""
+    view = EvidenceReportView()
+    config = job.parameters
+    cf_ids = config.get('cf_ids')
+
+    try:
+        with heartbeat(job, settings.REPORT_JOBS_HEARTBEAT):
+            if job.format == 'csv':
+                with tempfile.TemporaryFile() as fh:
+                    for line in CSV().stream(view.stream_query(config), cf_ids):
+                        fh.write(line.encode('utf-8'))
+                    fh.seek(0)
+                    job.file.save(f'report_{job.id}.csv', File(fh), save=False)
+            else:
+                buf = io.BytesIO()
+                pdf = Print(buf, 'Letter')
+                buf = pdf.build(view.query(config), cf_ids)
+                job.file.save(f'report_{job.id}.pdf', ContentFile(buf.getvalue()), save=False)
+
+        job.status = models.ReportJob.Status.COMPLETED
+        job.error = None
+    except Exception as e:
+        job.status = models.ReportJob.Status.FAILED
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save()
+
+    return job
+
+
+def purge():
+    """Delete the finished jobs and their files older than REPORT_JOBS_RETENTION_DAYS"""
+    cutoff = timezone.now() - datetime.timedelta(days=settings.REPORT_JOBS_RETENTION_DAYS)
+    expired = models.ReportJob.objects.filter(
+        status__in=[models.ReportJob.Status.COMPLETED, models.ReportJob.Status.FAILED],
+        finished_at__lt=cutoff
+    )
+
+    count = 0
+    for job in expired:
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        count = count + 1
+
+    return count
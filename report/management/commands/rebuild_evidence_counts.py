@@ -0,0 +1,16 @@
+"""
+Django command to recompute the evidence counts rollup
+"""
+from django.core.management.base import BaseCommand
+
+from report import analytics, rollup
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the evidence counts by group and status"""
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        rows = rollup.rebuild()
+        analytics.invalidate()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} evidence count rows'))
@@ -0,0 +1,45 @@
+"""
+Django command to run the queued report jobs
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from report import jobs
+
+
+class Command(BaseCommand):
+    """Django command to process the report jobs queue"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the pending jobs and exit',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5,
+            help='Seconds to wait when the queue is empty',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        self.stdout.write('Waiting for report jobs...')
+        while True:
+            jobs.requeue_stalled()
+            purged = jobs.purge()
+            if purged > 0:
+                self.stdout.write(f'Purged {purged} expired report jobs')
+
+            job = jobs.claim()
+            if job != None:
+                job = jobs.run(job)
+                self.stdout.write(f'Report job {job.id}: {job.get_status_display()}')
+                continue
+
+            if options['once']:
+                break
+
+            time.sleep(options['poll_interval'])
@@ -6,7 +6,7 @@ import csv
 
 from platform import python_version
 from django.db import connection
-from django.http import FileResponse, HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 
 from rest_framework.response import Response
 
@@ -16,6 +16,7 @@ from report.serializers import EvidenceReportSerializer
 from rest_framework import views
 
 from core import models
+from core.spreadsheet import Echo
 
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Image, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle as PS
@@ -222,48 +223,50 @@ class Print:
             return buffer
     
 class CSV:
-    def build(self, items, cf_ids):
-        buffer = io.StringIO()
-
-        # with open('profiles1.csv', 'w', newline='') as file:
-        writer = csv.writer(buffer)
+    def stream(self, rows, cf_ids):
+        """Yield the report csv lines for the evidence rows sorted by report group"""
+        writer = csv.writer(Echo())
         
-        writer.writerow(["Secretaría de la Hacienda Pública"])
-        writer.writerow(["Reporte de estatus de evidencias"])
+        yield writer.writerow(["Secretaría de la Hacienda Pública"])
+        yield writer.writerow(["Reporte de estatus de evidencias"])
         
-        writer.writerow([""])
+        yield writer.writerow([""])
         
-        writer.writerow(["Fecha de impresión"])
+        yield writer.writerow(["Fecha de impresión"])
         today = datetime.datetime.now()
-        writer.writerow([f"{today.strftime('%d/%m/%Y %H:%M hrs')}"])
-        writer.writerow([""])
+        yield writer.writerow([f"{today.strftime('%d/%m/%Y %H:%M hrs')}"])
+        yield writer.writerow([""])
+
+        cf_id_count = len(cf_ids)
+        current_key = None
+        for row in rows:
+            key = [row.get('group_id'), row.get('type_id'), row.get('division_id')]
+            for j in range(cf_id_count):
+                key.append(row.get(f'gf{j + 1}'))
 
-        for i, item in items:
-            headers = ["Grupo de evidencias", "Tipo de evidencias", "División"]
-            values = [item.get('group_name'), item.get('type_name'), item.get('division_name')]
+            if key != current_key:
+                if current_key != None:
+                    yield writer.writerow([""])
+                current_key = key
 
-            cf_id_count = len(cf_ids)
-            if cf_id_count > 0:
+                headers = ["Grupo de evidencias", "Tipo de evidencias", "División"]
+                values = [row.get('group_name'), row.get('type_name'), row.get('division_name')]
 
                 if cf_id_count == 1:
                     for j, cf_id in enumerate(cf_ids):
-                        headers.append(item.get(f'attr{j + 1}_name'))
-                        values.append(item.get(f'gf{j + 1}'))
-            
-            writer.writerow(headers)
-            writer.writerow(values)
-            writer.writerow(['Creado', 'Actualizado', 'Responsable', 'Puesto', 'Estatus'])
-            for k, evidence in enumerate(item.get('evidences')):
-                created_at = datetime.datetime.fromisoformat(evidence.get('created_at')).strftime("%d/%m/%Y")
-                updated_at = datetime.datetime.fromisoformat(evidence.get('updated_at')).strftime("%d/%m/%Y")
-                writer.writerow([created_at, updated_at, evidence.get('user'), evidence.get('job_position'), evidence.get('status_name')])
-            
-            writer.writerow([""])
+                        headers.append(row.get(f'attr{j + 1}_name'))
+                        values.append(row.get(f'gf{j + 1}'))
 
-        content = buffer.getvalue()
-        buffer.close()
+                yield writer.writerow(headers)
+                yield writer.writerow(values)
+                yield writer.writerow(['Creado', 'Actualizado', 'Responsable', 'Puesto', 'Estatus'])
 
-        return content
+            created_at = datetime.datetime.fromisoformat(row.get('created_at')).strftime("%d/%m/%Y")
+            updated_at = datetime.datetime.fromisoformat(row.get('updated_at')).strftime("%d/%m/%Y")
+            yield writer.writerow([created_at, updated_at, row.get('user'), row.get('job_position'), row.get('status_name')])
+
+        if current_key != None:
+            yield writer.writerow([""])
 
 
 # @extend_schema(tags=['User management'])
@@ -271,16 +274,11 @@ class EvidenceReportView(views.APIView):
     authentication_classes = [authentication.TokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
-    def query(self, config):
-        cf_ids = config.get("cf_ids")
+    stream_chunk_size = 2000
 
-        fields = []
+    def custom_field_joins(self, cf_ids):
         subqueries = []
-        group_bys = []
         for idx, attr_id in enumerate(cf_ids):
-            fields.append(f"""
-                    val{idx + 1}.value_text AS gf{idx + 1},
-                    STRING_AGG(DISTINCT attr{idx + 1}.name, '') AS attr{idx + 1}_name""")
             subqueries.append(f"""
                     LEFT JOIN
                         eav_value AS val{idx + 1}
@@ -300,6 +298,18 @@ class EvidenceReportView(views.APIView):
                         eav_attribute AS attr{idx + 1}
                             ON attr{idx + 1}.id = val{idx + 1}.attribute_id
                 """)
+        return subqueries
+
+    def query(self, config):
+        cf_ids = config.get("cf_ids")
+
+        fields = []
+        subqueries = self.custom_field_joins(cf_ids)
+        group_bys = []
+        for idx, attr_id in enumerate(cf_ids):
+            fields.append(f"""
+                    val{idx + 1}.value_text AS gf{idx + 1},
+                    STRING_AGG(DISTINCT attr{idx + 1}.name, '') AS attr{idx + 1}_name""")
             group_bys.append(f"""
                              val{idx + 1}.value_text""")
 
@@ -368,17 +378,97 @@ class EvidenceReportView(views.APIView):
             data = [dict(zip(columns, row)) for row in cursor.fetchall()]
 
         return enumerate(data)
+
+    def stream_query(self, config):
+        """Yield one row per evidence sorted by report group, read with a server-side cursor"""
+        cf_ids = config.get("cf_ids")
+
+        fields = []
+        subqueries = self.custom_field_joins(cf_ids)
+        order_bys = []
+        for idx, attr_id in enumerate(cf_ids):
+            fields.append(f"""
+                    val{idx + 1}.value_text AS gf{idx + 1},
+                    attr{idx + 1}.name AS attr{idx + 1}_name""")
+            order_bys.append(f"""
+                             val{idx + 1}.value_text""")
+
+        fields_str = ''
+        if(len(fields) > 0):
+            fields_str = ','.join(fields) + ","
+
+        order_bys_str = ''
+        if(len(order_bys) > 0):
+            order_bys_str = ',' + ','.join(order_bys)
+
+        query = f"""SELECT 
+                                eg.id AS group_id,
+                                et.id AS type_id,
+                                d.id AS division_id,
+                                {fields_str}
+                                eg.name AS group_name,
+                                et.name AS type_name,
+                                d.name AS division_name,
+                                e.id,
+                                to_char(e.created_at, 'YYYY-MM-DD"T"HH24:MI') AS created_at,
+                                to_char(e.updated_at, 'YYYY-MM-DD"T"HH24:MI') AS updated_at,
+                                u.name AS user,
+                                p.job_position,
+                                es.name AS status_name
+                            FROM 
+                                core_evidence AS e
+                            LEFT JOIN
+                                core_evidencestatus AS es
+                                ON e.status_id = es.id
+                            LEFT JOIN
+                                core_evidencetype AS et
+                                ON e.type_id = et.id
+                            LEFT JOIN
+                                core_evidencegroup AS eg
+                                ON eg.id = et.group_id
+                            LEFT JOIN
+                                core_user AS u
+                                ON e.owner_id = u.id
+                            LEFT JOIN
+                                core_profile AS p
+                                ON u.id = p.user_id
+                            LEFT JOIN
+                                core_division AS d
+                                ON p.division_id = d.id
+                            {''.join(subqueries)}
+                            ORDER BY
+                                eg.id,
+                                et.id,
+                                d.id
+                                {order_bys_str},
+                                e.id
+                            """
+
+        # Named (server-side) cursor on PostgreSQL, rows are fetched in chunks
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(query)
+
+            columns = None
+            while True:
+                rows = cursor.fetchmany(self.stream_chunk_size)
+                if len(rows) == 0:
+                    break
+
+                if columns == None:
+                    columns = [col[0] for col in cursor.description]
+                for row in rows:
+                    yield dict(zip(columns, row))
     
     def post(self, request):
         serializer = EvidenceReportSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        
-        data = self.query(serializer.data)
 
         format = serializer.validated_data.get("format")
         cf_ids = serializer.validated_data.get("cf_ids")
 
         if format == None or format == "pdf":
+            data = self.query(serializer.data)
+
             buf = io.BytesIO()
             pdf = Print(buf, 'Letter')
             buf = pdf.build(data, cf_ids)
@@ -386,6 +476,8 @@ class EvidenceReportView(views.APIView):
             return FileResponse(buf, as_attachment=True, filename="report.pdf")
         else:
             csv = CSV()
-            content = csv.build(data, cf_ids)
+            rows = self.stream_query(serializer.data)
 
-            return FileResponse(content, as_attachment=True, filename="report.csv")
\ No newline at end of file
+            response = StreamingHttpResponse(csv.stream(rows, cf_ids), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="report.csv"'
+            return response
\ No newline at end of file
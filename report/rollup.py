@@ -0,0 +1,83 @@
+"""
+Incrementally maintained evidence counts by (group, status, division, owner)
+"""
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from core import models
+
+
+def owner_division(owner_id):
+    return models.Profile.objects.filter(user=owner_id).values_list('division', flat=True).first()
+
+
+def add(group_id, status_id, owner_id, delta):
+    """Add delta to the count of the evidences with the given group, status and owner"""
+    rows = models.EvidenceStatusCount.objects.filter(group=group_id, status=status_id, owner=owner_id)
+    if delta < 0:
+        rows.update(count=F('count') + delta)
+        return
+
+    with transaction.atomic():
+        row, created = models.EvidenceStatusCount.objects.get_or_create(
+            group_id=group_id,
+            status_id=status_id,
+            owner_id=owner_id,
+            defaults={'division_id': owner_division(owner_id)}
+        )
+        models.EvidenceStatusCount.objects.filter(id=row.id).update(count=F('count') + delta)
+
+
+def move_owner(owner_id, division_id):
+    """Follow the division change of an evidences owner
+
+    Called by the Profile signals. The queryset updates of Profile.division
+    skip them and must call it, or run rebuild_evidence_counts afterwards.
+    """
+    models.EvidenceStatusCount.objects.filter(owner=owner_id).update(division=division_id)
+
+
+def rebuild():
+    """Recompute every count from the evidences table"""
+    rows = models.Evidence.objects.order_by().values(
+        'group_id',
+        'status_id',
+        'owner_id',
+        'owner__profile__division',
+    ).annotate(total=Count('id'))
+
+    with transaction.atomic():
+        models.EvidenceStatusCount.objects.all().delete()
+        models.EvidenceStatusCount.objects.bulk_create([
+            models.EvidenceStatusCount(
+                group_id=row['group_id'],
+                status_id=row['status_id'],
+                owner_id=row['owner_id'],
+                division_id=row['owner__profile__division'],
+                count=row['total'],
+            )
+            for row in rows
+        ], batch_size=1000)
+
+    return len(rows)
+
+
+def scoped_counts(scope):
+    """Counts filtered by the visibility scope: division_<id>, owner_<id> or all"""
+    rows = models.EvidenceStatusCount.objects.filter(count__gt=0)
+
+    if scope.startswith('division_'):
+        division_id = scope[len('division_'):]
+        if division_id == 'None':
+            rows = rows.filter(division__isnull=True)
+        else:
+            rows = rows.filter(division=division_id)
+    elif scope.startswith('owner_'):
+        rows = rows.filter(owner=scope[len('owner_'):])
+
+    return rows.order_by().values(
+        'group_id',
+        'status_id',
+        'status__name',
+        'status__color',
+    ).annotate(count=Sum('count'))
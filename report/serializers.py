@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core import models
 
 from core.serializers import (
     IntegerListField,
@@ -13,3 +14,10 @@ class EvidenceReportSerializer(serializers.Serializer):
     from_date = serializers.DateField(format="%Y-%m-%d", required=False)
     to_date = serializers.DateField(format="%Y-%m-%d", required=False)
     format = serializers.CharField(required=False)
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """Serializer for the report job object"""
+    class Meta:
+        model = models.ReportJob
+        fields = ['id', 'status', 'format', 'parameters', 'error', 'attempts', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from core import models
+
+from report import analytics, rollup
+
+# Evidence fields the analytics are grouped or scoped by
+TRACKED_FIELDS = ('group_id', 'status_id', 'owner_id')
+
+
+def tracked_values(instance):
+    return tuple(instance.__dict__.get(field) for field in TRACKED_FIELDS)
+
+
+@receiver(post_init, sender=models.Evidence)
+def remember_tracked(sender, instance, **kwargs):
+    instance._analytics_values = tracked_values(instance)
+
+
+@receiver(post_save, sender=models.Evidence)
+def evidence_saved(sender, instance, created, **kwargs):
+    values = tracked_values(instance)
+    if created:
+        rollup.add(*values, 1)
+        analytics.invalidate()
+    elif values != instance._analytics_values:
+        rollup.add(*instance._analytics_values, -1)
+        rollup.add(*values, 1)
+        analytics.invalidate()
+    instance._analytics_values = values
+
+
+@receiver(post_delete, sender=models.Evidence)
+def evidence_deleted(sender, instance, **kwargs):
+    rollup.add(*instance._analytics_values, -1)
+    analytics.invalidate()
+
+
+@receiver(post_init, sender=models.Profile)
+def remember_division(sender, instance, **kwargs):
+    instance._analytics_division = instance.__dict__.get('division_id')
+
+
+@receiver(post_save, sender=models.Profile)
+def profile_saved(sender, instance, created, **kwargs):
+    if not created and instance.division_id != instance._analytics_division:
+        rollup.move_owner(instance.user_id, instance.division_id)
+        analytics.invalidate()
+    instance._analytics_division = instance.division_id
+
+
+@receiver(post_save, sender=models.EvidenceSignature)
+@receiver(post_save, sender=models.EvidenceAuth)
+def participant_saved(sender, instance, created, **kwargs):
+    if created:
+        analytics.invalidate()
+
+
+@receiver(post_delete, sender=models.EvidenceSignature)
+@receiver(post_delete, sender=models.EvidenceAuth)
+def participant_deleted(sender, instance, **kwargs):
+    analytics.invalidate()
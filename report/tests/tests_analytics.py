@@ -0,0 +1,143 @@
+"""
+Tests for the evidence analytics API
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+
+ANALYTICS_URL = reverse('report:evidence-analytics')
+
+
+class EvidenceAnalyticsTests(TestCase):
+    """Test the evidence counts by group and status"""
+
+    def setUp(self):
+        cache.clear()
+        division = models.Division.objects.create(name='division1')
+        self.user = get_user_model().objects.create_user(email='worker@example.com', password='testpass123', name='Worker')
+        self.other = get_user_model().objects.create_user(email='other@example.com', password='testpass123', name='Other')
+        models.Profile.objects.create(user=self.user, division=division, job_position='Worker')
+        models.Profile.objects.create(user=self.other, division=division, job_position='Other')
+        self.user.user_permissions.add(Permission.objects.get(codename='work_evidence'))
+
+        stage = models.EvidenceStage.objects.create(name='stage1', position=1)
+        self.group = models.EvidenceGroup.objects.create(name='group1', alias='group1')
+        self.empty_group = models.EvidenceGroup.objects.create(name='group2', alias='group2')
+        self.pending = models.EvidenceStatus.objects.create(name='pending', position=1, color='#ffffff', group=self.group, stage=stage)
+        self.done = models.EvidenceStatus.objects.create(name='done', position=2, color='#000000', group=self.group, stage=stage)
+        self.etype = models.EvidenceType.objects.create(name='type1', alias='type1', group=self.group, creation_status=self.pending)
+
+        self.owned = self.create(self.user, self.pending)
+        self.create(self.user, self.pending)
+        self.create(self.user, self.done)
+        self.create(self.other, self.done)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create(self, owner, estatus):
+        return models.Evidence.objects.create(
+            type=self.etype, group=self.group, status=estatus, owner=owner, creator=owner, version=1
+        )
+
+    def counts(self, res):
+        return {
+            row['group']['id']: {a['status_id']: a['count'] for a in row['analytics']}
+            for row in res.data
+        }
+
+    def test_counts_by_group_and_status(self):
+        """Test the counts only include the visible evidences"""
+        res = self.client.get(ANALYTICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        counts = self.counts(res)
+        self.assertEqual(counts[self.group.id], {self.pending.id: 2, self.done.id: 1})
+        self.assertEqual(counts[self.empty_group.id], {})
+        row = [row for row in res.data if row['group']['id'] == self.group.id][0]
+        analytics = row['analytics'][0]
+        self.assertEqual(analytics['status'], 'pending')
+        self.assertEqual(analytics['color'], '#ffffff')
+
+    def test_cached_until_status_changes(self):
+        """Test the counts are cached and refreshed after a status change"""
+        self.client.get(ANALYTICS_URL)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(ANALYTICS_URL)
+        counted = [q for q in queries.captured_queries if 'COUNT' in q['sql'].upper()]
+        self.assertEqual(counted, [])
+
+        self.owned.status = self.done
+        self.owned.save()
+
+        res = self.client.get(ANALYTICS_URL)
+        self.assertEqual(self.counts(res)[self.group.id], {self.pending.id: 1, self.done.id: 2})
+
+    def rollup(self):
+        rows = models.EvidenceStatusCount.objects.filter(count__gt=0)
+        return sorted(rows.values_list('status_id', 'owner_id', 'division_id', 'count'))
+
+    def test_rollup_follows_evidence_changes(self):
+        """Test the rollup is updated on create, status change and delete"""
+        division = self.user.profile.division_id
+        self.assertEqual(self.rollup(), [
+            (self.pending.id, self.user.id, division, 2),
+            (self.done.id, self.user.id, division, 1),
+            (self.done.id, self.other.id, division, 1),
+        ])
+
+        self.owned.status = self.done
+        self.owned.save()
+        self.assertEqual(self.rollup(), [
+            (self.pending.id, self.user.id, division, 1),
+            (self.done.id, self.user.id, division, 2),
+            (self.done.id, self.other.id, division, 1),
+        ])
+
+        self.owned.delete()
+        expected = [
+            (self.pending.id, self.user.id, division, 1),
+            (self.done.id, self.user.id, division, 1),
+            (self.done.id, self.other.id, division, 1),
+        ]
+        self.assertEqual(self.rollup(), expected)
+
+        models.EvidenceStatusCount.objects.all().delete()
+        call_command('rebuild_evidence_counts', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self.rollup(), expected)
+
+    def test_rollup_follows_division_change(self):
+        """Test the counts move with the division of the owner profile"""
+        division = models.Division.objects.create(name='division2')
+        profile = self.other.profile
+        profile.division = division
+        profile.save()
+
+        self.assertIn((self.done.id, self.other.id, division.id, 1), self.rollup())
+        self.assertIn((self.pending.id, self.user.id, self.user.profile.division_id, 2), self.rollup())
+
+    def test_manager_counts_division_from_rollup(self):
+        """Test a manage_evidence user gets the counts of the division owners"""
+        manager = get_user_model().objects.create_user(email='manager@example.com', password='testpass123', name='Manager')
+        models.Profile.objects.create(user=manager, division=self.user.profile.division, job_position='Manager')
+        manager.user_permissions.add(Permission.objects.get(codename='manage_evidence'))
+
+        outsider = get_user_model().objects.create_user(email='outsider@example.com', password='testpass123', name='Out')
+        models.Profile.objects.create(user=outsider, division=models.Division.objects.create(name='division2'), job_position='Out')
+        self.create(outsider, self.done)
+
+        client = APIClient()
+        client.force_authenticate(user=manager)
+        res = client.get(ANALYTICS_URL)
+
+        self.assertEqual(self.counts(res)[self.group.id], {self.pending.id: 2, self.done.id: 2})
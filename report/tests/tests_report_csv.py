@@ -0,0 +1,62 @@
+"""
+Tests for the evidence report csv output
+"""
+from django.test import SimpleTestCase
+
+from report.report_views import CSV
+
+
+def create_row(**params):
+    row = {
+        'group_id': 1,
+        'type_id': 1,
+        'division_id': 1,
+        'group_name': 'group1',
+        'type_name': 'type1',
+        'division_name': 'division1',
+        'created_at': '2024-05-01T10:00',
+        'updated_at': '2024-05-02T10:00',
+        'user': 'user1',
+        'job_position': 'CTO',
+        'status_name': 'status1',
+    }
+    row.update(params)
+    return row
+
+
+class CSVReportTests(SimpleTestCase):
+    """Test the streamed csv report"""
+
+    def test_stream_groups_rows(self):
+        """Test rows sharing a report group are written under one header"""
+        rows = [
+            create_row(),
+            create_row(user='user2'),
+            create_row(type_id=2, type_name='type2', user='user3'),
+        ]
+
+        lines = list(CSV().stream(iter(rows), []))
+        body = ''.join(lines[6:]).splitlines()
+
+        self.assertEqual(body, [
+            'Grupo de evidencias,Tipo de evidencias,División',
+            'group1,type1,division1',
+            'Creado,Actualizado,Responsable,Puesto,Estatus',
+            '01/05/2024,02/05/2024,user1,CTO,status1',
+            '01/05/2024,02/05/2024,user2,CTO,status1',
+            '""',
+            'Grupo de evidencias,Tipo de evidencias,División',
+            'group1,type2,division1',
+            'Creado,Actualizado,Responsable,Puesto,Estatus',
+            '01/05/2024,02/05/2024,user3,CTO,status1',
+            '""',
+        ])
+
+    def test_stream_custom_field_header(self):
+        """Test a single custom field is added to the group header"""
+        rows = [create_row(gf1='red', attr1_name='Color')]
+
+        lines = list(CSV().stream(iter(rows), [7]))
+
+        self.assertEqual(lines[6], 'Grupo de evidencias,Tipo de evidencias,División,Color\r\n')
+        self.assertEqual(lines[7], 'group1,type1,division1,red\r\n')
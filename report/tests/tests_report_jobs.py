@@ -0,0 +1,125 @@
+"""
+Tests for the report jobs queue
+"""
+import time
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+from core.jobs import heartbeat
+
+from report import jobs
+
+JOBS_URL = reverse('report:evidence-jobs')
+
+
+def detail_url(id):
+    return reverse('report:job-detail', args=[id])
+
+
+def download_url(id):
+    return reverse('report:job-download', args=[id])
+
+
+def create_job(**params):
+    return models.ReportJob.objects.create(**params)
+
+
+class ReportJobTests(TestCase):
+    """Test the report jobs queue and APIs"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_submit_job_success(self):
+        """Test queue a report job and read its status"""
+        payload = {'group_id': 1, 'type_id': 1, 'division_id': 1, 'cf_ids': [], 'format': 'csv'}
+        res = self.client.post(JOBS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['status'], models.ReportJob.Status.PENDING)
+        self.assertEqual(res.data['format'], 'csv')
+
+        res = self.client.get(detail_url(res.data['id']))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(download_url(res.data['id']))
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_job_of_other_user_not_found(self):
+        """Test a user can not read the jobs of other users"""
+        other = get_user_model().objects.create_user(email='other@example.com', password='testpass123')
+        job = create_job(owner=other)
+
+        res = self.client.get(detail_url(job.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(REPORT_JOBS_CONCURRENCY=1)
+    def test_claim_respects_concurrency(self):
+        """Test no job is claimed while the running jobs reach the limit"""
+        first = create_job(owner=self.user)
+        create_job(owner=self.user)
+
+        job = jobs.claim()
+        self.assertEqual(job.id, first.id)
+        self.assertEqual(job.status, models.ReportJob.Status.RUNNING)
+        self.assertEqual(job.attempts, 1)
+
+        self.assertIsNone(jobs.claim())
+
+    @override_settings(REPORT_JOBS_TIMEOUT=60, REPORT_JOBS_MAX_ATTEMPTS=2)
+    def test_requeue_stalled_jobs(self):
+        """Test stalled jobs go back to the queue until they run out of attempts"""
+        started_at = timezone.now() - datetime.timedelta(minutes=5)
+        retry = create_job(owner=self.user, status=models.ReportJob.Status.RUNNING, attempts=1, started_at=started_at)
+        failed = create_job(owner=self.user, status=models.ReportJob.Status.RUNNING, attempts=2, started_at=started_at)
+        alive = create_job(owner=self.user, status=models.ReportJob.Status.RUNNING, attempts=1, started_at=started_at)
+        models.ReportJob.objects.exclude(id=alive.id).update(updated_at=started_at)
+
+        jobs.requeue_stalled()
+
+        retry.refresh_from_db()
+        failed.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual(retry.status, models.ReportJob.Status.PENDING)
+        self.assertEqual(failed.status, models.ReportJob.Status.FAILED)
+        self.assertEqual(alive.status, models.ReportJob.Status.RUNNING)
+
+    @override_settings(REPORT_JOBS_RETENTION_DAYS=1)
+    def test_purge_expired_jobs(self):
+        """Test finished jobs older than the retention are deleted"""
+        finished_at = timezone.now() - datetime.timedelta(days=2)
+        create_job(owner=self.user, status=models.ReportJob.Status.COMPLETED, finished_at=finished_at)
+        kept = create_job(owner=self.user, status=models.ReportJob.Status.COMPLETED, finished_at=timezone.now())
+
+        self.assertEqual(jobs.purge(), 1)
+        self.assertEqual(list(models.ReportJob.objects.values_list('id', flat=True)), [kept.id])
+
+
+class ReportJobHeartbeatTests(TransactionTestCase):
+    """Test the heartbeat of the running jobs, written from another thread"""
+
+    def test_heartbeat(self):
+        """Test a running job keeps its updated_at current"""
+        user = get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        job = create_job(owner=user, status=models.ReportJob.Status.RUNNING, attempts=1)
+        models.ReportJob.objects.filter(id=job.id).update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+
+        with heartbeat(job, 0.01):
+            time.sleep(0.1)
+
+        job.refresh_from_db()
+        self.assertGreater(job.updated_at, timezone.now() - datetime.timedelta(minutes=1))
@@ -6,12 +6,16 @@ from django.urls import path
 from report import report_views
 from report import analytics_views
 from report import export_views
+from report import job_views
 
 app_name = 'report'
 
 urlpatterns = [
     # path('custom-field-options/<int:pk>/', views.CustomFieldOptions.as_view(), name='custom-field-options'),
     path('evidences/', report_views.EvidenceReportView.as_view(), name='evidences'),
+    path('evidences/jobs/', job_views.EvidenceReportJobView.as_view(), name='evidence-jobs'),
+    path('jobs/<int:pk>/', job_views.ReportJobDetailView.as_view(), name='job-detail'),
+    path('jobs/<int:pk>/download/', job_views.ReportJobDownloadView.as_view(), name='job-download'),
     path('evidence-export/<int:pk>', export_views.EvidenceExportView.as_view(), name='evidence-export'),
     path('evidence-analytics/', analytics_views.EvidenceAnalyticsView.as_view(), name='evidence-analytics'),
     # path('me/', views.SelfManageUserView.as_view(), name='me'),
@@ -15,6 +15,9 @@ from rest_framework.permissions import IsAuthenticated
 
 
 from core import models
+from core.autocomplete import AutocompleteMixin
+from core.catalog_cache import CachedListMixin
+from core.search import ranked_search
 
 from sianuser.serializers import (
     SianUserSerializer
@@ -26,7 +29,7 @@ class SianUserPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         """Validate user permissions depending on the request method"""
 
-        if view.action == 'list' or view.action == 'retrieve':
+        if view.action == 'list' or view.action == 'retrieve' or view.action == 'autocomplete':
             return request.user.has_perm('core.view_sianuser') 
 
         if view.action == 'create':
@@ -66,7 +69,30 @@ class SianUserPermission(permissions.BasePermission):
                 OpenApiTypes.INT,
                 required=False,
                 description=_('State Organization id filter value')
-            )
+            ),
+            OpenApiParameter(
+                'search',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Ranked search value, best matches first')
+            ),
+        ]
+    ),
+    autocomplete=extend_schema(
+        description=_('[Protected | ViewSianUser] Best matches of the active SIAN users for the pickers'),
+        parameters=[
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Start of the name or of any of its words')
+            ),
+            OpenApiParameter(
+                'limit',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Maximum number of matches. Default: 10')
+            ),
         ]
     ),
     create=extend_schema(
@@ -85,10 +111,11 @@ class SianUserPermission(permissions.BasePermission):
         description=_('[Protected | DeleteSianUser] Delete a SIAN userby id')
     ),
 )
-class SianUserViewSet(viewsets.ModelViewSet):
+class SianUserViewSet(AutocompleteMixin, CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manageSIAN userAPIs."""
     serializer_class = SianUserSerializer
     queryset = models.SianUser.objects.all()
+    autocomplete_catalog = 'sianuser'
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, SianUserPermission]
 
@@ -109,4 +136,8 @@ class SianUserViewSet(viewsets.ModelViewSet):
         if stateorg != None:
             queryset = queryset.filter(stateorg=stateorg)
 
+        search = self.request.query_params.get('search')
+        if search != None:
+            return ranked_search(queryset, ['name'], search)
+
         return queryset.order_by('name')
\ No newline at end of file
@@ -15,6 +15,9 @@ from rest_framework.permissions import IsAuthenticated
 
 
 from core import models
+from core.autocomplete import AutocompleteMixin
+from core.catalog_cache import CachedListMixin
+from core.search import ranked_search
 
 from sifuser.serializers import (
     SifUserSerializer
@@ -26,7 +29,7 @@ class SifUserPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         """Validate user permissions depending on the request method"""
 
-        if view.action == 'list' or view.action == 'retrieve':
+        if view.action == 'list' or view.action == 'retrieve' or view.action == 'autocomplete':
             return request.user.has_perm('core.view_sifuser') 
 
         if view.action == 'create':
@@ -66,7 +69,30 @@ class SifUserPermission(permissions.BasePermission):
                 OpenApiTypes.INT,
                 required=False,
                 description=_('State Organization id filter value')
-            )
+            ),
+            OpenApiParameter(
+                'search',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Ranked search value, best matches first')
+            ),
+        ]
+    ),
+    autocomplete=extend_schema(
+        description=_('[Protected | ViewSifUser] Best matches of the active SIF users for the pickers'),
+        parameters=[
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Start of the name or of any of its words')
+            ),
+            OpenApiParameter(
+                'limit',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Maximum number of matches. Default: 10')
+            ),
         ]
     ),
     create=extend_schema(
@@ -85,10 +111,11 @@ class SifUserPermission(permissions.BasePermission):
         description=_('[Protected | DeleteSifUser] Delete a SIF userby id')
     ),
 )
-class SifUserViewSet(viewsets.ModelViewSet):
+class SifUserViewSet(AutocompleteMixin, CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manageSIF userAPIs."""
     serializer_class = SifUserSerializer
     queryset = models.SifUser.objects.all()
+    autocomplete_catalog = 'sifuser'
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, SifUserPermission]
 
@@ -109,4 +136,8 @@ class SifUserViewSet(viewsets.ModelViewSet):
         if stateorg != None:
             queryset = queryset.filter(stateorg=stateorg)
 
+        search = self.request.query_params.get('search')
+        if search != None:
+            return ranked_search(queryset, ['name'], search)
+
         return queryset.order_by('name')
\ No newline at end of file
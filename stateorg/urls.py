@@ -6,7 +6,7 @@ from django.urls import (
     include
 )
 
-from stateorg import import_views
+from stateorg import import_views, export_views
 from rest_framework.routers import DefaultRouter
 
 from stateorg import views
@@ -18,5 +18,7 @@ app_name = 'stateorg'
 
 urlpatterns = [
     path('import/<slug:filename>/', import_views.ImportView.as_view(), name='import'),
+    path('import-jobs/<slug:filename>/', import_views.ImportJobView.as_view(), name='import-job'),
+    path('export/', export_views.ExportView.as_view(), name='export'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,12 +1,7 @@
 # import xlrd
-import re
-from pyexcel_xlsx import get_data
 from rest_framework.parsers import FileUploadParser
 
 
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import IntegrityError
-
 from django.utils.translation import gettext as _
 
 from rest_framework import status
@@ -14,7 +9,9 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import views, authentication, permissions
 from rest_framework.response import Response
 
-from core import models
+from core.import_job_views import CatalogImportJobView, DRY_RUN_PARAMETER, dry_run_response, is_dry_run
+from core.spreadsheet import read_sheet
+from core.importer import SupplierImporter
 
 
 class ImportCatalogPermission(permissions.BasePermission):
@@ -39,75 +36,26 @@ class ImportView(views.APIView):
 
     @extend_schema(
         description=_("[Protected | ImportSupplier] Import records"),
+        parameters=[DRY_RUN_PARAMETER],
     )
     def post(self, request, filename, format=None):
         file = request.FILES['file']
-        data = get_data(file)
-
-        rows = data.get('Registros')
-        messages = []
-        if rows != None:
-            if(len(rows) > 1):
-                headers = rows.pop(0)
-                for row in rows:
-                    if len(row) >= 5:
-                        id = None
-                        if type(row[0]) is int:
-                            id = row[0]
-                        
-                        is_active = False
-                        if row[1] == 'Si':
-                            is_active = True
-
-                        name = row[2]
-                        tax_id = row[3]
-                        tax_name = row[4]
-
-                        if id != None:
-                            try:
-                                instance = models.Supplier.objects.get(id=id)
-
-                                instance.is_active = is_active
-                                instance.name = name
-                                instance.tax_id = tax_id
-                                instance.tax_name = tax_name
-
-                                instance.save()
-
-                            except IntegrityError as e:
-                                if re.search('name', str(e)):
-                                    messages.append(f"Registro duplicado: {name}")
-
-                                if re.search('tax_id', str(e)):
-                                    messages.append(f"El RFC {tax_id} ya se encuentra asociado a otro registro")
+        rows = read_sheet(file, 'Registros')
 
-                                if re.search('tax_name', str(e)):
-                                    messages.append(f"La razón social {tax_name} ya se encuentra asociada a otro registro")
-                        else:
-                            try:
-                                models.Supplier.objects.create(
-                                    is_active=is_active,
-                                    name=name,
-                                    tax_id=tax_id,
-                                    tax_name=tax_name,
-                                )
+        if is_dry_run(request):
+            return dry_run_response(request, 'supplier', rows)
 
-                            except IntegrityError as e:
-                                if re.search('name', str(e)):
-                                    messages.append(f"Registro duplicado: {name}")
-
-                                if re.search('tax_id', str(e)):
-                                    messages.append(f"El RFC {tax_id} ya se encuentra asociado a otro registro")
-
-                                if re.search('tax_name', str(e)):
-                                    messages.append(f"La razón social {tax_name} ya se encuentra asociada a otro registro")
-            else:
-                messages.append('Debe especificar al menos un registro para crear o actualizar.')
-        else:
-            messages.append('El archivo debe incluir una hoja llamada: Registros')
+        messages = SupplierImporter().import_sheet(rows)
 
         return Response({
             "success": True,
             "messages": messages
         })
-        
\ No newline at end of file
+
+
+@extend_schema(tags=['Catalogs'])
+class ImportJobView(CatalogImportJobView):
+    permission_classes = [permissions.IsAuthenticated,
+                          ImportCatalogPermission
+                          ]
+    catalog = 'supplier'
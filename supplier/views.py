@@ -13,6 +13,9 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from core import models
+from core.autocomplete import AutocompleteMixin
+from core.catalog_cache import CachedListMixin
+from core.search import ranked_search
 
 from supplier.serializers import (
     SupplierSerializer
@@ -24,7 +27,7 @@ class SupplierPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         """Validate user permissions depending on the request method"""
 
-        if view.action == 'list' or view.action == 'retrieve':
+        if view.action == 'list' or view.action == 'retrieve' or view.action == 'autocomplete':
             return request.user.has_perm('core.view_supplier') 
 
         if view.action == 'create':
@@ -71,6 +74,29 @@ class SupplierPermission(permissions.BasePermission):
                 required=False,
                 description=_('Tax name filter value')
             ),
+            OpenApiParameter(
+                'search',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Ranked search value, best matches first')
+            ),
+        ]
+    ),
+    autocomplete=extend_schema(
+        description=_('[Protected | ViewSupplier] Best matches of the active suppliers for the pickers'),
+        parameters=[
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                required=False,
+                description=_('Start of the name or of any of its words')
+            ),
+            OpenApiParameter(
+                'limit',
+                OpenApiTypes.INT,
+                required=False,
+                description=_('Maximum number of matches. Default: 10')
+            ),
         ]
     ),
     create=extend_schema(
@@ -89,10 +115,11 @@ class SupplierPermission(permissions.BasePermission):
         description=_('[Protected | DeleteSupplier] Delete a supplier by id')
     ),
 )
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(AutocompleteMixin, CachedListMixin, viewsets.ModelViewSet):
     """Viewset for manage supplier APIs."""
     serializer_class = SupplierSerializer
     queryset = models.Supplier.objects.all()
+    autocomplete_catalog = 'supplier'
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, SupplierPermission]
 
@@ -117,6 +144,10 @@ class SupplierViewSet(viewsets.ModelViewSet):
         if tax_name != None:
             queryset = queryset.filter(tax_name__icontains=tax_name)
             
+        search = self.request.query_params.get('search')
+        if search != None:
+            return ranked_search(queryset, ['name', 'tax_name', 'tax_id'], search)
+
         return queryset.order_by('name')
 
     # def perform_create(self, serializer):
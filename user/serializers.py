@@ -150,15 +150,16 @@ class SaveUserProfileSerializer(serializers.Serializer):
 
         instance.refresh_from_db()
 
-        profile_data = {}
-        
-        if(job_position != None):
-            profile_data.update({"job_position": job_position})
+        # Saved, not updated, so the report signals follow the division change
+        profile = models.Profile.objects.filter(user=instance).first()
+        if profile != None:
+            if(job_position != None):
+                profile.job_position = job_position
 
-        if(division != None):
-            profile_data.update({"division": division})
+            if(division != None):
+                profile.division_id = division
 
-        models.Profile.objects.filter(user=instance).update(**profile_data)
+            profile.save()
 
         serializer = serialize_user_profile(instance)
 